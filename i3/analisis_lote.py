@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analisis por lotes de la resistividad para muchos grupos
+I3: Determinacion de la resistividad de dos conductores: Constantan y Cromo-Niquel
+
+Cada grupo entrega sus datos con el mismo esquema que datos/ (un almacen
+de tools/lab_store.py por grupo, en <raiz>/<grupo>/). Los ajustes R vs L/A
+de todas las configuraciones se hacen a la vez sobre el eje de grupos
+(tools/group_batch.py); las figuras, una por grupo con los cinco ajustes
+y la comparacion de rho, se dibujan en un pool de procesos (o de hilos con
+--hilos, compartiendo los datos ya abiertos). Al final se
+imprime un resumen por configuracion con los grupos atipicos marcados.
+
+    python analisis_lote.py entregas/               # grupos en entregas/<grupo>/
+    python analisis_lote.py --sinteticos 100        # demostracion con grupos simulados
+    python analisis_lote.py --sinteticos 30 --hilos # figuras en hilos del mismo proceso
+"""
+
+import argparse
+import tempfile
+import time
+import numpy as np
+from pathlib import Path
+
+from group_batch import flag_outliers, linregress_batch, load_groups, render_pool, stack, synthesize_groups
+from results_db import ResultsDB, input_hash
+import render
+
+from generar_graficas import ESTILO, calcular_area, rho_constantan_teorico, rho_cromoniquel_teorico
+
+# Configuracion -> (conjunto de datos, fase, rho teorico)
+CONFIGURACIONES = {
+    'constantan_04_fase1': ('constantan_04_directa', 1, rho_constantan_teorico),
+    'constantan_035_fase1': ('constantan_035_directa', 1, rho_constantan_teorico),
+    'cromoniquel_04_fase1': ('cromoniquel_04_directa', 1, rho_cromoniquel_teorico),
+    'cromoniquel_035_fase1': ('cromoniquel_035_directa', 1, rho_cromoniquel_teorico),
+    'cromoniquel_035_fase2': ('cromoniquel_035_ohm', 2, rho_cromoniquel_teorico),
+}
+
+# Columnas medidas que se perturban al simular grupos
+COLUMNAS_MEDIDAS = {conjunto: ('R',) if fase == 1 else ('V',)
+                    for conjunto, fase, _ in CONFIGURACIONES.values()}
+
+
+def resistencias_lote(grupos, conjunto, fase):
+    """L/A y R de un conjunto para todos los grupos, forma (grupos, puntos)"""
+    L = stack(grupos, conjunto, 'L_cm') * 1e-2
+    A = calcular_area(stack(grupos, conjunto, 'D'))
+    if fase == 1:
+        R = stack(grupos, conjunto, 'R')
+    else:
+        I = stack(grupos, conjunto, 'I')
+        R = stack(grupos, conjunto, 'V') / (I if I.ndim == 2 else I[:, None])
+    return L / A[:, None], R
+
+
+def ajustar_lote(grupos):
+    """rho, incertidumbre, intercepto y R² por configuracion, arreglos (grupos,)"""
+    resultados = {}
+    for clave, (conjunto, fase, teorico) in CONFIGURACIONES.items():
+        L_A, R = resistencias_lote(grupos, conjunto, fase)
+        ajuste = linregress_batch(L_A, R)
+        resultados[clave] = {
+            'rho': ajuste['slope'],
+            'sigma': ajuste['stderr'],
+            'intercepto': ajuste['intercept'],
+            'r2': ajuste['r2'],
+            'error': np.abs(ajuste['slope'] - teorico) / teorico,
+        }
+    return resultados
+
+
+def grafica_grupo(nombre, datos, ajustes, carpeta, dpi=100):
+    """Figura resumen de un grupo: cinco ajustes R vs L/A y comparacion de rho"""
+    grupo = {nombre: datos}
+    with render.style(ESTILO):
+        fig, ejes = render.subplots(2, 3, figsize=(15, 9))
+        for ax, (clave, (conjunto, fase, teorico)) in zip(ejes.flat, CONFIGURACIONES.items()):
+            L_A, R = resistencias_lote(grupo, conjunto, fase)
+            rho, intercepto, r2 = ajustes[clave]['rho'], ajustes[clave]['intercepto'], ajustes[clave]['r2']
+            x = np.linspace(0, np.nanmax(L_A) * 1.1, 100)
+            ax.plot(L_A[0], R[0], 'bo' if fase == 1 else 'go', markersize=6, label='Datos')
+            ax.plot(x, rho * x + intercepto, 'r-', linewidth=2, label=f'Ajuste (R²={r2:.4f})')
+            ax.set_title(f'{clave.replace("_", " ")}\nρ = {rho * 1e8:.2f}×10⁻⁸ Ω·m')
+            ax.set_xlabel('L/A [m⁻¹]')
+            ax.set_ylabel('R [Ω]')
+            ax.grid(True, alpha=0.3)
+            ax.legend(fontsize=9)
+
+        ax = ejes.flat[-1]
+        claves = list(CONFIGURACIONES)
+        x_pos = np.arange(len(claves))
+        ax.bar(x_pos - 0.2, [ajustes[c]['rho'] * 1e8 for c in claves], 0.4,
+               yerr=[ajustes[c]['sigma'] * 1e8 for c in claves], label='Grupo', color='skyblue')
+        ax.bar(x_pos + 0.2, [CONFIGURACIONES[c][2] * 1e8 for c in claves], 0.4, label='Teorico', color='lightcoral')
+        ax.set_xticks(x_pos)
+        etiquetas = [f"{'Const.' if c.startswith('constantan') else 'Cr-Ni'} "
+                     f"{'0.4' if '_04_' in c else '0.35'}\nfase {CONFIGURACIONES[c][1]}" for c in claves]
+        ax.set_xticklabels(etiquetas, fontsize=9)
+        ax.set_ylabel('ρ [×10⁻⁸ Ω·m]')
+        ax.set_title('Resistividades')
+        ax.legend(fontsize=9)
+        ax.grid(True, alpha=0.3, axis='y')
+
+        fig.suptitle(f'I3 - {nombre}')
+        # Margenes fijos: tight_layout costaria mas que el resto de la figura
+        fig.subplots_adjust(left=0.06, right=0.98, bottom=0.09, top=0.88, wspace=0.3, hspace=0.5)
+    ruta = Path(carpeta) / f'{nombre}.png'
+    render.save(fig, ruta, ESTILO, dpi=dpi)
+    return str(ruta)
+
+
+def resumen_lote(nombres, resultados):
+    """Resumen por configuracion con los grupos atipicos marcados; devuelve {grupo: [configuraciones]}"""
+    atipicos = {}
+    print("\n" + "="*60)
+    print(f"RESUMEN DEL LOTE - {len(nombres)} grupos")
+    print("="*60)
+    for clave, r in resultados.items():
+        rho = r['rho'] * 1e8
+        marcados = flag_outliers(r['rho'])
+        print(f"{clave}:")
+        print(f"  rho mediana: {np.nanmedian(rho):.2f}x10^-8 ohm-m "
+              f"(IQR {np.nanpercentile(rho, 25):.2f} - {np.nanpercentile(rho, 75):.2f}), "
+              f"error mediano: {np.nanmedian(r['error']) * 100:.1f}%")
+        for i in np.flatnonzero(marcados):
+            print(f"  [ATIPICO] {nombres[i]}: rho = {rho[i]:.2f}x10^-8 ohm-m, R2: {r['r2'][i]:.4f}")
+            atipicos.setdefault(nombres[i], []).append(clave)
+    print()
+    print(f"Grupos con algun resultado atipico: {len(atipicos)}")
+    for nombre, claves in sorted(atipicos.items()):
+        print(f"  {nombre}: {', '.join(claves)}")
+    print("="*60)
+    return atipicos
+
+
+def registrar_lote(nombres, grupos, resultados, sesion=None):
+    """Guarda los resultados de cada grupo en resultados.sqlite (tools/results_db.py)"""
+    db = ResultsDB()
+    if not db.enabled:
+        return
+    try:
+        for i, nombre in enumerate(nombres):
+            datos = [grupos[nombre][c] for c, _, _ in CONFIGURACIONES.values()]
+            with db.run('i3', 'analisis_lote.py', input_hash(*datos), session=sesion, group=nombre) as run:
+                for clave, r in resultados.items():
+                    if np.isfinite(r['rho'][i]):
+                        run.add('rho', clave, r['rho'][i], r['sigma'][i], 'ohm*m', CONFIGURACIONES[clave][2])
+    finally:
+        db.close()
+
+
+def analizar(raiz, salida='graficas/lote', procesos=None, graficas=True, sesion=None, hilos=False,
+             registrar=True):
+    """Ajustes, figuras, resumen y registro de todos los grupos bajo `raiz`
+
+    Con registrar=False (grupos simulados) no se escribe en resultados.sqlite.
+    """
+    t0 = time.perf_counter()
+    grupos = load_groups(raiz)
+    nombres = list(grupos)
+    if not nombres:
+        raise ValueError(f'no hay grupos en {raiz}')
+    resultados = ajustar_lote(grupos)
+    t_ajuste = time.perf_counter() - t0
+
+    if graficas:
+        Path(salida).mkdir(parents=True, exist_ok=True)
+        trabajos = [(nombre, grupos[nombre],
+                     {c: {k: float(r[k][i]) for k in r} for c, r in resultados.items()}, salida)
+                    for i, nombre in enumerate(nombres)]
+        render_pool(grafica_grupo, trabajos, procesos, threads=hilos)
+    t_total = time.perf_counter() - t0
+
+    atipicos = resumen_lote(nombres, resultados)
+    if registrar:
+        registrar_lote(nombres, grupos, resultados, sesion)
+    print(f"Ajustes: {t_ajuste * 1e3:.0f} ms; total con figuras: {t_total:.1f} s")
+    return resultados, atipicos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analisis de resistividad para muchos grupos.')
+    parser.add_argument('raiz', nargs='?', help='carpeta con un almacen de datos por grupo')
+    parser.add_argument('--sinteticos', type=int, metavar='N', help='simular N grupos a partir de datos/')
+    parser.add_argument('--salida', default='graficas/lote')
+    parser.add_argument('--procesos', type=int)
+    parser.add_argument('--hilos', action='store_true', help='dibujar en hilos en lugar de procesos')
+    parser.add_argument('--sin-graficas', action='store_true')
+    parser.add_argument('--sesion', help='etiqueta del semestre para resultados.sqlite')
+    args = parser.parse_args()
+    if args.raiz is None and not args.sinteticos:
+        parser.error('indique la carpeta de grupos o --sinteticos N')
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        raiz = args.raiz
+        if args.sinteticos:
+            raiz = carpeta
+            synthesize_groups(Path(__file__).resolve().parent / 'datos', raiz, args.sinteticos, COLUMNAS_MEDIDAS)
+        # Los grupos simulados no van al almacen de resultados de los semestres
+        analizar(raiz, args.salida, args.procesos, not args.sin_graficas, args.sesion, args.hilos,
+                 registrar=not args.sinteticos)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,16 +6,18 @@ I3: Determinacion de la resistividad de dos conductores: Constantan y Cromo-Niqu
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 from scipy import stats
 from pathlib import Path
 
-# Configuracion de matplotlib para espanol
-plt.rcParams['font.size'] = 12
-plt.rcParams['axes.labelsize'] = 12
-plt.rcParams['axes.titlesize'] = 14
-plt.rcParams['legend.fontsize'] = 11
-plt.rcParams['figure.titlesize'] = 16
+# Configuracion de matplotlib para espanol; se aplica figura por figura con
+# render.style() (tools/render.py) en lugar de modificar plt.rcParams
+ESTILO = {
+    'font.size': 12,
+    'axes.labelsize': 12,
+    'axes.titlesize': 14,
+    'legend.fontsize': 11,
+    'figure.titlesize': 16,
+}
 
 # Valores teoricos de resistividad (en ohm-metro)
 # Constantan: aproximadamente 49 x 10^-8 ohm-m
@@ -23,83 +25,20 @@ plt.rcParams['figure.titlesize'] = 16
 rho_constantan_teorico = 49e-8  # ohm-m
 rho_cromoniquel_teorico = 110e-8  # ohm-m
 
-# Datos experimentales - Fase 1: Medicion directa
-# Constantan 0.4mm
-constantan_04_directa = {
-    'L_cm': np.array([5, 10, 15, 20, 25, 30, 35, 40, 45, 50]),
-    'R': np.array([0.6, 0.7, 0.9, 1.1, 1.3, 1.4, 1.8, 1.9, 2.1, 2.3]),
-    'D': 0.4e-3,  # m
-    'material': 'Constantan',
-    'diametro': '0.4 mm'
-}
-
-# Constantan 0.35mm
-constantan_035_directa = {
-    'L_cm': np.array([5, 10, 15, 20, 25, 30, 35, 40, 45, 50]),
-    'R': np.array([0.6, 0.8, 1.0, 1.3, 1.6, 1.9, 2.1, 2.3, 2.7, 2.9]),
-    'D': 0.35e-3,  # m
-    'material': 'Constantan',
-    'diametro': '0.35 mm'
-}
-
-# Cromo-Niquel 0.4mm
-cromoniquel_04_directa = {
-    'L_cm': np.array([5, 10, 15, 20, 25, 30, 35, 40, 45, 50]),
-    'R': np.array([0.4, 1.1, 1.2, 1.9, 2.2, 2.9, 3.2, 3.7, 3.8, 4.3]),
-    'D': 0.4e-3,  # m
-    'material': 'Cromo-Niquel',
-    'diametro': '0.4 mm'
-}
+from lab_store import load_store
+import render
+from results_db import record
 
-# Cromo-Niquel 0.35mm
-cromoniquel_035_directa = {
-    'L_cm': np.array([5, 10, 15, 20, 25, 30, 35, 40, 45, 50]),
-    'R': np.array([0.3, 0.9, 1.5, 2.2, 2.6, 3.1, 3.7, 4.3, 4.9, 5.5]),
-    'D': 0.35e-3,  # m
-    'material': 'Cromo-Niquel',
-    'diametro': '0.35 mm'
-}
+datos_lab = load_store(Path(__file__).resolve().parent / 'datos')
 
-# Datos experimentales - Fase 2: Medicion indirecta (Ley de Ohm)
-# Constantan 0.4mm
-constantan_04_ohm = {
-    'L_cm': np.array([5, 10, 15, 20, 25, 30, 35, 40, 45, 50]),
-    'V': np.array([0.007, 0.020, 0.033, 0.034, 0.040, 0.044, 0.045, 0.043, 0.049, 0.054]),
-    'I': np.array([0.027, 0.027, None, None, None, None, None, None, None, None]),
-    'D': 0.4e-3,  # m
-    'material': 'Constantan',
-    'diametro': '0.4 mm'
-}
-
-# Constantan 0.35mm
-constantan_035_ohm = {
-    'L_cm': np.array([5, 10, 15, 20, 25, 30, 35, 40, 45, 50]),
-    'V': np.array([0.009, 0.015, 0.023, 0.030, 0.041, 0.046, 0.053, 0.058, 0.064, 0.071]),
-    'I': None,  # No se especifica corriente constante
-    'D': 0.35e-3,  # m
-    'material': 'Constantan',
-    'diametro': '0.35 mm'
-}
-
-# Cromo-Niquel 0.35mm (I = 0.025 A constante)
-cromoniquel_035_ohm = {
-    'L_cm': np.array([5, 10, 15, 20, 25, 30, 35, 40, 45, 50]),
-    'V': np.array([0.015, 0.034, 0.054, 0.069, 0.082, 0.096, 0.115, 0.121, 0.147, 0.154]),
-    'I': 0.025,  # A constante
-    'D': 0.35e-3,  # m
-    'material': 'Cromo-Niquel',
-    'diametro': '0.35 mm'
-}
-
-# Cromo-Niquel 0.4mm
-cromoniquel_04_ohm = {
-    'L_cm': np.array([5, 10, 15, 20, 25, 30, 35, 40, 45, 50]),
-    'V': np.array([0.020, 0.026, 0.042, 0.052, 0.059, 0.100, 0.108, 0.114, 0.125, 0.134]),
-    'I': None,  # No se especifica
-    'D': 0.4e-3,  # m
-    'material': 'Cromo-Niquel',
-    'diametro': '0.4 mm'
-}
+constantan_04_directa = datos_lab['constantan_04_directa']
+constantan_035_directa = datos_lab['constantan_035_directa']
+cromoniquel_04_directa = datos_lab['cromoniquel_04_directa']
+cromoniquel_035_directa = datos_lab['cromoniquel_035_directa']
+constantan_04_ohm = datos_lab['constantan_04_ohm']
+constantan_035_ohm = datos_lab['constantan_035_ohm']
+cromoniquel_035_ohm = datos_lab['cromoniquel_035_ohm']
+cromoniquel_04_ohm = datos_lab['cromoniquel_04_ohm']
 
 def calcular_area(diametro):
     """Calcular area transversal del alambre"""
@@ -141,21 +80,21 @@ def grafica_fase1_material(data, material_name):
     L_A_fit = np.linspace(0, L_A.max() * 1.1, 100)
     R_fit = slope * L_A_fit + intercept
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    with render.style(ESTILO):
+        fig, ax = render.subplots(figsize=(10, 6))
     
-    ax.plot(L_A, R, 'bo', markersize=8, label='Datos experimentales')
-    ax.plot(L_A_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste lineal (R²={r2:.4f})')
+        ax.plot(L_A, R, 'bo', markersize=8, label='Datos experimentales')
+        ax.plot(L_A_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste lineal (R²={r2:.4f})')
     
-    ax.set_xlabel('L/A [m⁻¹]')
-    ax.set_ylabel('Resistencia R [Ω]')
-    ax.set_title(f'{data["material"]} {data["diametro"]} - Fase 1: Medicion directa\nρ = {rho_exp*1e8:.2f}×10⁻⁸ Ω·m')
-    ax.grid(True, alpha=0.3)
-    ax.legend()
+        ax.set_xlabel('L/A [m⁻¹]')
+        ax.set_ylabel('Resistencia R [Ω]')
+        ax.set_title(f'{data["material"]} {data["diametro"]} - Fase 1: Medicion directa\nρ = {rho_exp*1e8:.2f}×10⁻⁸ Ω·m')
+        ax.grid(True, alpha=0.3)
+        ax.legend()
     
-    plt.tight_layout()
+        fig.tight_layout()
     filename = f'graficas/{material_name.lower().replace("-", "_")}_{data["diametro"].replace(".", "")}_fase1.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    plt.close()
+    render.save(fig, filename, ESTILO, dpi=300, bbox_inches='tight')
     print(f"[OK] Grafica guardada: {filename}")
     return rho_exp, r2
 
@@ -208,21 +147,21 @@ def grafica_fase2_material(data, material_name):
     L_A_fit = np.linspace(0, L_A.max() * 1.1, 100)
     R_fit = slope * L_A_fit + intercept
     
-    fig, ax = plt.subplots(figsize=(10, 6))
+    with render.style(ESTILO):
+        fig, ax = render.subplots(figsize=(10, 6))
     
-    ax.plot(L_A, R_valid, 'go', markersize=8, label='Datos experimentales')
-    ax.plot(L_A_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste lineal (R²={r2:.4f})')
+        ax.plot(L_A, R_valid, 'go', markersize=8, label='Datos experimentales')
+        ax.plot(L_A_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste lineal (R²={r2:.4f})')
     
-    ax.set_xlabel('L/A [m⁻¹]')
-    ax.set_ylabel('Resistencia R [Ω]')
-    ax.set_title(f'{data["material"]} {data["diametro"]} - Fase 2: Ley de Ohm\nρ = {rho_exp*1e8:.2f}×10⁻⁸ Ω·m')
-    ax.grid(True, alpha=0.3)
-    ax.legend()
+        ax.set_xlabel('L/A [m⁻¹]')
+        ax.set_ylabel('Resistencia R [Ω]')
+        ax.set_title(f'{data["material"]} {data["diametro"]} - Fase 2: Ley de Ohm\nρ = {rho_exp*1e8:.2f}×10⁻⁸ Ω·m')
+        ax.grid(True, alpha=0.3)
+        ax.legend()
     
-    plt.tight_layout()
+        fig.tight_layout()
     filename = f'graficas/{material_name.lower().replace("-", "_")}_{data["diametro"].replace(".", "")}_fase2.png'
-    plt.savefig(filename, dpi=300, bbox_inches='tight')
-    plt.close()
+    render.save(fig, filename, ESTILO, dpi=300, bbox_inches='tight')
     print(f"[OK] Grafica guardada: {filename}")
     return rho_exp, r2
 
@@ -311,106 +250,106 @@ def grafica_comparacion_resistividades(rho_values):
     x_pos = np.arange(len(configuraciones))
     width = 0.25
     
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    # Filtrar valores None
-    valores_f1_clean = [v if v is not None else 0 for v in valores_fase1]
-    valores_f2_clean = [v if v is not None else 0 for v in valores_fase2]
-    valores_teo_clean = valores_teoricos
-    
-    bars1 = ax.bar(x_pos - width, valores_f1_clean, width, label='Fase 1 (Directa)', color='skyblue', alpha=0.8)
-    bars2 = ax.bar(x_pos, valores_f2_clean, width, label='Fase 2 (Ohm)', color='lightgreen', alpha=0.8)
-    bars3 = ax.bar(x_pos + width, valores_teo_clean, width, label='Teorico', color='lightcoral', alpha=0.8)
-    
-    ax.set_xlabel('Configuracion')
-    ax.set_ylabel('Resistividad ρ [×10⁻⁸ Ω·m]')
-    ax.set_title('Comparacion de resistividades obtenidas experimentalmente')
-    ax.set_xticks(x_pos)
-    ax.set_xticklabels(configuraciones)
-    ax.legend()
-    ax.grid(True, alpha=0.3, axis='y')
-    
-    # Agregar valores sobre las barras
-    for i, (bar, val) in enumerate(zip(bars1, valores_fase1)):
-        if val is not None:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 1,
-                    f'{val:.1f}', ha='center', va='bottom', fontsize=9)
-    
-    for i, (bar, val) in enumerate(zip(bars2, valores_fase2)):
-        if val is not None:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 1,
-                    f'{val:.1f}', ha='center', va='bottom', fontsize=9)
-    
-    plt.tight_layout()
-    plt.savefig('graficas/comparacion_resistividades.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    with render.style(ESTILO):
+        fig, ax = render.subplots(figsize=(12, 6))
+    
+        # Filtrar valores None
+        valores_f1_clean = [v if v is not None else 0 for v in valores_fase1]
+        valores_f2_clean = [v if v is not None else 0 for v in valores_fase2]
+        valores_teo_clean = valores_teoricos
+    
+        bars1 = ax.bar(x_pos - width, valores_f1_clean, width, label='Fase 1 (Directa)', color='skyblue', alpha=0.8)
+        bars2 = ax.bar(x_pos, valores_f2_clean, width, label='Fase 2 (Ohm)', color='lightgreen', alpha=0.8)
+        bars3 = ax.bar(x_pos + width, valores_teo_clean, width, label='Teorico', color='lightcoral', alpha=0.8)
+    
+        ax.set_xlabel('Configuracion')
+        ax.set_ylabel('Resistividad ρ [×10⁻⁸ Ω·m]')
+        ax.set_title('Comparacion de resistividades obtenidas experimentalmente')
+        ax.set_xticks(x_pos)
+        ax.set_xticklabels(configuraciones)
+        ax.legend()
+        ax.grid(True, alpha=0.3, axis='y')
+    
+        # Agregar valores sobre las barras
+        for i, (bar, val) in enumerate(zip(bars1, valores_fase1)):
+            if val is not None:
+                height = bar.get_height()
+                ax.text(bar.get_x() + bar.get_width()/2., height + 1,
+                        f'{val:.1f}', ha='center', va='bottom', fontsize=9)
+    
+        for i, (bar, val) in enumerate(zip(bars2, valores_fase2)):
+            if val is not None:
+                height = bar.get_height()
+                ax.text(bar.get_x() + bar.get_width()/2., height + 1,
+                        f'{val:.1f}', ha='center', va='bottom', fontsize=9)
+    
+        fig.tight_layout()
+    render.save(fig, 'graficas/comparacion_resistividades.png', ESTILO, dpi=300, bbox_inches='tight')
     print(f"[OK] Grafica guardada: graficas/comparacion_resistividades.png")
 
 def grafica_R_vs_L():
     """Grafica R vs L para visualizar la dependencia lineal"""
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10))
-    
-    # Constantan 0.4mm
-    L = constantan_04_directa['L_cm'] * 1e-2
-    R = constantan_04_directa['R']
-    slope, intercept, r2, _ = ajuste_lineal(L, R)
-    L_fit = np.linspace(0, L.max() * 1.1, 100)
-    R_fit = slope * L_fit + intercept
-    ax1.plot(L, R, 'bo', markersize=6, label='Datos')
-    ax1.plot(L_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste (R²={r2:.4f})')
-    ax1.set_xlabel('Longitud L [m]')
-    ax1.set_ylabel('Resistencia R [Ω]')
-    ax1.set_title('Constantan 0.4mm')
-    ax1.grid(True, alpha=0.3)
-    ax1.legend()
-    
-    # Constantan 0.35mm
-    L = constantan_035_directa['L_cm'] * 1e-2
-    R = constantan_035_directa['R']
-    slope, intercept, r2, _ = ajuste_lineal(L, R)
-    L_fit = np.linspace(0, L.max() * 1.1, 100)
-    R_fit = slope * L_fit + intercept
-    ax2.plot(L, R, 'go', markersize=6, label='Datos')
-    ax2.plot(L_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste (R²={r2:.4f})')
-    ax2.set_xlabel('Longitud L [m]')
-    ax2.set_ylabel('Resistencia R [Ω]')
-    ax2.set_title('Constantan 0.35mm')
-    ax2.grid(True, alpha=0.3)
-    ax2.legend()
-    
-    # Cromo-Niquel 0.4mm
-    L = cromoniquel_04_directa['L_cm'] * 1e-2
-    R = cromoniquel_04_directa['R']
-    slope, intercept, r2, _ = ajuste_lineal(L, R)
-    L_fit = np.linspace(0, L.max() * 1.1, 100)
-    R_fit = slope * L_fit + intercept
-    ax3.plot(L, R, 'mo', markersize=6, label='Datos')
-    ax3.plot(L_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste (R²={r2:.4f})')
-    ax3.set_xlabel('Longitud L [m]')
-    ax3.set_ylabel('Resistencia R [Ω]')
-    ax3.set_title('Cromo-Niquel 0.4mm')
-    ax3.grid(True, alpha=0.3)
-    ax3.legend()
-    
-    # Cromo-Niquel 0.35mm
-    L = cromoniquel_035_directa['L_cm'] * 1e-2
-    R = cromoniquel_035_directa['R']
-    slope, intercept, r2, _ = ajuste_lineal(L, R)
-    L_fit = np.linspace(0, L.max() * 1.1, 100)
-    R_fit = slope * L_fit + intercept
-    ax4.plot(L, R, 'co', markersize=6, label='Datos')
-    ax4.plot(L_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste (R²={r2:.4f})')
-    ax4.set_xlabel('Longitud L [m]')
-    ax4.set_ylabel('Resistencia R [Ω]')
-    ax4.set_title('Cromo-Niquel 0.35mm')
-    ax4.grid(True, alpha=0.3)
-    ax4.legend()
-    
-    plt.tight_layout()
-    plt.savefig('graficas/R_vs_L.png', dpi=300, bbox_inches='tight')
-    plt.close()
+    with render.style(ESTILO):
+        fig, ((ax1, ax2), (ax3, ax4)) = render.subplots(2, 2, figsize=(14, 10))
+    
+        # Constantan 0.4mm
+        L = constantan_04_directa['L_cm'] * 1e-2
+        R = constantan_04_directa['R']
+        slope, intercept, r2, _ = ajuste_lineal(L, R)
+        L_fit = np.linspace(0, L.max() * 1.1, 100)
+        R_fit = slope * L_fit + intercept
+        ax1.plot(L, R, 'bo', markersize=6, label='Datos')
+        ax1.plot(L_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste (R²={r2:.4f})')
+        ax1.set_xlabel('Longitud L [m]')
+        ax1.set_ylabel('Resistencia R [Ω]')
+        ax1.set_title('Constantan 0.4mm')
+        ax1.grid(True, alpha=0.3)
+        ax1.legend()
+    
+        # Constantan 0.35mm
+        L = constantan_035_directa['L_cm'] * 1e-2
+        R = constantan_035_directa['R']
+        slope, intercept, r2, _ = ajuste_lineal(L, R)
+        L_fit = np.linspace(0, L.max() * 1.1, 100)
+        R_fit = slope * L_fit + intercept
+        ax2.plot(L, R, 'go', markersize=6, label='Datos')
+        ax2.plot(L_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste (R²={r2:.4f})')
+        ax2.set_xlabel('Longitud L [m]')
+        ax2.set_ylabel('Resistencia R [Ω]')
+        ax2.set_title('Constantan 0.35mm')
+        ax2.grid(True, alpha=0.3)
+        ax2.legend()
+    
+        # Cromo-Niquel 0.4mm
+        L = cromoniquel_04_directa['L_cm'] * 1e-2
+        R = cromoniquel_04_directa['R']
+        slope, intercept, r2, _ = ajuste_lineal(L, R)
+        L_fit = np.linspace(0, L.max() * 1.1, 100)
+        R_fit = slope * L_fit + intercept
+        ax3.plot(L, R, 'mo', markersize=6, label='Datos')
+        ax3.plot(L_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste (R²={r2:.4f})')
+        ax3.set_xlabel('Longitud L [m]')
+        ax3.set_ylabel('Resistencia R [Ω]')
+        ax3.set_title('Cromo-Niquel 0.4mm')
+        ax3.grid(True, alpha=0.3)
+        ax3.legend()
+    
+        # Cromo-Niquel 0.35mm
+        L = cromoniquel_035_directa['L_cm'] * 1e-2
+        R = cromoniquel_035_directa['R']
+        slope, intercept, r2, _ = ajuste_lineal(L, R)
+        L_fit = np.linspace(0, L.max() * 1.1, 100)
+        R_fit = slope * L_fit + intercept
+        ax4.plot(L, R, 'co', markersize=6, label='Datos')
+        ax4.plot(L_fit, R_fit, 'r-', linewidth=2, label=f'Ajuste (R²={r2:.4f})')
+        ax4.set_xlabel('Longitud L [m]')
+        ax4.set_ylabel('Resistencia R [Ω]')
+        ax4.set_title('Cromo-Niquel 0.35mm')
+        ax4.grid(True, alpha=0.3)
+        ax4.legend()
+    
+        fig.tight_layout()
+    render.save(fig, 'graficas/R_vs_L.png', ESTILO, dpi=300, bbox_inches='tight')
     print(f"[OK] Grafica guardada: graficas/R_vs_L.png")
 
 def crear_carpeta_graficas():
@@ -451,6 +390,26 @@ def resumen_estadistico(rho_values):
     
     print("="*60)
 
+def registrar_resultados(rho_values):
+    """Guardar rho, su incertidumbre y el error en resultados.sqlite (tools/results_db.py)"""
+    conjuntos = {
+        'constantan_04_fase1': constantan_04_directa,
+        'constantan_035_fase1': constantan_035_directa,
+        'cromoniquel_04_fase1': cromoniquel_04_directa,
+        'cromoniquel_035_fase1': cromoniquel_035_directa,
+        'cromoniquel_035_fase2': cromoniquel_035_ohm,
+    }
+    filas = []
+    for clave, (rho, r2) in rho_values.items():
+        if not rho:
+            continue
+        data = conjuntos[clave]
+        R = data['R'] if 'fase1' in clave else data['V'] / data['I']
+        _, _, _, std_err = ajuste_lineal(calcular_L_A(data['L_cm'], data['D']), R)
+        teorico = rho_constantan_teorico if 'constantan' in clave else rho_cromoniquel_teorico
+        filas.append(('rho', clave, rho, std_err, 'ohm*m', teorico))
+    record('i3', 'generar_graficas.py', filas, inputs=[conjuntos[c] for c in rho_values])
+
 def main():
     """Funcion principal"""
     print("Generando graficas para el analisis de resistividad...")
@@ -461,11 +420,15 @@ def main():
     
     try:
         # Generar graficas individuales Fase 1
+        # (en hilos, ver tools/render.py; los resultados conservan el orden)
         print("\nGenerando graficas Fase 1 (Medicion directa)...")
-        rho_c04_1, r2_c04_1 = grafica_fase1_material(constantan_04_directa, 'Constantan')
-        rho_c035_1, r2_c035_1 = grafica_fase1_material(constantan_035_directa, 'Constantan')
-        rho_cn04_1, r2_cn04_1 = grafica_fase1_material(cromoniquel_04_directa, 'Cromo-Niquel')
-        rho_cn035_1, r2_cn035_1 = grafica_fase1_material(cromoniquel_035_directa, 'Cromo-Niquel')
+        (rho_c04_1, r2_c04_1), (rho_c035_1, r2_c035_1), (rho_cn04_1, r2_cn04_1), (rho_cn035_1, r2_cn035_1) = \
+            render.run_threads(grafica_fase1_material, [
+                (constantan_04_directa, 'Constantan'),
+                (constantan_035_directa, 'Constantan'),
+                (cromoniquel_04_directa, 'Cromo-Niquel'),
+                (cromoniquel_035_directa, 'Cromo-Niquel'),
+            ])
         
         # Generar graficas individuales Fase 2
         print("\nGenerando graficas Fase 2 (Ley de Ohm)...")
@@ -485,6 +448,7 @@ def main():
         grafica_R_vs_L()
         grafica_comparacion_resistividades(rho_values)
         resumen_estadistico(rho_values)
+        registrar_resultados(rho_values)
         
         print("\n" + "="*60)
         print("[OK] TODAS LAS GRAFICAS GENERADAS EXITOSAMENTE")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analisis por lotes de la ley de Ohm para muchos grupos
+I4: Circuitos serie, paralelo y mixto
+
+Cada grupo entrega sus datos con el mismo esquema que datos/ (un almacen
+de tools/lab_store.py por grupo, en <raiz>/<grupo>/). En cada circuito se
+ajusta lo medido contra lo que predice la ley de Ohm con R del ohmetro:
+V frente a I*R en serie y mixto, I frente a V/R en paralelo (un solo V
+comun). La pendiente deberia ser 1 y el intercepto 0. Los ajustes
+de todos los grupos se hacen a la vez sobre el eje de grupos
+(tools/group_batch.py); las figuras, una por grupo con los tres
+circuitos, se dibujan en un pool de procesos (o de hilos con --hilos).
+Al final se imprime un resumen por circuito con los grupos atipicos
+marcados.
+
+    python analisis_lote.py entregas/               # grupos en entregas/<grupo>/
+    python analisis_lote.py --sinteticos 100        # demostracion con grupos simulados
+    python analisis_lote.py --sinteticos 30 --hilos # figuras en hilos del mismo proceso
+"""
+
+import argparse
+import tempfile
+import time
+import numpy as np
+from pathlib import Path
+
+from group_batch import flag_outliers, linregress_batch, load_groups, render_pool, stack, synthesize_groups
+from results_db import ResultsDB, input_hash
+import render
+
+from generar_graficas import ESTILO
+
+# Circuito -> (columna de corriente, factor a A, ejes x e y de la figura)
+CIRCUITOS = {
+    'serie': ('I_mA', 1e-3, 'I·R [V]', 'V medido [V]'),
+    'paralelo': ('I_uA', 1e-6, 'V/R [A]', 'I medida [A]'),
+    'mixto': ('I_uA', 1e-6, 'I·R [V]', 'V medido [V]'),
+}
+
+# Columnas medidas que se perturban al simular grupos
+COLUMNAS_MEDIDAS = {'serie': ('V',), 'paralelo': ('I_uA',), 'mixto': ('V',)}
+
+
+def ohm_lote(grupos, circuito):
+    """Prediccion de la ley de Ohm y valor medido de un circuito, forma (grupos, puntos)"""
+    columna, factor = CIRCUITOS[circuito][:2]
+    etiquetas = next(iter(grupos.values()))[circuito]['etiquetas']
+    R = np.column_stack([stack(grupos, 'resistores', k) for k in etiquetas])
+    I = stack(grupos, circuito, columna) * factor
+    V = stack(grupos, circuito, 'V')
+    if V.ndim == 1:
+        # Paralelo: un solo voltaje comun por grupo, se predice la corriente
+        return V[:, None] / R, I
+    return I * R, V
+
+
+def ajustar_lote(grupos):
+    """Pendiente medido/predicho, incertidumbre, intercepto y R² por circuito, arreglos (grupos,)"""
+    resultados = {}
+    for circuito in CIRCUITOS:
+        prediccion, medida = ohm_lote(grupos, circuito)
+        ajuste = linregress_batch(prediccion, medida)
+        resultados[circuito] = {
+            'pendiente': ajuste['slope'],
+            'sigma': ajuste['stderr'],
+            'intercepto': ajuste['intercept'],
+            'r2': ajuste['r2'],
+            'error': np.abs(ajuste['slope'] - 1.0),
+        }
+    return resultados
+
+
+def grafica_grupo(nombre, datos, ajustes, carpeta, dpi=100):
+    """Figura resumen de un grupo: medido contra ley de Ohm en los tres circuitos"""
+    grupo = {nombre: datos}
+    with render.style(ESTILO):
+        fig, ejes = render.subplots(1, 3, figsize=(15, 4.5))
+        for ax, circuito in zip(ejes, CIRCUITOS):
+            prediccion, medida = ohm_lote(grupo, circuito)
+            a = ajustes[circuito]
+            x = np.linspace(0, np.nanmax(prediccion) * 1.1, 100)
+            ax.plot(prediccion[0], medida[0], 'bo', markersize=6, label='Datos')
+            ax.plot(x, a['pendiente'] * x + a['intercepto'], 'r-', linewidth=2,
+                    label=f"Ajuste (R²={a['r2']:.4f})")
+            ax.plot(x, x, 'k--', linewidth=1, label='Ley de Ohm')
+            ax.set_title(f"{circuito}: pendiente = {a['pendiente']:.3g}")
+            ax.set_xlabel(CIRCUITOS[circuito][2])
+            ax.set_ylabel(CIRCUITOS[circuito][3])
+            ax.grid(True, alpha=0.3)
+            ax.legend(fontsize=9)
+        fig.suptitle(f'I4 - {nombre}')
+        # Margenes fijos: tight_layout costaria mas que el resto de la figura
+        fig.subplots_adjust(left=0.06, right=0.98, bottom=0.13, top=0.83, wspace=0.3)
+    ruta = Path(carpeta) / f'{nombre}.png'
+    render.save(fig, ruta, ESTILO, dpi=dpi)
+    return str(ruta)
+
+
+def resumen_lote(nombres, resultados):
+    """Resumen por circuito con los grupos atipicos marcados; devuelve {grupo: [circuitos]}"""
+    atipicos = {}
+    print("\n" + "="*60)
+    print(f"RESUMEN DEL LOTE - {len(nombres)} grupos")
+    print("="*60)
+    for circuito, r in resultados.items():
+        pendiente = r['pendiente']
+        marcados = flag_outliers(pendiente)
+        print(f"{circuito}:")
+        print(f"  pendiente medido/Ohm mediana: {np.nanmedian(pendiente):.4g} "
+              f"(IQR {np.nanpercentile(pendiente, 25):.4g} - {np.nanpercentile(pendiente, 75):.4g}), "
+              f"R2 mediano: {np.nanmedian(r['r2']):.4f}")
+        for i in np.flatnonzero(marcados):
+            print(f"  [ATIPICO] {nombres[i]}: pendiente = {pendiente[i]:.4g}, R2: {r['r2'][i]:.4f}")
+            atipicos.setdefault(nombres[i], []).append(circuito)
+    print()
+    print(f"Grupos con algun resultado atipico: {len(atipicos)}")
+    for nombre, circuitos in sorted(atipicos.items()):
+        print(f"  {nombre}: {', '.join(circuitos)}")
+    print("="*60)
+    return atipicos
+
+
+def registrar_lote(nombres, grupos, resultados, sesion=None):
+    """Guarda los resultados de cada grupo en resultados.sqlite (tools/results_db.py)"""
+    db = ResultsDB()
+    if not db.enabled:
+        return
+    try:
+        for i, nombre in enumerate(nombres):
+            datos = [grupos[nombre][c] for c in ('resistores', *CIRCUITOS)]
+            with db.run('i4', 'analisis_lote.py', input_hash(*datos), session=sesion, group=nombre) as run:
+                for circuito, r in resultados.items():
+                    if np.isfinite(r['pendiente'][i]):
+                        run.add('pendiente_ohm', circuito, r['pendiente'][i], r['sigma'][i], '', 1.0)
+    finally:
+        db.close()
+
+
+def analizar(raiz, salida='graficas/lote', procesos=None, graficas=True, sesion=None, hilos=False,
+             registrar=True):
+    """Ajustes, figuras, resumen y registro de todos los grupos bajo `raiz`
+
+    Con registrar=False (grupos simulados) no se escribe en resultados.sqlite.
+    """
+    t0 = time.perf_counter()
+    grupos = load_groups(raiz)
+    nombres = list(grupos)
+    if not nombres:
+        raise ValueError(f'no hay grupos en {raiz}')
+    resultados = ajustar_lote(grupos)
+    t_ajuste = time.perf_counter() - t0
+
+    if graficas:
+        Path(salida).mkdir(parents=True, exist_ok=True)
+        trabajos = [(nombre, grupos[nombre],
+                     {c: {k: float(r[k][i]) for k in r} for c, r in resultados.items()}, salida)
+                    for i, nombre in enumerate(nombres)]
+        render_pool(grafica_grupo, trabajos, procesos, threads=hilos)
+    t_total = time.perf_counter() - t0
+
+    atipicos = resumen_lote(nombres, resultados)
+    if registrar:
+        registrar_lote(nombres, grupos, resultados, sesion)
+    print(f"Ajustes: {t_ajuste * 1e3:.0f} ms; total con figuras: {t_total:.1f} s")
+    return resultados, atipicos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analisis de la ley de Ohm para muchos grupos.')
+    parser.add_argument('raiz', nargs='?', help='carpeta con un almacen de datos por grupo')
+    parser.add_argument('--sinteticos', type=int, metavar='N', help='simular N grupos a partir de datos/')
+    parser.add_argument('--salida', default='graficas/lote')
+    parser.add_argument('--procesos', type=int)
+    parser.add_argument('--hilos', action='store_true', help='dibujar en hilos en lugar de procesos')
+    parser.add_argument('--sin-graficas', action='store_true')
+    parser.add_argument('--sesion', help='etiqueta del semestre para resultados.sqlite')
+    args = parser.parse_args()
+    if args.raiz is None and not args.sinteticos:
+        parser.error('indique la carpeta de grupos o --sinteticos N')
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        raiz = args.raiz
+        if args.sinteticos:
+            raiz = carpeta
+            synthesize_groups(Path(__file__).resolve().parent / 'datos', raiz, args.sinteticos, COLUMNAS_MEDIDAS)
+        # Los grupos simulados no van al almacen de resultados de los semestres
+        analizar(raiz, args.salida, args.procesos, not args.sin_graficas, args.sesion, args.hilos,
+                 registrar=not args.sinteticos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+I4 - Analisis nodal modificado (MNA) disperso para redes de resistores
+
+La red se describe con una lista de ramas (nombre, nodo_a, nodo_b) y un
+diccionario de resistencias como el `R` de generar_graficas.py. Las fuentes
+de voltaje se declaran igual (nombre, nodo_pos, nodo_neg) y su valor se da
+al resolver, de modo que una sola factorizacion sirve para muchas
+configuraciones de fuentes.
+"""
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+TIERRA = "gnd"
+
+
+def _indexar_nodos(ramas, fuentes_v, tierra):
+    """Asignar un indice a cada nodo distinto de tierra"""
+    indice = {}
+    for _, a, b in list(ramas) + list(fuentes_v):
+        for nodo in (a, b):
+            if nodo != tierra and nodo not in indice:
+                indice[nodo] = len(indice)
+    return indice
+
+
+def ensamblar_mna(R, ramas, fuentes_v=(), tierra=TIERRA):
+    """Construir la matriz MNA dispersa [[G, B], [B^T, 0]] de la red"""
+    ramas = list(ramas)
+    fuentes_v = list(fuentes_v)
+    indice = _indexar_nodos(ramas, fuentes_v, tierra)
+    n = len(indice)
+    m = len(fuentes_v)
+    if n == 0:
+        raise ValueError("La red no tiene nodos distintos de tierra")
+
+    # Nodo de tierra -> -1 para descartarlo al ensamblar
+    ia = np.array([indice.get(a, -1) for _, a, _ in ramas], dtype=np.int64)
+    ib = np.array([indice.get(b, -1) for _, _, b in ramas], dtype=np.int64)
+    g = 1.0 / np.array([R[nombre] for nombre, _, _ in ramas], dtype=float)
+
+    # Estampado de conductancias: +g en (a,a),(b,b) y -g en (a,b),(b,a)
+    filas = np.concatenate([ia, ib, ia, ib])
+    cols = np.concatenate([ia, ib, ib, ia])
+    vals = np.concatenate([g, g, -g, -g])
+
+    # Fuentes de voltaje: columna/fila extra por fuente
+    if m:
+        kp = np.array([indice.get(p, -1) for _, p, _ in fuentes_v], dtype=np.int64)
+        kn = np.array([indice.get(q, -1) for _, _, q in fuentes_v], dtype=np.int64)
+        k = n + np.arange(m)
+        unos = np.ones(m)
+        filas = np.concatenate([filas, kp, k, kn, k])
+        cols = np.concatenate([cols, k, kp, k, kn])
+        vals = np.concatenate([vals, unos, unos, -unos, -unos])
+
+    validos = (filas >= 0) & (cols >= 0)
+    A = sparse.coo_matrix((vals[validos], (filas[validos], cols[validos])),
+                          shape=(n + m, n + m)).tocsc()
+
+    return {
+        'A': A,
+        'indice': indice,
+        'ramas': ramas,
+        'fuentes_v': fuentes_v,
+        'tierra': tierra,
+        'ia': ia,
+        'ib': ib,
+        'g': g,
+        'lu': None,
+    }
+
+
+def factorizar_mna(sistema):
+    """Factorizar (LU disperso) la matriz MNA una sola vez"""
+    if sistema['lu'] is None:
+        sistema['lu'] = splu(sistema['A'])
+    return sistema
+
+
+def _vector_excitacion(sistema, corrientes, voltajes):
+    """Lado derecho con una columna por configuracion de fuentes"""
+    n = len(sistema['indice'])
+    m = len(sistema['fuentes_v'])
+    k = 1
+    for datos in (corrientes, voltajes):
+        if datos is not None and not isinstance(datos, dict) and np.ndim(datos) == 2:
+            k = np.shape(datos)[1]
+    b = np.zeros((n + m, k))
+
+    # Inyecciones de corriente en nodos: dict {nodo: I} o arreglo (n, k)
+    if isinstance(corrientes, dict):
+        for nodo, valor in corrientes.items():
+            if nodo != sistema['tierra']:
+                b[sistema['indice'][nodo], :] += valor
+    elif corrientes is not None:
+        b[:n, :] = np.asarray(corrientes, dtype=float).reshape(n, -1)
+
+    # Valores de fuentes de voltaje: dict {fuente: V} o arreglo (m, k)
+    if isinstance(voltajes, dict):
+        nombres = [nombre for nombre, _, _ in sistema['fuentes_v']]
+        for nombre, valor in voltajes.items():
+            b[n + nombres.index(nombre), :] = valor
+    elif voltajes is not None:
+        b[n:, :] = np.asarray(voltajes, dtype=float).reshape(m, -1)
+    return b
+
+
+def resolver_mna(sistema, corrientes=None, voltajes=None):
+    """Resolver voltajes de nodo y corrientes de rama para una o varias excitaciones
+
+    Cada columna de `corrientes` (n_nodos, k) o `voltajes` (n_fuentes, k) es
+    una configuracion distinta; todas reutilizan la misma factorizacion.
+    """
+    factorizar_mna(sistema)
+    n = len(sistema['indice'])
+    x = sistema['lu'].solve(_vector_excitacion(sistema, corrientes, voltajes))
+
+    # Voltaje de tierra = 0 al final para poder indexar con -1
+    V = np.vstack([x[:n], np.zeros((1, x.shape[1]))])
+    V_rama = V[sistema['ia']] - V[sistema['ib']]
+    I_rama = sistema['g'][:, None] * V_rama
+
+    return {
+        'V_nodos': x[:n],
+        'V_ramas': V_rama,
+        'I_ramas': I_rama,
+        'I_fuentes': x[n:],
+    }
+
+
+def voltajes_por_nodo(sistema, resultado, columna=0):
+    """Diccionario {nodo: V} para una columna del resultado"""
+    V = resultado['V_nodos'][:, columna]
+    salida = {nodo: V[i] for nodo, i in sistema['indice'].items()}
+    salida[sistema['tierra']] = 0.0
+    return salida
+
+
+def corrientes_por_rama(sistema, resultado, columna=0):
+    """Diccionario {rama: I} para una columna del resultado"""
+    I = resultado['I_ramas'][:, columna]
+    return {nombre: I[j] for j, (nombre, _, _) in enumerate(sistema['ramas'])}
+
+
+def resistencia_equivalente(sistema, pares):
+    """Resistencia equivalente entre pares de nodos (fuentes de voltaje en corto)
+
+    Inyecta 1 A entre cada par; todos los pares se resuelven en un solo
+    llamado con la misma factorizacion.
+    """
+    unico = isinstance(pares, tuple) and len(pares) == 2 and not isinstance(pares[0], tuple)
+    if unico:
+        pares = [pares]
+    n = len(sistema['indice'])
+    I = np.zeros((n, len(pares)))
+    for j, (a, b) in enumerate(pares):
+        if a != sistema['tierra']:
+            I[sistema['indice'][a], j] += 1.0
+        if b != sistema['tierra']:
+            I[sistema['indice'][b], j] -= 1.0
+
+    V = np.vstack([resolver_mna(sistema, corrientes=I)['V_nodos'], np.zeros((1, len(pares)))])
+    ia = [sistema['indice'].get(a, -1) for a, _ in pares]
+    ib = [sistema['indice'].get(b, -1) for _, b in pares]
+    Req = V[ia, np.arange(len(pares))] - V[ib, np.arange(len(pares))]
+    return Req[0] if unico else Req
+
+
+def red_escalera(n_etapas, R_serie, R_paralelo):
+    """Escalera R-2R generica: ramas serie entre nodos y ramas a tierra"""
+    R = {}
+    ramas = []
+    for k in range(n_etapas):
+        a = "n0" if k == 0 else f"n{k}"
+        b = f"n{k + 1}"
+        R[f"Rs{k}"] = R_serie
+        R[f"Rp{k}"] = R_paralelo
+        ramas.append((f"Rs{k}", a, b))
+        ramas.append((f"Rp{k}", b, TIERRA))
+    return R, ramas
+
+
+def red_malla(filas, columnas, R_valor):
+    """Malla rectangular de filas x columnas nodos con resistores iguales"""
+    R = {}
+    ramas = []
+    nodo = lambda i, j: f"m{i}_{j}"
+    for i in range(filas):
+        for j in range(columnas):
+            if j + 1 < columnas:
+                nombre = f"Rh{i}_{j}"
+                R[nombre] = R_valor
+                ramas.append((nombre, nodo(i, j), nodo(i, j + 1)))
+            if i + 1 < filas:
+                nombre = f"Rv{i}_{j}"
+                R[nombre] = R_valor
+                ramas.append((nombre, nodo(i, j), nodo(i + 1, j)))
+    # La esquina opuesta al origen actua como referencia
+    ramas = [(nombre, TIERRA if a == nodo(filas - 1, columnas - 1) else a,
+              TIERRA if b == nodo(filas - 1, columnas - 1) else b)
+             for nombre, a, b in ramas]
+    return R, ramas
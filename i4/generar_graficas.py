@@ -4,34 +4,37 @@
 I4 - Graficas y calculos de circuitos serie, paralelo y mixto
 """
 import numpy as np
-import matplotlib.pyplot as plt
 from pathlib import Path
 
-plt.rcParams["figure.dpi"] = 120
+from circuito_mna import ensamblar_mna, resistencia_equivalente
+
+from lab_store import load_store
+import render
+
+ESTILO = {"figure.dpi": 120}
+
+datos_lab = load_store(Path(__file__).resolve().parent / "datos")
 
 # Resistores medidos (ohm)
-R = {
-    "R1": 46.5,
-    "R2": 98.8,
-    "R3": 149.5,
-    "R4": 326.8,
-    "R5": 216.1,
-}
-
-# Serie: I en mA, V en V
-serie_I_mA = np.array([389.2, 390.1, 386.9, 390.0, 389.2])
-serie_V = np.array([0.019, 0.040, 0.088, 0.133, 0.067])
-serie_labels = ["R1", "R2", "R3", "R4", "R5"]
+R = dict(datos_lab["resistores"])
+
+# Serie: I en mA, V en V; cadena R1..R5 entre la entrada "a" y tierra
+serie_labels = datos_lab["serie"]["etiquetas"]
+serie_I_mA = datos_lab["serie"]["I_mA"]
+serie_V = datos_lab["serie"]["V"]
+serie_ramas = datos_lab["serie"]["ramas"]
 
 # Paralelo (sin R4): I en uA, V comun ~0.015 V
-paralelo_labels = ["R1", "R2", "R3", "R5"]
-paralelo_I_uA = np.array([153.7, 85.3, 64.1, 49.2])
-paralelo_V = 0.015
+paralelo_labels = datos_lab["paralelo"]["etiquetas"]
+paralelo_I_uA = datos_lab["paralelo"]["I_uA"]
+paralelo_V = datos_lab["paralelo"]["V"]
 
 # Mixto: I en uA, V en V (se reportan R1, R2, R3, R5)
-mixto_labels = ["R1", "R2", "R3", "R5"]
-mixto_I_uA = np.array([556.9, 156.2, 156.1, 156.3])
-mixto_V = np.array([0.027, 0.019, 0.059, 0.041])
+# Topologia supuesta: R1 en serie con (R2 + R5) || R3, entre "a" y tierra
+mixto_labels = datos_lab["mixto"]["etiquetas"]
+mixto_I_uA = datos_lab["mixto"]["I_uA"]
+mixto_V = datos_lab["mixto"]["V"]
+mixto_ramas = datos_lab["mixto"]["ramas"]
 
 def ensure_dir():
     Path("graficas").mkdir(exist_ok=True)
@@ -45,18 +48,18 @@ def grafica_serie():
 
     x = np.arange(len(serie_labels))
     width = 0.35
-    fig, ax = plt.subplots(figsize=(8, 4.5))
-    ax.bar(x - width/2, serie_V, width, label="V medido")
-    ax.bar(x + width/2, V_calc, width, label="I_prom*R (Ohm)")
-    ax.set_xticks(x)
-    ax.set_xticklabels(serie_labels)
-    ax.set_ylabel("Voltaje [V]")
-    ax.set_title(f"Serie: I_prom={I_A_prom*1e3:.1f} mA")
-    ax.grid(axis="y", alpha=0.3)
-    ax.legend()
-    plt.tight_layout()
-    plt.savefig("graficas/serie_validacion.png", bbox_inches="tight")
-    plt.close()
+    with render.style(ESTILO):
+        fig, ax = render.subplots(figsize=(8, 4.5))
+        ax.bar(x - width/2, serie_V, width, label="V medido")
+        ax.bar(x + width/2, V_calc, width, label="I_prom*R (Ohm)")
+        ax.set_xticks(x)
+        ax.set_xticklabels(serie_labels)
+        ax.set_ylabel("Voltaje [V]")
+        ax.set_title(f"Serie: I_prom={I_A_prom*1e3:.1f} mA")
+        ax.grid(axis="y", alpha=0.3)
+        ax.legend()
+        fig.tight_layout()
+    render.save(fig, "graficas/serie_validacion.png", ESTILO, bbox_inches="tight")
 
     # Req serie
     Req = R_vals.sum()
@@ -69,18 +72,18 @@ def grafica_paralelo():
 
     x = np.arange(len(paralelo_labels))
     width = 0.35
-    fig, ax = plt.subplots(figsize=(8, 4.5))
-    ax.bar(x - width/2, paralelo_I_uA, width, label="I medido")
-    ax.bar(x + width/2, I_calc_uA, width, label="V/R (Ohm)")
-    ax.set_xticks(x)
-    ax.set_xticklabels(paralelo_labels)
-    ax.set_ylabel("Corriente [µA]")
-    ax.set_title(f"Paralelo: V_comun={paralelo_V:.3f} V")
-    ax.grid(axis="y", alpha=0.3)
-    ax.legend()
-    plt.tight_layout()
-    plt.savefig("graficas/paralelo_validacion.png", bbox_inches="tight")
-    plt.close()
+    with render.style(ESTILO):
+        fig, ax = render.subplots(figsize=(8, 4.5))
+        ax.bar(x - width/2, paralelo_I_uA, width, label="I medido")
+        ax.bar(x + width/2, I_calc_uA, width, label="V/R (Ohm)")
+        ax.set_xticks(x)
+        ax.set_xticklabels(paralelo_labels)
+        ax.set_ylabel("Corriente [µA]")
+        ax.set_title(f"Paralelo: V_comun={paralelo_V:.3f} V")
+        ax.grid(axis="y", alpha=0.3)
+        ax.legend()
+        fig.tight_layout()
+    render.save(fig, "graficas/paralelo_validacion.png", ESTILO, bbox_inches="tight")
 
     # Req paralelo
     Req = 1.0 / np.sum(1.0 / R_vals)
@@ -95,42 +98,54 @@ def grafica_mixto():
     width = 0.35
     R_vals = np.array([R[k] for k in mixto_labels])
 
-    fig, ax = plt.subplots(figsize=(8, 4.5))
-    ax.bar(x - width/2, R_vals, width, label="R medida (ohmetro)")
-    ax.bar(x + width/2, R_imp, width, label="V/I (Ohm)")
-    ax.set_xticks(x)
-    ax.set_xticklabels(mixto_labels)
-    ax.set_ylabel("Resistencia [Ω]")
-    ax.set_title("Mixto: consistencia de R por V/I")
-    ax.grid(axis="y", alpha=0.3)
-    ax.legend()
-    plt.tight_layout()
-    plt.savefig("graficas/mixto_validacion.png", bbox_inches="tight")
-    plt.close()
-
-def grafica_equivalentes(Req_s, Req_p, Req_m_report=149.3):
-    etiquetas = ["Serie", "Paralelo", "Mixto"]
-    # Calculo de paralelo y mixto teoricos/estimados ya vienen arriba; mixto se reporta
-    valores = [Req_s, Req_p, Req_m_report]
-    fig, ax = plt.subplots(figsize=(6, 4.5))
-    ax.bar(etiquetas, valores, color=["#4c78a8", "#72b7b2", "#f58518"])
-    ax.set_ylabel("R_eq [Ω]")
-    ax.set_title("Resistencias equivalentes")
-    ax.grid(axis="y", alpha=0.3)
-    plt.tight_layout()
-    plt.savefig("graficas/equivalentes.png", bbox_inches="tight")
-    plt.close()
+    with render.style(ESTILO):
+        fig, ax = render.subplots(figsize=(8, 4.5))
+        ax.bar(x - width/2, R_vals, width, label="R medida (ohmetro)")
+        ax.bar(x + width/2, R_imp, width, label="V/I (Ohm)")
+        ax.set_xticks(x)
+        ax.set_xticklabels(mixto_labels)
+        ax.set_ylabel("Resistencia [Ω]")
+        ax.set_title("Mixto: consistencia de R por V/I")
+        ax.grid(axis="y", alpha=0.3)
+        ax.legend()
+        fig.tight_layout()
+    render.save(fig, "graficas/mixto_validacion.png", ESTILO, bbox_inches="tight")
+
+REQ_MIXTO_REPORTADO = 149.3  # ohm, valor del informe
+
+def req_mixto():
+    # Req entre la entrada del mixto y tierra por analisis nodal
+    sistema = ensamblar_mna(R, mixto_ramas)
+    return resistencia_equivalente(sistema, ("a", "gnd"))
+
+def grafica_equivalentes(Req_s, Req_p, Req_m, Req_m_report=REQ_MIXTO_REPORTADO):
+    # Barras con las Req calculadas (mixto por MNA); el valor reportado del mixto como marca
+    etiquetas = ["Serie", "Paralelo", "Mixto (MNA)"]
+    valores = [Req_s, Req_p, Req_m]
+    with render.style(ESTILO):
+        fig, ax = render.subplots(figsize=(6, 4.5))
+        ax.bar(etiquetas, valores, color=["#4c78a8", "#72b7b2", "#f58518"])
+        ax.plot([1.6, 2.4], [Req_m_report] * 2, "k--", linewidth=2,
+                label=f"Mixto reportado ({Req_m_report:.1f} Ω)")
+        ax.legend(loc="upper right")
+        ax.set_ylabel("R_eq [Ω]")
+        ax.set_title("Resistencias equivalentes")
+        ax.grid(axis="y", alpha=0.3)
+        fig.tight_layout()
+    render.save(fig, "graficas/equivalentes.png", ESTILO, bbox_inches="tight")
 
 def main():
     ensure_dir()
-    Req_s = grafica_serie()
-    Req_p = grafica_paralelo()
-    grafica_mixto()
-    grafica_equivalentes(Req_s, Req_p, Req_m_report=149.3)
+    # Las tres validaciones son independientes: se dibujan en hilos
+    Req_s, Req_p, _ = render.run_threads(lambda grafica: grafica(),
+                                         [grafica_serie, grafica_paralelo, grafica_mixto])
+    Req_m = req_mixto()
+    grafica_equivalentes(Req_s, Req_p, Req_m)
     print("[OK] Graficas generadas en i4/graficas")
     print(f"Req serie   (calc) = {Req_s:.2f} ohm")
     print(f"Req paralelo(calc) = {Req_p:.2f} ohm")
-    print("Req mixto   (repo) = 149.30 ohm")
+    print(f"Req mixto   (repo) = {REQ_MIXTO_REPORTADO:.2f} ohm")
+    print(f"Req mixto   (MNA)  = {Req_m:.2f} ohm")
 
 if __name__ == "__main__":
     main()
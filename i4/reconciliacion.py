@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+I4 - Reconciliacion de mediciones V/I con las leyes de Kirchhoff
+
+Las mediciones se proyectan sobre las restricciones lineales KCL/KVL de la
+topologia por minimos cuadrados ponderados con restricciones:
+
+    min (x - m)^T W (x - m)   sujeto a   C x = 0
+
+resuelto con el sistema KKT disperso [[W, C^T], [C, 0]]. Las filas de C
+linealmente dependientes (p. ej. la KCL de todos los nodos) se descartan
+antes, y los grados de libertad de la prueba son el rango de C. Las
+resistencias se obtienen despues como V/I con los valores corregidos.
+"""
+import numpy as np
+from scipy import linalg, sparse, stats
+from scipy.sparse.linalg import spsolve
+
+from generar_graficas import (
+    serie_labels, serie_V, serie_I_mA, serie_ramas,
+    mixto_labels, mixto_V, mixto_I_uA, mixto_ramas,
+)
+from tolerancias import exactitud_medidor
+
+
+def incertidumbre_lectura(valores, tipo):
+    """Incertidumbre estandar de cada lectura segun la exactitud del medidor"""
+    relativo, absoluto = exactitud_medidor[tipo]
+    return relativo * np.abs(valores) + absoluto
+
+
+def restricciones_kirchhoff(ramas, variables, nodos_externos=("a", "gnd")):
+    """Matriz C dispersa (restricciones x variables) con KCL y KVL
+
+    `variables` es la lista de nombres medidos ("V_R1", "I_R1", ...). Solo se
+    escriben las leyes cuyas ramas estan todas medidas; en `nodos_externos`
+    se conectan elementos no medidos (la fuente), asi que no llevan KCL.
+    """
+    col = {v: j for j, v in enumerate(variables)}
+    filas, cols, vals = [], [], []
+    k = 0
+
+    # KCL: suma de corrientes que salen de cada nodo interno
+    incidentes = {}
+    for nombre, a, b in ramas:
+        incidentes.setdefault(a, []).append((nombre, 1.0))
+        incidentes.setdefault(b, []).append((nombre, -1.0))
+    for nodo, lista in incidentes.items():
+        if nodo in nodos_externos or any(f"I_{n}" not in col for n, _ in lista):
+            continue
+        for nombre, signo in lista:
+            filas.append(k)
+            cols.append(col[f"I_{nombre}"])
+            vals.append(signo)
+        k += 1
+
+    # KVL: una malla por cada rama fuera del arbol generador
+    medidas = [(n, a, b) for n, a, b in ramas if f"V_{n}" in col]
+    padre = {}
+    for nombre, a, b in medidas:
+        for nodo in (a, b):
+            padre.setdefault(nodo, None)
+
+    def camino_raiz(nodo):
+        camino = []
+        while padre[nodo] is not None:
+            anterior, rama, signo = padre[nodo]
+            camino.append((rama, signo))
+            nodo = anterior
+        return nodo, camino
+
+    visitados = set()
+    cuerdas = []
+    adyacencia = {}
+    for nombre, a, b in medidas:
+        adyacencia.setdefault(a, []).append((b, nombre, 1.0))
+        adyacencia.setdefault(b, []).append((a, nombre, -1.0))
+    en_arbol = set()
+    for raiz in padre:
+        if raiz in visitados:
+            continue
+        visitados.add(raiz)
+        pila = [raiz]
+        while pila:
+            nodo = pila.pop()
+            for vecino, rama, signo in adyacencia[nodo]:
+                if vecino not in visitados:
+                    visitados.add(vecino)
+                    # V(nodo) - V(vecino) = signo * V_rama
+                    padre[vecino] = (nodo, rama, signo)
+                    en_arbol.add(rama)
+                    pila.append(vecino)
+    for nombre, a, b in medidas:
+        if nombre not in en_arbol:
+            cuerdas.append((nombre, a, b))
+
+    for nombre, a, b in cuerdas:
+        # V_a - V_b - V_rama = 0, con V_nodo = suma de caidas hasta la raiz
+        coef = {nombre: -1.0}
+        for nodo, s in ((a, 1.0), (b, -1.0)):
+            _, camino = camino_raiz(nodo)
+            for rama, signo in camino:
+                # V(hijo) = V(padre) - signo * V_rama
+                coef[rama] = coef.get(rama, 0.0) - s * signo
+        for rama, c in coef.items():
+            if c != 0.0:
+                filas.append(k)
+                cols.append(col[f"V_{rama}"])
+                vals.append(c)
+        k += 1
+
+    return sparse.csr_matrix((vals, (filas, cols)), shape=(k, len(variables)))
+
+
+def filas_independientes(C):
+    """C sin sus filas linealmente dependientes (QR con pivoteo de C^T)
+
+    Como las restricciones son homogeneas, quitar las filas redundantes no
+    cambia el conjunto C x = 0; el numero de filas que quedan es el rango.
+    """
+    if C.shape[0] == 0:
+        return C
+    densa = C.toarray()
+    rango = np.linalg.matrix_rank(densa)
+    _, pivotes = linalg.qr(densa.T, mode='r', pivoting=True)
+    return C[np.sort(pivotes[:rango])]
+
+
+def reconciliar(variables, medidos, sigma, C, alfa=0.05):
+    """Proyectar las mediciones sobre C x = 0 y evaluar errores groseros
+
+    Devuelve los valores corregidos, los ajustes normalizados de cada
+    medicion y la prueba global chi-cuadrado sobre los residuos de C m.
+    """
+    m = np.asarray(medidos, dtype=float)
+    sigma = np.asarray(sigma, dtype=float)
+    n = m.size
+    C = filas_independientes(sparse.csr_matrix(C))
+    k = C.shape[0]
+    W = sparse.diags(1.0 / sigma ** 2)
+
+    # KKT: [[W, C^T], [C, 0]] [x, lambda] = [W m, 0]
+    KKT = sparse.bmat([[W, C.T], [C, None]], format='csc')
+    rhs = np.concatenate([W @ m, np.zeros(k)])
+    x = spsolve(KKT, rhs)[:n]
+
+    # Prueba global: r = C m ~ N(0, C S C^T) si no hay errores groseros
+    S = sparse.diags(sigma ** 2)
+    CSCt = (C @ S @ C.T).toarray()
+    r = C @ m
+    chi2 = float(r @ np.linalg.solve(CSCt, r)) if k else 0.0
+    p_valor = float(stats.chi2.sf(chi2, k)) if k else 1.0
+
+    # Prueba por medicion: ajuste / desviacion del ajuste
+    ajuste = x - m
+    SCt = (S @ C.T).toarray()
+    var_ajuste = np.einsum('ij,ji->i', SCt, np.linalg.solve(CSCt, SCt.T)) if k else np.zeros(n)
+    z = np.divide(np.abs(ajuste), np.sqrt(var_ajuste),
+                  out=np.zeros(n), where=var_ajuste > 0)
+    z_critico = stats.norm.ppf(1 - alfa / 2)
+
+    return {
+        'variables': list(variables),
+        'medidos': m,
+        'corregidos': x,
+        'ajuste': ajuste,
+        'z': z,
+        'sospechosos': [v for v, zi in zip(variables, z) if zi > z_critico],
+        'chi2': chi2,
+        'gl': k,
+        'p_valor': p_valor,
+        'error_grosero': p_valor < alfa,
+    }
+
+
+def reconciliar_circuito(ramas, etiquetas, V, I_A, nodos_externos=("a", "gnd"), alfa=0.05):
+    """Reconciliar V e I medidos en las ramas `etiquetas` de una topologia"""
+    variables = [f"V_{e}" for e in etiquetas] + [f"I_{e}" for e in etiquetas]
+    medidos = np.concatenate([V, I_A])
+    sigma = np.concatenate([incertidumbre_lectura(V, 'V'), incertidumbre_lectura(I_A, 'I')])
+    C = restricciones_kirchhoff(ramas, variables, nodos_externos)
+    res = reconciliar(variables, medidos, sigma, C, alfa)
+    n = len(etiquetas)
+    res['resistencias'] = dict(zip(etiquetas, res['corregidos'][:n] / res['corregidos'][n:]))
+    return res
+
+
+def imprimir_reconciliacion(titulo, res):
+    """Tabla de valores medidos, corregidos y prueba de errores groseros"""
+    print(f"\n{titulo}")
+    print(f"  {'variable':<8} {'medido':>11} {'corregido':>11} {'z':>6}")
+    for v, m, x, z in zip(res['variables'], res['medidos'], res['corregidos'], res['z']):
+        marca = " *" if v in res['sospechosos'] else ""
+        print(f"  {v:<8} {m:11.4g} {x:11.4g} {z:6.2f}{marca}")
+    print(f"  chi2 = {res['chi2']:.2f} con {res['gl']} g.l. (p = {res['p_valor']:.3g})"
+          + (" -> ERROR GROSERO" if res['error_grosero'] else ""))
+    for e, r in res['resistencias'].items():
+        print(f"  R_{e} (V/I corregidos) = {r:.4g} ohm")
+
+
+def main():
+    serie = reconciliar_circuito(serie_ramas, serie_labels, serie_V, serie_I_mA * 1e-3)
+    imprimir_reconciliacion("Serie", serie)
+
+    mixto = reconciliar_circuito(mixto_ramas, mixto_labels, mixto_V, mixto_I_uA * 1e-6)
+    imprimir_reconciliacion("Mixto", mixto)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+I4 - Analisis de tolerancias por Monte Carlo vectorizado
+
+Cada bloque de muestras es un arreglo (muestras x resistores). Serie y
+paralelo se evaluan en forma cerrada; el mixto (o cualquier red) con una
+solucion lineal en lote. Los resultados se acumulan en histogramas de bordes
+fijos, asi la memoria depende del tamano de bloque y no del total de muestras.
+Los bordes salen del primer bloque; lo que cae fuera se cuenta aparte (por
+debajo y por encima) junto con el minimo y maximo exactos, de modo que las
+colas no se amontonan en los bins extremos.
+"""
+import numpy as np
+
+from generar_graficas import (
+    R, serie_labels, serie_V, paralelo_labels, paralelo_I_uA, paralelo_V,
+    mixto_labels, mixto_V, mixto_I_uA, mixto_ramas,
+)
+
+CUANTILES = (0.025, 0.16, 0.5, 0.84, 0.975)
+
+# Exactitud de los medidores: (fraccion de la lectura, valor absoluto)
+exactitud_medidor = {
+    'V': (0.005, 0.001),   # 0.5 % + 1 mV
+    'I': (0.010, 0.1e-6),  # 1 % + 0.1 uA
+}
+
+
+def muestrear_resistencias(R_nominal, tolerancia, n, rng, distribucion="uniforme"):
+    """Arreglo (n x resistores) de valores dentro de la tolerancia"""
+    R_nominal = np.asarray(R_nominal, dtype=float)
+    if distribucion == "uniforme":
+        u = rng.uniform(-1.0, 1.0, size=(n, R_nominal.size))
+    elif distribucion == "normal":
+        # La tolerancia se toma como 3 sigma
+        u = rng.standard_normal((n, R_nominal.size)) / 3.0
+    else:
+        raise ValueError(f"Distribucion desconocida: {distribucion}")
+    return R_nominal * (1.0 + tolerancia * u)
+
+
+def error_medidor(valores, tipo, rng):
+    """Agregar el error de lectura del medidor (gaussiano, 1 sigma)"""
+    relativo, absoluto = exactitud_medidor[tipo]
+    sigma = relativo * np.abs(valores) + absoluto
+    return valores + sigma * rng.standard_normal(valores.shape)
+
+
+def evaluar_serie(Rm, V_fuente):
+    """Req, corriente y voltajes de rama de resistores en serie"""
+    Req = Rm.sum(axis=1)
+    I = V_fuente / Req
+    return {'Req': Req, 'I': I[:, None], 'V': I[:, None] * Rm}
+
+
+def evaluar_paralelo(Rm, V_comun):
+    """Req y corrientes de rama de resistores en paralelo"""
+    G = 1.0 / Rm
+    Req = 1.0 / G.sum(axis=1)
+    return {'Req': Req, 'I': V_comun * G, 'V': np.full_like(Rm, V_comun)}
+
+
+def evaluar_red_lote(Rm, ramas, entrada, V_fuente, tierra="gnd"):
+    """Resolver una red general para todas las muestras con un solve en lote
+
+    `Rm` tiene una columna por rama en el orden de `ramas`; la fuente de
+    voltaje se conecta entre `entrada` y `tierra`.
+    """
+    nodos = [entrada]
+    for _, a, b in ramas:
+        for nodo in (a, b):
+            if nodo != tierra and nodo not in nodos:
+                nodos.append(nodo)
+    # Matriz de incidencia rama x nodo (tierra descartada)
+    A = np.zeros((len(ramas), len(nodos)))
+    for j, (_, a, b) in enumerate(ramas):
+        if a != tierra:
+            A[j, nodos.index(a)] += 1.0
+        if b != tierra:
+            A[j, nodos.index(b)] -= 1.0
+
+    g = 1.0 / Rm
+    G = np.einsum('rn,sr,rm->snm', A, g, A)
+    V = np.empty((Rm.shape[0], len(nodos)))
+    V[:, 0] = V_fuente
+    if len(nodos) > 1:
+        V[:, 1:] = np.linalg.solve(G[:, 1:, 1:], -G[:, 1:, :1] * V_fuente)[..., 0]
+
+    V_rama = V @ A.T
+    I_rama = g * V_rama
+    I_fuente = np.einsum('sn,sn->s', G[:, 0, :], V)
+    return {'Req': V_fuente / I_fuente, 'I': I_rama, 'V': V_rama}
+
+
+def _histograma_vacio(muestra, n_bins):
+    """Bordes fijos a partir del primer bloque, con margen a ambos lados"""
+    lo = np.min(muestra, axis=0)
+    hi = np.max(muestra, axis=0)
+    margen = 0.5 * (hi - lo) + 1e-12 * np.abs(hi)
+    bordes = np.linspace(lo - margen, hi + margen, n_bins + 1).T
+    return {
+        'bordes': bordes,
+        'conteo': np.zeros((bordes.shape[0], n_bins), dtype=np.int64),
+        'bajo': np.zeros(bordes.shape[0], dtype=np.int64),
+        'alto': np.zeros(bordes.shape[0], dtype=np.int64),
+        'minimo': np.full(bordes.shape[0], np.inf),
+        'maximo': np.full(bordes.shape[0], -np.inf),
+        'suma': np.zeros(bordes.shape[0]),
+        'suma2': np.zeros(bordes.shape[0]),
+        'n': 0,
+    }
+
+
+def _acumular(hist, muestra):
+    """Sumar un bloque (muestras x salidas) a los histogramas"""
+    n_bins = hist['conteo'].shape[1]
+    for k in range(muestra.shape[1]):
+        b = hist['bordes'][k]
+        x = muestra[:, k]
+        bajo = x < b[0]
+        alto = x > b[-1]
+        dentro = x[~(bajo | alto)]
+        # El borde superior cierra el ultimo bin
+        idx = np.minimum(np.searchsorted(b, dentro, side='right') - 1, n_bins - 1)
+        hist['conteo'][k] += np.bincount(idx, minlength=n_bins)
+        hist['bajo'][k] += np.count_nonzero(bajo)
+        hist['alto'][k] += np.count_nonzero(alto)
+    hist['minimo'] = np.minimum(hist['minimo'], muestra.min(axis=0))
+    hist['maximo'] = np.maximum(hist['maximo'], muestra.max(axis=0))
+    hist['suma'] += muestra.sum(axis=0)
+    hist['suma2'] += (muestra ** 2).sum(axis=0)
+    hist['n'] += muestra.shape[0]
+
+
+def _cdf(h):
+    """Nodos y valores de la distribucion acumulada de una salida
+
+    Entre el minimo y el primer borde (y entre el ultimo borde y el maximo)
+    se interpola linealmente con los conteos de fuera de rango.
+    """
+    bordes = h['bordes']
+    n = h['bajo'] + h['conteo'].sum() + h['alto']
+    nodos = np.concatenate([[min(h['minimo'], bordes[0])], bordes, [max(h['maximo'], bordes[-1])]])
+    acumulado = np.concatenate([[0], h['bajo'] + np.concatenate([[0], np.cumsum(h['conteo'])]), [n]])
+    return nodos, acumulado / n
+
+
+def _resumen(hist, etiquetas, cuantiles):
+    """Media, desviacion y cuantiles (interpolados del histograma acumulado)"""
+    media = hist['suma'] / hist['n']
+    std = np.sqrt(np.maximum(hist['suma2'] / hist['n'] - media ** 2, 0.0))
+    salida = {}
+    for k, etiqueta in enumerate(etiquetas):
+        h = {clave: hist[clave][k] for clave in ('bordes', 'conteo', 'bajo', 'alto', 'minimo', 'maximo')}
+        nodos, cdf = _cdf(h)
+        salida[etiqueta] = dict(h, media=media[k], std=std[k],
+                                cuantiles=dict(zip(cuantiles, np.interp(cuantiles, cdf, nodos))))
+    return salida
+
+
+def monte_carlo(evaluar, R_nominal, etiquetas, n_muestras=1_000_000, tolerancia=0.05,
+                con_medidor=True, tam_bloque=100_000, n_bins=200, semilla=0,
+                distribucion="uniforme", cuantiles=CUANTILES):
+    """Monte Carlo por bloques de una funcion `evaluar(Rm) -> {'Req', 'I', 'V'}`
+
+    Devuelve un diccionario con histograma, media, std y cuantiles para
+    Req, cada corriente I_<etiqueta> y cada voltaje V_<etiqueta>.
+    """
+    rng = np.random.default_rng(semilla)
+    hist = None
+    nombres = None
+    restantes = n_muestras
+    while restantes > 0:
+        n = min(tam_bloque, restantes)
+        restantes -= n
+        Rm = muestrear_resistencias(R_nominal, tolerancia, n, rng, distribucion)
+        res = evaluar(Rm)
+        I, V = res['I'], res['V']
+        if con_medidor:
+            I = error_medidor(I, 'I', rng)
+            V = error_medidor(V, 'V', rng)
+        bloque = np.column_stack([res['Req'], I, V])
+        if hist is None:
+            nombres_I = etiquetas if I.shape[1] == len(etiquetas) else ["total"]
+            nombres = (["Req"] + [f"I_{e}" for e in nombres_I]
+                       + [f"V_{e}" for e in etiquetas])
+            hist = _histograma_vacio(bloque, n_bins)
+        _acumular(hist, bloque)
+    return _resumen(hist, nombres, cuantiles)
+
+
+def tolerancia_serie(**kwargs):
+    """Monte Carlo del circuito serie con la fuente que reproduce sum(serie_V)"""
+    R_nom = [R[k] for k in serie_labels]
+    return monte_carlo(lambda Rm: evaluar_serie(Rm, serie_V.sum()), R_nom, serie_labels, **kwargs)
+
+
+def tolerancia_paralelo(**kwargs):
+    """Monte Carlo del circuito paralelo con V comun = paralelo_V"""
+    R_nom = [R[k] for k in paralelo_labels]
+    return monte_carlo(lambda Rm: evaluar_paralelo(Rm, paralelo_V), R_nom, paralelo_labels, **kwargs)
+
+
+def tolerancia_mixto(**kwargs):
+    """Monte Carlo del mixto (mixto_ramas) resuelto en lote"""
+    nombres = [nombre for nombre, _, _ in mixto_ramas]
+    R_nom = [R[k] for k in nombres]
+    # Fuente = caida por el camino R1 -> R2 -> R5
+    medido = dict(zip(mixto_labels, mixto_V))
+    V_fuente = medido["R1"] + medido["R2"] + medido["R5"]
+    return monte_carlo(lambda Rm: evaluar_red_lote(Rm, mixto_ramas, "a", V_fuente),
+                       R_nom, nombres, **kwargs)
+
+
+def comparar_con_medicion(resultado, medidos):
+    """Percentil de cada valor medido dentro de la distribucion simulada"""
+    salida = {}
+    for clave, valor in medidos.items():
+        nodos, cdf = _cdf(resultado[clave])
+        salida[clave] = (valor, float(np.interp(valor, nodos, cdf)))
+    return salida
+
+
+def imprimir_comparacion(titulo, resultado, medidos):
+    """Tabla de cuantiles simulados frente a lo medido"""
+    print(f"\n{titulo}")
+    print(f"  {'magnitud':<10} {'medido':>11} {'q2.5%':>11} {'q50%':>11} {'q97.5%':>11} {'percentil':>9}")
+    for clave, (valor, p) in comparar_con_medicion(resultado, medidos).items():
+        q = resultado[clave]['cuantiles']
+        print(f"  {clave:<10} {valor:11.4g} {q[0.025]:11.4g} {q[0.5]:11.4g} {q[0.975]:11.4g} {p*100:8.1f}%")
+
+
+def main():
+    serie = tolerancia_serie()
+    imprimir_comparacion("Serie (5 % de tolerancia)", serie,
+                         {f"V_{e}": v for e, v in zip(serie_labels, serie_V)})
+
+    paralelo = tolerancia_paralelo()
+    imprimir_comparacion("Paralelo (5 % de tolerancia)", paralelo,
+                         {f"I_{e}": i * 1e-6 for e, i in zip(paralelo_labels, paralelo_I_uA)})
+
+    mixto = tolerancia_mixto()
+    medidos = {f"V_{e}": v for e, v in zip(mixto_labels, mixto_V)}
+    medidos.update({f"I_{e}": i * 1e-6 for e, i in zip(mixto_labels, mixto_I_uA)})
+    imprimir_comparacion("Mixto (5 % de tolerancia)", mixto, medidos)
+
+
+if __name__ == "__main__":
+    main()
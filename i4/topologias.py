@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+I4 - Identificacion automatica de la topologia serie-paralelo del mixto
+
+Se enumeran todas las redes serie-paralelo sobre un conjunto de resistores
+por subconjuntos (bitmask). Para cada subconjunto se memoizan en arreglos
+las redes posibles con su Req y la fraccion de la corriente total que pasa
+por cada resistor; las redes mayores se arman combinando esos bloques sin
+recalcular nada.
+
+Dentro de una subred las razones entre corrientes no cambian al embeberla en
+una red mayor (todas escalan por el mismo factor). Por eso el chi-cuadrado
+parcial de una subred, con su mejor escala, es una cota inferior del de
+cualquier red que la contenga y permite podar con `chi2_max`.
+
+La enumeracion completa crece como ~12^n redes (9 resistores ya no caben en
+4 GB). Para 8-10 resistores `max_por_subconjunto` conserva solo las k
+subredes serie y las k paralelo de menor chi-cuadrado parcial de cada
+subconjunto (las de subconjuntos sin medidas, que empatan, se eligen
+repartidas en Req). Es una poda heuristica: la red optima puede
+perderse si alguna de sus subredes no esta entre las k mejores.
+"""
+import numpy as np
+
+from circuito_mna import ensamblar_mna, resolver_mna
+from generar_graficas import R, mixto_labels, mixto_V, mixto_I_uA
+from reconciliacion import incertidumbre_lectura
+
+
+def _vacio(n):
+    """Bloque sin redes"""
+    return {
+        'Req': np.zeros(0),
+        'frac': np.zeros((0, n)),
+        'A': np.zeros(0, dtype=np.int64),
+        'ia': np.zeros(0, dtype=np.int64),
+        'ib': np.zeros(0, dtype=np.int64),
+    }
+
+
+def _unir(*bloques):
+    """Concatenar bloques en el orden dado"""
+    return {clave: np.concatenate([b[clave] for b in bloques]) for clave in bloques[0]}
+
+
+def _chi2_escala(frac, R_vals, medidas, mascara=None):
+    """Chi-cuadrado con la corriente total ajustada por minimos cuadrados
+
+    La prediccion de cada resistor es I = s*frac, V = s*frac*R; el mejor s
+    tiene forma cerrada y el chi-cuadrado resultante tambien.
+    """
+    mI, wI, mV, wV = medidas
+    if mascara is not None:
+        wI = wI * mascara
+        wV = wV * mascara
+    pV = frac * R_vals
+    a = frac @ (mI * wI) + pV @ (mV * wV)
+    b = (frac ** 2) @ wI + (pV ** 2) @ wV
+    c = np.sum(mI ** 2 * wI) + np.sum(mV ** 2 * wV)
+    s = np.divide(a, b, out=np.zeros_like(a), where=b > 0)
+    return c - s * a, s
+
+
+def _recortar(bloque, k, R_vals, medidas, mascara):
+    """Las k redes del bloque con menor chi-cuadrado parcial
+
+    Si el chi-cuadrado no distingue entre ellas (subconjunto sin medidas)
+    se toman k repartidas a lo largo de Req.
+    """
+    if bloque['Req'].size <= k:
+        return bloque
+    chi2, _ = _chi2_escala(bloque['frac'], R_vals, medidas, mascara)
+    if np.ptp(chi2) <= 1e-9 * max(1.0, abs(chi2.min())):
+        orden = np.argsort(bloque['Req'], kind='stable')
+        quedan = orden[np.linspace(0, orden.size - 1, k).round().astype(np.int64)]
+    else:
+        quedan = np.argpartition(chi2, k - 1)[:k]
+    quedan.sort()
+    return {clave: valor[quedan] for clave, valor in bloque.items()}
+
+
+def enumerar_topologias(R_vals, medidas=None, chi2_max=None, max_por_subconjunto=None):
+    """Memo {subconjunto: {'ser', 'par', 'atomo'}} con todas las redes serie-paralelo
+
+    Si se dan `medidas` y `chi2_max`, las subredes cuyo chi-cuadrado parcial
+    supera `chi2_max` se descartan antes de combinarlas. Con `medidas` y
+    `max_por_subconjunto` = k cada subconjunto propio conserva a lo sumo k
+    redes serie y k paralelo (ver _recortar).
+    """
+    R_vals = np.asarray(R_vals, dtype=float)
+    n = R_vals.size
+    memo = {}
+    completos = {}
+    k = max_por_subconjunto if medidas is not None else None
+
+    def todos(S):
+        if S not in completos:
+            m = memo[S]
+            completos[S] = _unir(m['ser'], m['par'], m['atomo'])
+        return completos[S]
+
+    def no_serie(S):
+        return _unir(memo[S]['par'], memo[S]['atomo'])
+
+    def no_paralelo(S):
+        return _unir(memo[S]['ser'], memo[S]['atomo'])
+
+    for S in sorted(range(1, 1 << n), key=lambda s: (bin(s).count("1"), s)):
+        if S & (S - 1) == 0:
+            i = S.bit_length() - 1
+            atomo = _vacio(n)
+            atomo['Req'] = np.array([R_vals[i]])
+            atomo['frac'] = np.eye(n)[i:i + 1]
+            atomo['A'] = np.array([S])
+            atomo['ia'] = np.array([0])
+            atomo['ib'] = np.array([0])
+            memo[S] = {'ser': _vacio(n), 'par': _vacio(n), 'atomo': atomo}
+            continue
+
+        bajo = S & -S
+        resto = S ^ bajo
+        ser, par = [], []
+        mascara = np.array([(S >> i) & 1 for i in range(n)], dtype=float)
+        recortar = k is not None and S != (1 << n) - 1
+        sub = resto
+        while True:
+            A = bajo | sub
+            if A != S:
+                B = S ^ A
+                tb = todos(B)
+                # Serie: el hijo con el elemento mas bajo no es serie
+                a = no_serie(A)
+                if a['Req'].size and tb['Req'].size:
+                    ia, ib = np.meshgrid(np.arange(a['Req'].size), np.arange(tb['Req'].size), indexing='ij')
+                    ia, ib = ia.ravel(), ib.ravel()
+                    ser.append({
+                        'Req': a['Req'][ia] + tb['Req'][ib],
+                        'frac': a['frac'][ia] + tb['frac'][ib],
+                        'A': np.full(ia.size, A), 'ia': ia, 'ib': ib,
+                    })
+                # Paralelo: el hijo con el elemento mas bajo no es paralelo
+                a = no_paralelo(A)
+                if a['Req'].size and tb['Req'].size:
+                    ia, ib = np.meshgrid(np.arange(a['Req'].size), np.arange(tb['Req'].size), indexing='ij')
+                    ia, ib = ia.ravel(), ib.ravel()
+                    Ra, Rb = a['Req'][ia], tb['Req'][ib]
+                    suma = Ra + Rb
+                    par.append({
+                        'Req': Ra * Rb / suma,
+                        'frac': a['frac'][ia] * (Rb / suma)[:, None] + tb['frac'][ib] * (Ra / suma)[:, None],
+                        'A': np.full(ia.size, A), 'ia': ia, 'ib': ib,
+                    })
+            # Recortar por el camino para que la memoria no dependa del numero de particiones
+            if recortar:
+                for lista in (ser, par):
+                    if sum(b['Req'].size for b in lista) > 4 * k:
+                        lista[:] = [_recortar(_unir(*lista), k, R_vals, medidas, mascara)]
+            if sub == 0:
+                break
+            sub = (sub - 1) & resto
+
+        bloque_ser = _unir(*ser) if ser else _vacio(n)
+        bloque_par = _unir(*par) if par else _vacio(n)
+        if medidas is not None and chi2_max is not None and S != (1 << n) - 1:
+            for bloque in (bloque_ser, bloque_par):
+                chi2, _ = _chi2_escala(bloque['frac'], R_vals, medidas, mascara)
+                quedan = chi2 <= chi2_max
+                for clave in bloque:
+                    bloque[clave] = bloque[clave][quedan]
+        if recortar:
+            bloque_ser = _recortar(bloque_ser, k, R_vals, medidas, mascara)
+            bloque_par = _recortar(bloque_par, k, R_vals, medidas, mascara)
+        memo[S] = {'ser': bloque_ser, 'par': bloque_par, 'atomo': _vacio(n)}
+
+    return memo
+
+
+def describir(memo, S, tipo, idx, nombres):
+    """Expresion legible de la red `idx` del bloque `tipo` del subconjunto S"""
+    m = memo[S]
+    if tipo == 'atomo':
+        return nombres[S.bit_length() - 1]
+    bloque = m[tipo]
+    A, ia, ib = int(bloque['A'][idx]), int(bloque['ia'][idx]), int(bloque['ib'][idx])
+    B = S ^ A
+
+    def elegir(T, orden, k):
+        for t in orden:
+            tam = memo[T][t]['Req'].size
+            if k < tam:
+                return t, k
+            k -= tam
+        raise IndexError(k)
+
+    orden_a = ('par', 'atomo') if tipo == 'ser' else ('ser', 'atomo')
+    ta, ka = elegir(A, orden_a, ia)
+    tb, kb = elegir(B, ('ser', 'par', 'atomo'), ib)
+    texto_a = describir(memo, A, ta, ka, nombres)
+    texto_b = describir(memo, B, tb, kb, nombres)
+    if tipo == 'ser':
+        if ta == 'par':
+            texto_a = f"({texto_a})"
+        if tb == 'par':
+            texto_b = f"({texto_b})"
+        return f"{texto_a} + {texto_b}"
+    if ta == 'ser':
+        texto_a = f"({texto_a})"
+    if tb == 'ser':
+        texto_b = f"({texto_b})"
+    return f"{texto_a} || {texto_b}"
+
+
+def identificar_topologia(nombres, R_vals, V=None, I=None, Req_medida=None, sigma_Req=None,
+                          mejores=5, chi2_max=None, max_por_subconjunto=None):
+    """Mejores redes serie-paralelo frente a V/I medidos (NaN = no medido)
+
+    Lanza ValueError si la poda con `chi2_max` no deja ninguna red.
+    """
+    n = len(nombres)
+    V = np.full(n, np.nan) if V is None else np.asarray(V, dtype=float)
+    I = np.full(n, np.nan) if I is None else np.asarray(I, dtype=float)
+    wV = np.where(np.isnan(V), 0.0, 1.0 / incertidumbre_lectura(np.nan_to_num(V), 'V') ** 2)
+    wI = np.where(np.isnan(I), 0.0, 1.0 / incertidumbre_lectura(np.nan_to_num(I), 'I') ** 2)
+    medidas = (np.nan_to_num(I), wI, np.nan_to_num(V), wV)
+
+    memo = enumerar_topologias(R_vals, medidas, chi2_max, max_por_subconjunto)
+    S = (1 << n) - 1
+    total = sum(memo[S][t]['Req'].size for t in ('ser', 'par', 'atomo'))
+    if not total:
+        raise ValueError(f"Ninguna red serie-paralelo de {', '.join(nombres)} sobrevive a la poda "
+                         f"con chi2_max = {chi2_max}; aumentelo o no lo use")
+    candidatos = []
+    for tipo in ('ser', 'par', 'atomo'):
+        bloque = memo[S][tipo]
+        if not bloque['Req'].size:
+            continue
+        chi2, s = _chi2_escala(bloque['frac'], np.asarray(R_vals, dtype=float), medidas)
+        if Req_medida is not None:
+            sigma = sigma_Req if sigma_Req is not None else 0.01 * Req_medida
+            chi2 = chi2 + ((bloque['Req'] - Req_medida) / sigma) ** 2
+        k = min(mejores, chi2.size)
+        for idx in np.argpartition(chi2, k - 1)[:k]:
+            candidatos.append((chi2[idx], tipo, idx, bloque['Req'][idx], s[idx]))
+
+    candidatos.sort(key=lambda c: c[0])
+    return total, [
+        {
+            'topologia': describir(memo, S, tipo, idx, nombres),
+            'chi2': chi2,
+            'Req': Req,
+            'I_total': s,
+        }
+        for chi2, tipo, idx, Req, s in candidatos[:mejores]
+    ]
+
+
+def main():
+    nombres = mixto_labels
+    R_vals = [R[k] for k in nombres]
+    total, mejores = identificar_topologia(nombres, R_vals, V=mixto_V, I=mixto_I_uA * 1e-6)
+    print(f"Mixto con {', '.join(nombres)}: {total} topologias evaluadas")
+    for c in mejores:
+        print(f"  chi2={c['chi2']:10.1f}  Req={c['Req']:7.2f} ohm  {c['topologia']}")
+
+    # Con R4 (no medido) y el Req reportado como dato adicional
+    nombres = ["R1", "R2", "R3", "R4", "R5"]
+    medido_V = dict(zip(mixto_labels, mixto_V))
+    medido_I = dict(zip(mixto_labels, mixto_I_uA * 1e-6))
+    V = [medido_V.get(k, np.nan) for k in nombres]
+    I = [medido_I.get(k, np.nan) for k in nombres]
+    total, mejores = identificar_topologia(nombres, [R[k] for k in nombres], V=V, I=I,
+                                           Req_medida=149.3)
+    print(f"\nMixto con {', '.join(nombres)} y Req = 149.3 ohm: {total} topologias evaluadas")
+    for c in mejores:
+        print(f"  chi2={c['chi2']:10.1f}  Req={c['Req']:7.2f} ohm  {c['topologia']}")
+
+
+    # Red sintetica de 9 resistores: poda con las k mejores subredes
+    nombres = [f"R{i}" for i in range(1, 10)]
+    R_sint = dict(zip(nombres, [47.0, 100.0, 150.0, 220.0, 330.0, 470.0, 68.0, 82.0, 120.0]))
+    # (R1 + R2) || R3, en serie con R4 || (R5 + R6), en serie con (R7 || R8) + R9
+    ramas = [("R1", "a", "p"), ("R2", "p", "b"), ("R3", "a", "b"),
+             ("R4", "b", "c"), ("R5", "b", "q"), ("R6", "q", "c"),
+             ("R7", "c", "d"), ("R8", "c", "d"), ("R9", "d", "gnd")]
+    sistema = ensamblar_mna(R_sint, ramas)
+    I_sint = resolver_mna(sistema, corrientes={"a": 1e-3})["I_ramas"][:, 0]
+    I_sint = np.abs(I_sint)
+    V_sint = I_sint * np.array([R_sint[k] for k in nombres])
+    total, mejores = identificar_topologia(nombres, [R_sint[k] for k in nombres], V=V_sint, I=I_sint,
+                                           max_por_subconjunto=20)
+    print(f"\nRed sintetica de 9 resistores (k = 20 por subconjunto): {total} topologias evaluadas")
+    for c in mejores[:3]:
+        print(f"  chi2={c['chi2']:10.3g}  Req={c['Req']:7.2f} ohm  {c['topologia']}")
+
+
+if __name__ == "__main__":
+    main()
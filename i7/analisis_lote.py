@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Análisis por lotes de transformadores para muchos grupos
+Taller 3: Estudio de diferentes configuraciones de transformadores
+
+Mismo esquema que datos/ para cada grupo (<raiz>/<grupo>/, ver
+tools/lab_store.py). La relación k = Vs/Vp de ambos transformadores y la
+eficiencia Ps/Pp de cada carga se calculan a la vez sobre el eje de grupos
+(tools/group_batch.py); las figuras por grupo se dibujan en un pool de
+procesos (o de hilos con --hilos) y el resumen marca los grupos atípicos.
+Las trazas de forma de onda (trazas/) no forman parte de la entrega por
+grupo, así que aquí la eficiencia es siempre Ps/Pp.
+
+    python analisis_lote.py entregas/
+    python analisis_lote.py --sinteticos 100
+    python analisis_lote.py --sinteticos 30 --hilos
+"""
+
+import argparse
+import tempfile
+import time
+import numpy as np
+from pathlib import Path
+
+from group_batch import flag_outliers, load_groups, render_pool, stack, synthesize_groups
+from results_db import ResultsDB, input_hash
+import render
+
+from generar_graficas import ESTILO, potencia_data
+
+TRANSFORMADORES = {'elevador': 'elevador_data', 'reductor': 'reductor_data'}
+CASOS = [caso.replace('\n', ' ') for caso in potencia_data['casos']]
+
+COLUMNAS_MEDIDAS = {'elevador_data': ('Vs',), 'reductor_data': ('Vs',), 'potencia_data': ('Ps',)}
+
+
+def ajustar_lote(grupos):
+    """k medio (con error estándar) por transformador y eficiencia por caso, eje 0 = grupos"""
+    resultados = {}
+    for clave, conjunto in TRANSFORMADORES.items():
+        k = stack(grupos, conjunto, 'Vs') / stack(grupos, conjunto, 'Vp')
+        n = np.sum(np.isfinite(k), axis=1)
+        teorico = stack(grupos, conjunto, 'k_teorico')
+        resultados[clave] = {
+            'k': np.nanmean(k, axis=1),
+            'sigma': np.nanstd(k, axis=1, ddof=1) / np.sqrt(n),
+            'teorico': teorico,
+            'error': np.abs(np.nanmean(k, axis=1) - teorico) / teorico,
+        }
+    eficiencia = stack(grupos, 'potencia_data', 'Ps') / stack(grupos, 'potencia_data', 'Pp') * 100
+    resultados['eficiencia'] = {'por_caso': eficiencia, 'promedio': np.nanmean(eficiencia, axis=1)}
+    return resultados
+
+
+def grafica_grupo(nombre, datos, ajustes, carpeta, dpi=100):
+    """Figura resumen de un grupo: k vs Vp de ambos transformadores y eficiencia por carga"""
+    with render.style(ESTILO):
+        fig, (ax1, ax2, ax3) = render.subplots(1, 3, figsize=(18, 6))
+        for ax, (clave, conjunto), color in zip((ax1, ax2), TRANSFORMADORES.items(), ('bo-', 'go-')):
+            Vp = np.array(datos[conjunto]['Vp'])
+            k = np.array(datos[conjunto]['Vs']) / Vp
+            ax.plot(Vp, k, color, linewidth=2, markersize=8, label='Datos experimentales')
+            ax.axhline(y=datos[conjunto]['k_teorico'], color='r', linestyle='--', linewidth=2,
+                       label=f'Teórico k={datos[conjunto]["k_teorico"]}')
+            ax.set_xlabel('Voltaje primario Vp [V]')
+            ax.set_ylabel('Relación k = Vs/Vp')
+            ax.set_title(f'{datos[conjunto]["etiqueta"]}\nk = {ajustes[clave]["k"]:.3f} ± {ajustes[clave]["sigma"]:.3f}')
+            ax.grid(True, alpha=0.3)
+            ax.legend(fontsize=9)
+
+        x_pos = np.arange(len(CASOS))
+        ax3.bar(x_pos, ajustes['eficiencia'], color='green', alpha=0.7)
+        ax3.set_xticks(x_pos)
+        ax3.set_xticklabels(potencia_data['casos'], fontsize=9)
+        ax3.set_ylabel('Eficiencia [%]')
+        ax3.set_title('Eficiencia por tipo de carga')
+        ax3.grid(True, alpha=0.3, axis='y')
+
+        fig.suptitle(f'Taller 3 - {nombre}')
+        # Márgenes fijos: tight_layout costaría más que el resto de la figura
+        fig.subplots_adjust(left=0.05, right=0.98, bottom=0.14, top=0.84, wspace=0.25)
+    ruta = Path(carpeta) / f'{nombre}.png'
+    render.save(fig, ruta, ESTILO, dpi=dpi)
+    return str(ruta)
+
+
+def resumen_lote(nombres, resultados):
+    """Resumen con los grupos atípicos marcados; devuelve {grupo: [magnitudes]}"""
+    atipicos = {}
+    print("\n" + "="*60)
+    print(f"RESUMEN DEL LOTE - {len(nombres)} grupos")
+    print("="*60)
+    for clave in TRANSFORMADORES:
+        r = resultados[clave]
+        print(f"Transformador {clave.capitalize()}:")
+        print(f"  k mediana: {np.nanmedian(r['k']):.3f} (IQR {np.nanpercentile(r['k'], 25):.3f} - "
+              f"{np.nanpercentile(r['k'], 75):.3f}), error mediano: {np.nanmedian(r['error']) * 100:.1f}%")
+        for i in np.flatnonzero(flag_outliers(r['k'])):
+            print(f"  [ATIPICO] {nombres[i]}: k = {r['k'][i]:.3f}")
+            atipicos.setdefault(nombres[i], []).append(f'k {clave}')
+    e = resultados['eficiencia']
+    print("Eficiencia:")
+    for j, caso in enumerate(CASOS):
+        print(f"  {caso}: mediana {np.nanmedian(e['por_caso'][:, j]):.1f}%")
+    for i in np.flatnonzero(flag_outliers(e['por_caso'].T).any(axis=0)):
+        print(f"  [ATIPICO] {nombres[i]}: eficiencia promedio {e['promedio'][i]:.1f}%")
+        atipicos.setdefault(nombres[i], []).append('eficiencia')
+    print()
+    print(f"Grupos con algún resultado atípico: {len(atipicos)}")
+    for nombre, claves in sorted(atipicos.items()):
+        print(f"  {nombre}: {', '.join(claves)}")
+    print("="*60)
+    return atipicos
+
+
+def registrar_lote(nombres, grupos, resultados, sesion=None):
+    """Guarda los resultados de cada grupo en resultados.sqlite (tools/results_db.py)"""
+    db = ResultsDB()
+    if not db.enabled:
+        return
+    try:
+        for i, nombre in enumerate(nombres):
+            datos = [grupos[nombre][c] for c in ('elevador_data', 'reductor_data', 'potencia_data')]
+            with db.run('i7', 'analisis_lote.py', input_hash(*datos), session=sesion, group=nombre) as run:
+                for clave in TRANSFORMADORES:
+                    r = resultados[clave]
+                    run.add('k', clave, r['k'][i], r['sigma'][i], None, r['teorico'][i])
+                for caso, valor in zip(CASOS, resultados['eficiencia']['por_caso'][i]):
+                    run.add('eficiencia', caso, valor, None, '%', None)
+    finally:
+        db.close()
+
+
+def analizar(raiz, salida='graficas/lote', procesos=None, graficas=True, sesion=None, hilos=False,
+             registrar=True):
+    """Cálculos, figuras, resumen y registro de todos los grupos bajo `raiz`
+
+    Con registrar=False (grupos simulados) no se escribe en resultados.sqlite.
+    """
+    t0 = time.perf_counter()
+    grupos = load_groups(raiz)
+    nombres = list(grupos)
+    if not nombres:
+        raise ValueError(f'no hay grupos en {raiz}')
+    resultados = ajustar_lote(grupos)
+    t_ajuste = time.perf_counter() - t0
+
+    if graficas:
+        Path(salida).mkdir(parents=True, exist_ok=True)
+        trabajos = [(nombre, grupos[nombre],
+                     {'elevador': {k: float(v[i]) for k, v in resultados['elevador'].items()},
+                      'reductor': {k: float(v[i]) for k, v in resultados['reductor'].items()},
+                      'eficiencia': resultados['eficiencia']['por_caso'][i]}, salida)
+                    for i, nombre in enumerate(nombres)]
+        render_pool(grafica_grupo, trabajos, procesos, threads=hilos)
+    t_total = time.perf_counter() - t0
+
+    atipicos = resumen_lote(nombres, resultados)
+    if registrar:
+        registrar_lote(nombres, grupos, resultados, sesion)
+    print(f"Cálculos: {t_ajuste * 1e3:.0f} ms; total con figuras: {t_total:.1f} s")
+    return resultados, atipicos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Análisis de transformadores para muchos grupos.')
+    parser.add_argument('raiz', nargs='?', help='carpeta con un almacén de datos por grupo')
+    parser.add_argument('--sinteticos', type=int, metavar='N', help='simular N grupos a partir de datos/')
+    parser.add_argument('--salida', default='graficas/lote')
+    parser.add_argument('--procesos', type=int)
+    parser.add_argument('--hilos', action='store_true', help='dibujar en hilos en lugar de procesos')
+    parser.add_argument('--sin-graficas', action='store_true')
+    parser.add_argument('--sesion', help='etiqueta del semestre para resultados.sqlite')
+    args = parser.parse_args()
+    if args.raiz is None and not args.sinteticos:
+        parser.error('indique la carpeta de grupos o --sinteticos N')
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        raiz = args.raiz
+        if args.sinteticos:
+            raiz = carpeta
+            synthesize_groups(Path(__file__).resolve().parent / 'datos', raiz, args.sinteticos, COLUMNAS_MEDIDAS)
+        # Los grupos simulados no van al almacen de resultados de los semestres
+        analizar(raiz, args.salida, args.procesos, not args.sin_graficas, args.sesion, args.hilos,
+                 registrar=not args.sinteticos)
+
+
+if __name__ == "__main__":
+    main()
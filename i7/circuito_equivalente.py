@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Estimacion de los parametros del circuito equivalente del transformador
+
+Modelo T referido al primario: R1 + jX1 en serie, rama de magnetizacion
+Rc || jXm, y R2' + jX2' hacia la carga a^2*RL (lamparas, RL = Vs/Is).
+La reactancia de dispersion se reparte por igual (X1 = X2'), asi que los
+parametros libres son (R1, R2', X1, Rc, Xm).
+
+Todos los puntos de carga se ajustan juntos con Levenberg-Marquardt. El
+ajuste esta vectorizado sobre un eje de lote: cada fila es un
+transformador/barrido distinto y todas se iteran a la vez.
+
+Los parametros se ajustan en escala logaritmica, asi que uno al que los
+datos no son sensibles puede correr hacia 0 (o infinito) sin limite; con
+el barrido de lamparas le pasa a X1. Los que terminan a mas de seis
+ordenes de magnitud de theta_inicial se marcan como no restringidos: su
+varianza es NaN y no entran en la covarianza de los demas.
+"""
+
+import numpy as np
+
+from generar_graficas import potencia_data
+
+PARAMETROS = ('R1', 'R2', 'X1', 'Rc', 'Xm')
+theta_inicial = np.array([5.0, 5.0, 5.0, 2000.0, 500.0])
+
+# Desplazamiento maximo (en escala log) desde theta_inicial de un parametro
+# que los datos todavia determinan
+LIMITE_LOG = np.log(1e6)
+
+# Incertidumbre de lectura: fraccion de la lectura + resolucion
+exactitud = {'V': (0.005, 0.01), 'I': (0.01, 0.001)}
+
+
+def fasores(theta, Vp, RL, a):
+    """Ip, E (rama de magnetizacion) e I2' complejos; theta (B, 5), Vp y RL (B, K)"""
+    R1, R2, X1, Rc, Xm = (theta[:, j:j + 1] for j in range(5))
+    a = np.asarray(a, dtype=float).reshape(-1, 1)
+    Z1 = R1 + 1j * X1
+    Z2 = R2 + 1j * X1 + a ** 2 * RL
+    Zm = (Rc * 1j * Xm) / (Rc + 1j * Xm)
+    Z_in = Z1 + Zm * Z2 / (Zm + Z2)
+    Ip = Vp / Z_in
+    E = Vp - Ip * Z1
+    return Ip, E, E / Z2
+
+
+def modelo_fasorial(theta, Vp, RL, a):
+    """|Ip|, |Vs| e |Is| predichos; theta (B, 5), Vp y RL (B, K), a (B,)"""
+    Ip, _, I2 = fasores(theta, Vp, RL, a)
+    a = np.asarray(a, dtype=float).reshape(-1, 1)
+    return np.abs(Ip), np.abs(I2 * RL * a), np.abs(I2 * a)
+
+
+def _residuos(log_theta, Vp, RL, a, medidas, sigmas):
+    """Residuos normalizados (B, 3K) con parametros en escala logaritmica"""
+    pred = modelo_fasorial(np.exp(log_theta), Vp, RL, a)
+    return np.concatenate([(p - m) / s for p, m, s in zip(pred, medidas, sigmas)], axis=1)
+
+
+def _jacobiano(log_theta, args, r0, h=1e-6):
+    """Jacobiano por diferencias finitas, vectorizado sobre el lote"""
+    B, P = log_theta.shape
+    J = np.empty((B, r0.shape[1], P))
+    for j in range(P):
+        paso = log_theta.copy()
+        paso[:, j] += h
+        J[:, :, j] = (_residuos(paso, *args) - r0) / h
+    return J
+
+
+def ajustar_lote(Vp, Ip, Vs, Is, a, theta0=None, max_iter=200, tol=1e-10):
+    """Levenberg-Marquardt en lote; cada fila de los arreglos (B, K) es un barrido
+
+    Devuelve los parametros (B, 5), su covarianza (B, 5, 5), el chi-cuadrado
+    y los grados de libertad de cada ajuste, y en 'restringido' (B, 5) si
+    cada parametro quedo determinado por los datos (ver LIMITE_LOG).
+    """
+    Vp, Ip, Vs, Is = (np.atleast_2d(np.asarray(x, dtype=float)) for x in (Vp, Ip, Vs, Is))
+    B, K = Vp.shape
+    a = np.broadcast_to(np.asarray(a, dtype=float), (B,))
+    RL = Vs / Is
+    medidas = (Ip, Vs, Is)
+    sigmas = (exactitud['I'][0] * Ip + exactitud['I'][1],
+              exactitud['V'][0] * Vs + exactitud['V'][1],
+              exactitud['I'][0] * Is + exactitud['I'][1])
+    args = (Vp, RL, a, medidas, sigmas)
+
+    theta0 = theta_inicial if theta0 is None else np.asarray(theta0, dtype=float)
+    x = np.log(np.broadcast_to(theta0, (B, len(PARAMETROS))).copy())
+    x0 = x.copy()
+    r = _residuos(x, *args)
+    chi2 = np.sum(r ** 2, axis=1)
+    lam = np.full(B, 1e-3)
+    activo = np.ones(B, dtype=bool)
+    P = x.shape[1]
+
+    for _ in range(max_iter):
+        if not activo.any():
+            break
+        J = _jacobiano(x, args, r)
+        JtJ = np.einsum('bkp,bkq->bpq', J, J)
+        Jtr = np.einsum('bkp,bk->bp', J, r)
+        diag = np.einsum('bpp->bp', JtJ)
+        # Piso para parametros sin sensibilidad (evita matrices singulares)
+        diag = np.maximum(diag, 1e-9 * diag.max(axis=1, keepdims=True) + 1e-300)
+        A = JtJ + (lam[:, None] * diag)[:, :, None] * np.eye(P)
+        delta = -np.linalg.solve(A, Jtr[..., None])[..., 0]
+        delta[~activo] = 0.0
+
+        x_nuevo = x + delta
+        r_nuevo = _residuos(x_nuevo, *args)
+        chi2_nuevo = np.sum(r_nuevo ** 2, axis=1)
+        mejora = chi2_nuevo < chi2
+        x[mejora] = x_nuevo[mejora]
+        r[mejora] = r_nuevo[mejora]
+        # Convergencia: cambio relativo del chi-cuadrado muy pequeno
+        convergio = mejora & ((chi2 - chi2_nuevo) <= tol * np.maximum(chi2, 1.0))
+        chi2[mejora] = chi2_nuevo[mejora]
+        lam = np.where(mejora, lam / 10.0, lam * 10.0)
+        activo &= ~convergio & (lam < 1e12)
+
+    # Covarianza en escala log -> escala lineal: C = D C_log D, D = diag(theta),
+    # solo sobre los parametros restringidos
+    restringido = np.abs(x - x0) < LIMITE_LOG
+    J = np.where(restringido[:, None, :], _jacobiano(x, args, r), 0.0)
+    gl = 3 * K - P
+    escala = np.maximum(chi2 / max(gl, 1), 1.0)
+    C_log = np.linalg.pinv(np.einsum('bkp,bkq->bpq', J, J)) * escala[:, None, None]
+    theta = np.exp(x)
+    cov = theta[:, :, None] * C_log * theta[:, None, :]
+    libre = ~restringido
+    cov[libre[:, :, None] | libre[:, None, :]] = np.nan
+    return {'theta': theta, 'cov': cov, 'chi2': chi2, 'gl': gl, 'restringido': restringido}
+
+
+def ajustar_potencia_data(a=2.0):
+    """Ajuste del barrido de carga de potencia_data (reductor, Np/Ns = 2)"""
+    return ajustar_lote(potencia_data['Vp'], potencia_data['Ip'],
+                        potencia_data['Vs'], potencia_data['Is'], a)
+
+
+def main():
+    res = ajustar_potencia_data()
+    theta, cov = res['theta'][0], res['cov'][0]
+    print("Circuito equivalente (referido al primario, X1 = X2'):")
+    for nombre, valor, var, ok in zip(PARAMETROS, theta, np.diag(cov), res['restringido'][0]):
+        if ok:
+            print(f"  {nombre:>3} = {valor:10.2f} ± {np.sqrt(var):.2f} ohm")
+        else:
+            print(f"  {nombre:>3} = no restringido por los datos (el ajuste lo lleva a {valor:.2g} ohm)")
+    print(f"  chi2 = {res['chi2'][0]:.2f} con {res['gl']} g.l.")
+
+    Ip, Vs, Is = modelo_fasorial(res['theta'], np.atleast_2d(potencia_data['Vp']),
+                                 np.atleast_2d(np.array(potencia_data['Vs']) / np.array(potencia_data['Is'])),
+                                 2.0)
+    print("  caso                       Ip med/mod      Vs med/mod      Is med/mod")
+    for k, caso in enumerate(potencia_data['casos']):
+        print(f"  {caso.replace(chr(10), ' '):<24} {potencia_data['Ip'][k]:.3f}/{Ip[0, k]:.3f}"
+              f"   {potencia_data['Vs'][k]:6.2f}/{Vs[0, k]:6.2f}   {potencia_data['Is'][k]:.3f}/{Is[0, k]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analisis de formas de onda del transformador (Vp, Ip, Vs, Is)
+
+Lee capturas de osciloscopio o DAQ y calcula por bloques, sin cargar el
+archivo completo en memoria: valores RMS verdaderos, potencia real,
+reactiva y aparente, factor de potencia y contenido armonico.
+
+Formatos soportados (una columna por canal, en el orden Vp, Ip, Vs, Is):
+  - .bin / .dat: binario crudo intercalado (float32 por defecto), memmap
+  - .npy: arreglo (muestras, 4), abierto con mmap_mode='r'
+  - .csv: texto; si hay 5 columnas la primera es el tiempo y se ignora
+"""
+
+import warnings
+import numpy as np
+from pathlib import Path
+
+CANALES = ('Vp', 'Ip', 'Vs', 'Is')
+TAM_FFT_MIN = 256  # segmento mas corto con el que se estima el espectro
+
+
+def abrir_traza(ruta, dtype=np.float32, n_canales=4):
+    """Arreglo (muestras, canales) mapeado en memoria para .bin/.dat/.npy"""
+    ruta = Path(ruta)
+    if ruta.suffix == '.npy':
+        return np.load(ruta, mmap_mode='r')
+    datos = np.memmap(ruta, dtype=dtype, mode='r')
+    return datos[:datos.size - datos.size % n_canales].reshape(-1, n_canales)
+
+
+def bloques_traza(ruta, tam_bloque=1 << 18, dtype=np.float32):
+    """Generador de bloques (n, 4) de Vp, Ip, Vs, Is"""
+    ruta = Path(ruta)
+    if ruta.suffix == '.csv':
+        with open(ruta, 'r', encoding='utf-8') as f:
+            primera = f.readline()
+            try:
+                fila = np.array(primera.split(','), dtype=float)
+                pendiente = [fila]
+            except ValueError:
+                pendiente = []  # encabezado
+            while True:
+                with warnings.catch_warnings():
+                    # loadtxt avisa al llegar al final del archivo
+                    warnings.simplefilter('ignore', UserWarning)
+                    bloque = np.loadtxt(f, delimiter=',', max_rows=tam_bloque, ndmin=2)
+                if pendiente:
+                    bloque = np.vstack([np.atleast_2d(pendiente.pop())] + ([bloque] if bloque.size else []))
+                if bloque.size == 0:
+                    return
+                yield bloque[:, -4:]
+        return
+
+    datos = abrir_traza(ruta, dtype)
+    for inicio in range(0, datos.shape[0], tam_bloque):
+        yield np.asarray(datos[inicio:inicio + tam_bloque], dtype=float)
+
+
+def analizar_traza(ruta, fs, tam_bloque=1 << 18, tam_fft=1 << 14, n_armonicos=15, dtype=np.float32):
+    """Potencias y armonicos de primario y secundario en una sola pasada
+
+    Las sumas de v^2, i^2 y v*i se acumulan por bloque. El espectro se
+    promedia sobre segmentos de `tam_fft` muestras con ventana de Hann
+    (metodo de Welch), incluido el espectro cruzado V-I para el desfase
+    de la fundamental. Si la captura es mas corta que `tam_fft`, el espectro
+    sale de un solo segmento con la mayor potencia de dos que cabe en ella
+    (resolucion fs / segmento).
+    """
+    n = 0
+    sumas = np.zeros(4)       # sum x^2 por canal
+    suma_vi = np.zeros(2)     # sum v*i para primario y secundario
+    ventana = np.hanning(tam_fft)
+    espectro = np.zeros((4, tam_fft // 2 + 1))
+    cruzado = np.zeros((2, tam_fft // 2 + 1), dtype=complex)
+    n_seg = 0
+    resto = np.zeros((0, 4))
+
+    for bloque in bloques_traza(ruta, tam_bloque, dtype):
+        n += bloque.shape[0]
+        sumas += np.einsum('ij,ij->j', bloque, bloque)
+        suma_vi += np.einsum('ij,ij->j', bloque[:, [0, 2]], bloque[:, [1, 3]])
+
+        # Segmentos completos para la FFT; el sobrante pasa al siguiente bloque
+        datos = np.vstack([resto, bloque]) if resto.size else bloque
+        k = datos.shape[0] // tam_fft
+        if k:
+            seg = datos[:k * tam_fft].reshape(k, tam_fft, 4).transpose(0, 2, 1)
+            X = np.fft.rfft(seg * ventana, axis=-1)
+            espectro += np.sum(np.abs(X) ** 2, axis=0)
+            cruzado += np.sum(X[:, [0, 2]] * np.conj(X[:, [1, 3]]), axis=0)
+            n_seg += k
+        resto = datos[k * tam_fft:]
+
+    if n == 0:
+        raise ValueError(f"Traza vacia: {ruta}")
+    if n_seg == 0:
+        # Captura mas corta que tam_fft: todo quedo en `resto`
+        if n < TAM_FFT_MIN:
+            raise ValueError(f"Traza demasiado corta para el espectro: {n} muestras (minimo {TAM_FFT_MIN})")
+        tam_fft = 1 << (n.bit_length() - 1)
+        ventana = np.hanning(tam_fft)
+        X = np.fft.rfft(resto[:tam_fft].T * ventana, axis=-1)
+        espectro = np.abs(X) ** 2
+        cruzado = X[[0, 2]] * np.conj(X[[1, 3]])
+        n_seg = 1
+
+    rms = np.sqrt(sumas / n)
+    P = suma_vi / n
+    S = rms[[0, 2]] * rms[[1, 3]]
+    resultado = {'n_muestras': n, 'duracion_s': n / fs}
+    for j, (v, i) in enumerate((('Vp', 'Ip'), ('Vs', 'Is'))):
+        lado = 'p' if j == 0 else 's'
+        resultado[f'{v}_rms'] = rms[2 * j]
+        resultado[f'{i}_rms'] = rms[2 * j + 1]
+        resultado[f'P{lado}'] = P[j]
+        resultado[f'S{lado}'] = S[j]
+        # Potencia no activa total (incluye distorsion)
+        resultado[f'N{lado}'] = np.sqrt(max(S[j] ** 2 - P[j] ** 2, 0.0))
+        resultado[f'FP{lado}'] = P[j] / S[j] if S[j] > 0 else np.nan
+
+    resultado.update(_armonicos(espectro / n_seg, cruzado / n_seg, fs, tam_fft, ventana, n_armonicos))
+    resultado['eficiencia'] = resultado['Ps'] / resultado['Pp']
+    return resultado
+
+
+def _armonicos(espectro, cruzado, fs, tam_fft, ventana, n_armonicos):
+    """RMS de cada armonico, THD y potencia reactiva de la fundamental"""
+    # Parseval: la suma de |X|^2 en el lobulo de un seno de RMS A es N*sum(w^2)*A^2/2
+    escala = 2.0 / (np.sum(ventana ** 2) * tam_fft)
+    psd = espectro * escala
+    psd_cruzada = cruzado * escala
+    df = fs / tam_fft
+
+    # Fundamental: pico del voltaje primario (sin DC)
+    k0 = 1 + int(np.argmax(psd[0, 1:]))
+    f0 = k0 * df
+    ancho = 2  # bins a cada lado del pico (lobulo de Hann)
+    salida = {'f0': f0}
+    armonicos = np.zeros((4, n_armonicos))
+    for h in range(1, n_armonicos + 1):
+        k = int(round(h * f0 / df))
+        if k + ancho >= psd.shape[1]:
+            break
+        armonicos[:, h - 1] = np.sqrt(np.sum(psd[:, k - ancho:k + ancho + 1], axis=1))
+    for c, nombre in enumerate(CANALES):
+        salida[f'{nombre}_armonicos'] = armonicos[c]
+        salida[f'{nombre}_THD'] = (np.sqrt(np.sum(armonicos[c, 1:] ** 2)) / armonicos[c, 0]
+                                   if armonicos[c, 0] > 0 else np.nan)
+
+    # Desfase V-I de la fundamental a partir del espectro cruzado
+    lobulo = psd_cruzada[:, k0 - ancho:k0 + ancho + 1].sum(axis=1)
+    for j, lado in enumerate(('p', 's')):
+        phi = np.angle(lobulo[j])
+        V1, I1 = armonicos[2 * j, 0], armonicos[2 * j + 1, 0]
+        salida[f'phi{lado}'] = phi
+        salida[f'Q{lado}'] = V1 * I1 * np.sin(phi)
+    return salida
+
+
+def generar_traza_sintetica(ruta, fs=10000.0, duracion=1.0, Vp=60.0, Ip=0.2, Vs=29.0, Is=0.4,
+                            phi_p=0.3, phi_s=0.05, f0=60.0, tercer_armonico=0.05, semilla=0):
+    """Escribir una captura binaria float32 de prueba con fase y 3er armonico"""
+    rng = np.random.default_rng(semilla)
+    t = np.arange(int(fs * duracion)) / fs
+    w = 2 * np.pi * f0 * t
+    raiz2 = np.sqrt(2)
+    datos = np.column_stack([
+        Vp * raiz2 * np.sin(w),
+        Ip * raiz2 * (np.sin(w - phi_p) + tercer_armonico * np.sin(3 * w)),
+        Vs * raiz2 * np.sin(w),
+        Is * raiz2 * np.sin(w - phi_s),
+    ])
+    datos += 1e-3 * rng.standard_normal(datos.shape)
+    datos.astype(np.float32).tofile(ruta)
+    return Path(ruta)
+
+
+def resumen_traza(resultado):
+    """Imprimir el resultado del analisis de una traza"""
+    print(f"  f0 = {resultado.get('f0', np.nan):.2f} Hz, {resultado['n_muestras']} muestras")
+    for lado, v, i in (('p', 'Vp', 'Ip'), ('s', 'Vs', 'Is')):
+        print(f"  {v}={resultado[f'{v}_rms']:.3f} V  {i}={resultado[f'{i}_rms']:.4f} A  "
+              f"P={resultado[f'P{lado}']:.3f} W  S={resultado[f'S{lado}']:.3f} VA  "
+              f"Q1={resultado.get(f'Q{lado}', np.nan):.3f} var  FP={resultado[f'FP{lado}']:.3f}  "
+              f"THD({i})={resultado.get(f'{i}_THD', np.nan)*100:.1f}%")
+    print(f"  Eficiencia = {resultado['eficiencia']*100:.1f}%")
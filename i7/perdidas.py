@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Separacion de perdidas del transformador: cobre y nucleo
+
+Perdidas en el cobre con las resistencias de devanado ajustadas
+(circuito_equivalente.py): P_cu = Ip^2 R1 + Is^2 R2. El resto de
+Pp - Ps se atribuye al nucleo y se ajusta a:
+
+  - Steinmetz:  P = k f^alfa B^beta  (minimos cuadrados en escala log)
+  - Bertotti:   P = kh f B^beta + ke f^2 B^2 + kexc f^1.5 B^1.5
+                (lineal en kh, ke, kexc >= 0; beta se barre en su rango
+                fisico, 1.5 a 3)
+
+B es el pico de induccion, proporcional a E/f. Sin N y area del nucleo se
+usa E/f directamente, lo que solo cambia la escala de k.
+
+Las eficiencias para cargas no medidas se predicen con el modelo de
+Bertotti. El barrido solo cubre un 4 % de B y el ajuste libre de Steinmetz
+da una beta muy fuera del rango fisico; extrapolar con esa beta daria
+perdidas en el nucleo sin sentido fuera de los puntos medidos.
+"""
+
+import numpy as np
+from scipy.optimize import nnls
+
+from generar_graficas import potencia_data
+from circuito_equivalente import ajustar_potencia_data, fasores, PARAMETROS
+
+a_reductor = 2.0
+f_red = 60.0  # Hz
+BETA_FISICO = (1.5, 3.0)  # rango habitual del exponente de B en aceros al silicio
+
+
+def perdidas_cobre(Ip, Is, R1, R2):
+    """Perdidas I^2 R en ambos devanados (R2 del lado secundario)"""
+    return np.asarray(Ip) ** 2 * R1 + np.asarray(Is) ** 2 * R2
+
+
+def separar_perdidas(Pp, Ps, Ip, Is, R1, R2):
+    """Perdidas totales, de cobre y de nucleo por punto de operacion"""
+    total = np.asarray(Pp, dtype=float) - np.asarray(Ps, dtype=float)
+    cobre = perdidas_cobre(Ip, Is, R1, R2)
+    return {'total': total, 'cobre': cobre, 'nucleo': total - cobre}
+
+
+def induccion_pico(E, f, N=None, area=None):
+    """B pico = E / (4.44 f N A); sin N y A se devuelve E/f"""
+    E = np.asarray(E, dtype=float)
+    f = np.asarray(f, dtype=float)
+    if N is None or area is None:
+        return E / f
+    return E / (4.44 * f * N * area)
+
+
+def ajustar_steinmetz(P, B, f):
+    """Ajuste log-lineal de P = k f^alfa B^beta
+
+    Si todos los puntos tienen la misma frecuencia, alfa no es identificable
+    y se fija en 1 (P/f depende solo de B).
+    """
+    P, B, f = (np.broadcast_to(np.asarray(x, dtype=float), np.shape(P)).ravel() for x in (P, B, f))
+    validos = (P > 0) & (B > 0) & (f > 0)
+    P, B, f = P[validos], B[validos], f[validos]
+    una_frecuencia = np.ptp(f) == 0
+    y = np.log(P) - (np.log(f) if una_frecuencia else 0.0)
+    columnas = [np.ones_like(y), np.log(B)] + ([] if una_frecuencia else [np.log(f)])
+    X = np.column_stack(columnas)
+    coef, _, rango, _ = np.linalg.lstsq(X, y, rcond=None)
+    residuo = y - X @ coef
+    gl = max(y.size - X.shape[1], 1)
+    cov = np.linalg.pinv(X.T @ X) * (residuo @ residuo / gl)
+    return {
+        'k': np.exp(coef[0]),
+        'beta': coef[1],
+        'alfa': 1.0 if una_frecuencia else coef[2],
+        'cov_log': cov,
+        'rango': rango,
+        'n': y.size,
+    }
+
+
+def ajustar_bertotti(P, B, f, betas=np.linspace(*BETA_FISICO, 31)):
+    """Ajuste de histeresis + corrientes parasitas + exceso, beta en malla
+
+    Para cada beta el problema es lineal; se resuelve con coeficientes no
+    negativos (cada termino es una perdida) y se elige la beta de menor
+    residuo relativo. 'beta_en_limite' indica que el minimo cae en un
+    extremo de la malla, es decir, que los datos pedirian una beta fuera
+    del rango fisico.
+    """
+    P, B, f = (np.broadcast_to(np.asarray(x, dtype=float), np.shape(P)).ravel() for x in (P, B, f))
+    validos = (P > 0) & (B > 0) & (f > 0)
+    P, B, f = P[validos], B[validos], f[validos]
+
+    # Diseno (n_beta, n, 3), ponderado por 1/P para un ajuste relativo
+    X = np.stack([
+        f[None, :] * B[None, :] ** betas[:, None],
+        np.broadcast_to(f ** 2 * B ** 2, (betas.size, f.size)),
+        np.broadcast_to(f ** 1.5 * B ** 1.5, (betas.size, f.size)),
+    ], axis=-1) / P[None, :, None]
+    soluciones = [nnls(Xb, np.ones_like(P)) for Xb in X]
+    coef = np.array([c for c, _ in soluciones])
+    residuo = np.array([r for _, r in soluciones]) ** 2
+    mejor = int(np.argmin(residuo))
+    kh, ke, kexc = coef[mejor]
+    return {'kh': kh, 'ke': ke, 'kexc': kexc, 'beta': betas[mejor], 'residuo_rel': residuo[mejor],
+            'beta_en_limite': mejor in (0, betas.size - 1)}
+
+
+def nucleo_steinmetz(modelo, B, f):
+    """Perdidas en el nucleo predichas por el modelo de Steinmetz"""
+    return modelo['k'] * np.asarray(f) ** modelo['alfa'] * np.asarray(B) ** modelo['beta']
+
+
+def nucleo_bertotti(modelo, B, f):
+    """Perdidas en el nucleo predichas por el modelo de Bertotti"""
+    B = np.asarray(B, dtype=float)
+    f = np.asarray(f, dtype=float)
+    return (modelo['kh'] * f * B ** modelo['beta'] + modelo['ke'] * f ** 2 * B ** 2
+            + modelo['kexc'] * f ** 1.5 * B ** 1.5)
+
+
+def analizar_potencia_data():
+    """Separacion y ajustes de Steinmetz y Bertotti para el barrido de potencia_data"""
+    ajuste = ajustar_potencia_data(a_reductor)
+    theta = ajuste['theta']
+    param = dict(zip(PARAMETROS, theta[0]))
+    R2_sec = param['R2'] / a_reductor ** 2
+
+    Vp = np.atleast_2d(potencia_data['Vp'])
+    RL = np.atleast_2d(np.array(potencia_data['Vs']) / np.array(potencia_data['Is']))
+    _, E, _ = fasores(theta, Vp, RL, a_reductor)
+    B = induccion_pico(np.abs(E[0]), f_red)
+
+    perdidas = separar_perdidas(potencia_data['Pp'], potencia_data['Ps'],
+                                potencia_data['Ip'], potencia_data['Is'], param['R1'], R2_sec)
+    return {'param': param, 'R2_sec': R2_sec, 'theta': theta, 'B': B, 'perdidas': perdidas,
+            'steinmetz': ajustar_steinmetz(perdidas['nucleo'], B, f_red),
+            'bertotti': ajustar_bertotti(perdidas['nucleo'], B, f_red)}
+
+
+def predecir_eficiencia(resultado, RL, Vp=60.0, f=f_red):
+    """Eficiencia esperada para cargas RL (secundario) no medidas
+
+    Las perdidas en el nucleo salen del ajuste de Bertotti, con beta y
+    coeficientes restringidos a valores fisicos.
+    """
+    RL = np.atleast_2d(np.asarray(RL, dtype=float))
+    Vp = np.broadcast_to(np.asarray(Vp, dtype=float), RL.shape)
+    Ip, E, I2 = fasores(resultado['theta'], Vp, RL, a_reductor)
+    Is = np.abs(I2 * a_reductor)
+    P_sal = Is ** 2 * RL
+    P_cu = perdidas_cobre(np.abs(Ip), Is, resultado['param']['R1'], resultado['R2_sec'])
+    P_nuc = nucleo_bertotti(resultado['bertotti'], induccion_pico(np.abs(E), f), f)
+    return (P_sal / (P_sal + P_cu + P_nuc))[0]
+
+
+def main():
+    res = analizar_potencia_data()
+    p = res['perdidas']
+    print("Separacion de perdidas por caso de carga:")
+    print("  caso                       total[W]  cobre[W]  nucleo[W]")
+    for k, caso in enumerate(potencia_data['casos']):
+        print(f"  {caso.replace(chr(10), ' '):<24} {p['total'][k]:8.2f}  {p['cobre'][k]:8.2f}  {p['nucleo'][k]:9.2f}")
+    s = res['steinmetz']
+    print(f"\nSteinmetz (f = {f_red:.0f} Hz): k = {s['k']:.3g}, alfa = {s['alfa']:.2f}, "
+          f"beta = {s['beta']:.2f} ({s['n']} puntos)")
+    if not BETA_FISICO[0] <= s['beta'] <= BETA_FISICO[1]:
+        print(f"  beta fuera del rango fisico {BETA_FISICO[0]}-{BETA_FISICO[1]}: no se usa para extrapolar")
+    b = res['bertotti']
+    print(f"Bertotti: kh = {b['kh']:.3g}, ke = {b['ke']:.3g}, kexc = {b['kexc']:.3g}, "
+          f"beta = {b['beta']:.2f}, residuo relativo = {b['residuo_rel']:.3g}")
+    if b['beta_en_limite']:
+        print("  beta en el extremo de la malla: los datos no la determinan dentro del rango fisico")
+
+    RL = np.array([20.0, 50.0, 100.0, 200.0, 400.0])
+    eta = predecir_eficiencia(res, RL)
+    print("\nEficiencia predicha para cargas no medidas (nucleo segun Bertotti):")
+    for r, e in zip(RL, eta):
+        print(f"  RL = {r:6.1f} ohm -> {e*100:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulacion en el tiempo del transformador con cargas de lamparas
+
+Inductores acoplados (L1, L2, M) con resistencias de devanado y perdidas en
+el nucleo (Rc en paralelo con el primario). Las lamparas son el elemento no
+ohmico de i2 (fase 3): R = R0 * (1 + beta * P), donde P es la potencia
+filtrada por la constante de tiempo termica del filamento.
+
+Integracion con Euler implicito de paso fijo. Los cinco casos de carga de
+potencia_data son una dimension de lote: todas las variables de estado son
+arreglos y cada paso actualiza todos los casos a la vez.
+"""
+
+import numpy as np
+from scipy import stats
+
+from generar_graficas import potencia_data
+
+# Bombillo incandescente de i2 (mismos datos de i2/codigos/analisis_no_ohmico.py)
+datos_lampara = {
+    'Voltaje_V': [45, 50, 55, 60, 65, 75, 80, 85, 90, 95],
+    'Corriente_A': [0.55, 0.58, 0.61, 0.67, 0.66, 0.713, 0.74, 0.76, 0.79, 0.80],
+}
+tau_termica = 0.05  # s, constante de tiempo del filamento
+
+# Configuraciones de potencia_data: (lamparas en serie, ramas en paralelo)
+configuraciones = [(3, 1), (2, 1), (1, 1), (1, 2), (1, 3)]
+
+# Parametros por defecto del transformador reductor (Np=500, Ns=250)
+transformador = {
+    'f': 60.0,       # Hz
+    'a': 2.0,        # Np/Ns
+    'R1': 9.0,       # ohm
+    'R2': 2.25,      # ohm (lado secundario)
+    'X1': 1.0,       # ohm, dispersion referida al primario
+    'Rc': 2000.0,    # ohm
+    'Xm': 890.0,     # ohm
+}
+
+
+def modelo_lampara():
+    """R0 y beta de R = R0*(1 + beta*P) ajustados a los datos de i2"""
+    V = np.array(datos_lampara['Voltaje_V'], dtype=float)
+    I = np.array(datos_lampara['Corriente_A'], dtype=float)
+    slope, intercept, _, _, _ = stats.linregress(V * I, V / I)
+    return intercept, slope / intercept
+
+
+def parametros_desde_ajuste():
+    """Transformador con los parametros del circuito equivalente ajustado"""
+    from circuito_equivalente import ajustar_potencia_data, PARAMETROS
+    theta = dict(zip(PARAMETROS, ajustar_potencia_data()['theta'][0]))
+    param = dict(transformador)
+    param.update(R1=theta['R1'], R2=theta['R2'] / param['a'] ** 2,
+                 X1=theta['X1'], Rc=theta['Rc'], Xm=theta['Xm'])
+    return param
+
+
+def simular(param=None, Vp_rms=None, n_ciclos=100, pasos_ciclo=200, ciclos_promedio=10):
+    """Simular todos los casos de carga a la vez
+
+    Devuelve Ip, Is (RMS), Pp, Ps (promedio) sobre los ultimos
+    `ciclos_promedio` ciclos, una entrada por configuracion.
+    """
+    p = transformador if param is None else param
+    w = 2 * np.pi * p['f']
+    a = p['a']
+    Vp_rms = np.asarray(potencia_data['Vp'] if Vp_rms is None else Vp_rms, dtype=float)
+
+    # Inductancias: magnetizacion + dispersion (repartida por igual)
+    L_mag = p['Xm'] / w
+    L_disp = p['X1'] / w
+    L1 = L_mag + L_disp
+    L2 = (L_mag + L_disp) / a ** 2
+    M = L_mag / a
+
+    R0, beta = modelo_lampara()
+    n_serie = np.array([c[0] for c in configuraciones], dtype=float)
+    n_par = np.array([c[1] for c in configuraciones], dtype=float)
+    n_lamparas = n_serie * n_par
+
+    h = 1.0 / (p['f'] * pasos_ciclo)
+    n_pasos = n_ciclos * pasos_ciclo
+    inicio_prom = n_pasos - ciclos_promedio * pasos_ciclo
+    alfa = h / tau_termica
+
+    # Estado por caso
+    ip = np.zeros_like(Vp_rms)
+    i2 = np.zeros_like(Vp_rms)
+    P_filtro = np.zeros_like(Vp_rms)  # potencia por lampara (filtrada)
+    acum = {k: np.zeros_like(Vp_rms) for k in ('ip2', 'is2', 'pp', 'ps')}
+
+    amplitud = np.sqrt(2) * Vp_rms
+    for n in range(1, n_pasos + 1):
+        vp = amplitud * np.sin(w * n * h)
+        R_lampara = R0 * (1.0 + beta * P_filtro)
+        RL = R_lampara * n_serie / n_par
+        R2t = p['R2'] + RL
+
+        # Euler implicito: (Lm + h*Rm) x_{n+1} = Lm x_n + h b_{n+1}
+        #   Lm = [[L1, -M], [M, -L2]],  Rm = [[R1, 0], [0, -(R2 + RL)]]
+        a11, a12 = L1 + h * p['R1'], -M
+        a21, a22 = M, -L2 - h * R2t
+        b1 = L1 * ip - M * i2 + h * vp
+        b2 = M * ip - L2 * i2
+        det = a11 * a22 - a12 * a21
+        ip = (b1 * a22 - a12 * b2) / det
+        i2 = (a11 * b2 - a21 * b1) / det
+
+        # Filamento: potencia instantanea por lampara, filtro implicito
+        p_lampara = i2 ** 2 * RL / n_lamparas
+        P_filtro = (P_filtro + alfa * p_lampara) / (1.0 + alfa)
+
+        if n > inicio_prom:
+            ip_total = ip + vp / p['Rc']
+            acum['ip2'] += ip_total ** 2
+            acum['is2'] += i2 ** 2
+            acum['pp'] += vp * ip_total
+            acum['ps'] += i2 ** 2 * RL
+
+    n_prom = n_pasos - inicio_prom
+    return {
+        'Ip': np.sqrt(acum['ip2'] / n_prom),
+        'Is': np.sqrt(acum['is2'] / n_prom),
+        'Pp': acum['pp'] / n_prom,
+        'Ps': acum['ps'] / n_prom,
+    }
+
+
+def main():
+    import time
+    param = parametros_desde_ajuste()
+    t0 = time.perf_counter()
+    sim = simular(param)
+    dt = time.perf_counter() - t0
+    print(f"Simulacion de 100 ciclos, {len(configuraciones)} casos en {dt:.2f} s")
+    print("  caso                       Ip med/sim     Is med/sim     Pp med/sim      Ps med/sim")
+    for k, caso in enumerate(potencia_data['casos']):
+        print(f"  {caso.replace(chr(10), ' '):<24} "
+              f"{potencia_data['Ip'][k]:.3f}/{sim['Ip'][k]:.3f}   "
+              f"{potencia_data['Is'][k]:.3f}/{sim['Is'][k]:.3f}   "
+              f"{potencia_data['Pp'][k]:6.2f}/{sim['Pp'][k]:6.2f}   "
+              f"{potencia_data['Ps'][k]:6.2f}/{sim['Ps'][k]:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Adquisicion en vivo de barridos B vs I para I9
+
+Lee pares (I, B) de un instrumento por puerto serie o socket TCP (una linea
+"I,B" por punto, B en mT) y actualiza la regresion y la grafica punto a
+punto, para ver converger mu0 durante la sesion. Para probar sin equipo hay
+un instrumento simulado (local o como servidor TCP) que reproduce los datos
+de generar_graficas.py con ruido.
+
+La regresion se mantiene con estadisticos suficientes (n, sum x, sum y,
+sum x^2, sum y^2, sum xy), O(1) por punto, y da los mismos valores que
+stats.linregress. La grafica usa blitting: el fondo se guarda una vez y en
+cada cuadro solo se redibujan los artistas de datos.
+
+Al terminar se guarda la figura con la misma funcion grafica_* del modo por
+lotes, asi que el archivo es identico al que daria generar_graficas.py con
+los datos adquiridos.
+
+Uso:
+    python adquisicion_en_vivo.py espira                       # simulado
+    python adquisicion_en_vivo.py conductor --socket 127.0.0.1:5025
+    python adquisicion_en_vivo.py solenoide1 --serial /dev/ttyUSB0
+"""
+
+import argparse
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+
+import generar_graficas as gg
+import render
+
+# Factor para pasar de la pendiente B/I (T/A) a mu0, datos y nodo de la grafica por lotes.
+# En los solenoides 'L' de los datos es la inductancia: se usa la longitud del devanado.
+CONFIGURACIONES = {
+    'conductor': ('conductor_data', lambda d: 2 * np.pi * d['s'], 'grafica_conductor_rectilineo'),
+    'espira': ('espiras_data', lambda d: 2 * d['R'], 'grafica_espiras'),
+    'solenoide1': ('solenoide1_data', lambda d: gg.geometria['solenoide1']['longitud'] / d['N'], 'grafica_solenoides'),
+    'solenoide2': ('solenoide2_data', lambda d: gg.geometria['solenoide2']['longitud'] / d['N'], 'grafica_solenoides'),
+}
+
+
+def estadisticos_vacios():
+    """Estadisticos suficientes de la regresion B = m I + b"""
+    return {'n': 0, 'sx': 0.0, 'sy': 0.0, 'sxx': 0.0, 'syy': 0.0, 'sxy': 0.0}
+
+
+def agregar_punto(est, I, B_T):
+    """Incorporar un punto (I en A, B en T)"""
+    est['n'] += 1
+    est['sx'] += I
+    est['sy'] += B_T
+    est['sxx'] += I * I
+    est['syy'] += B_T * B_T
+    est['sxy'] += I * B_T
+
+
+def regresion(est):
+    """(slope, intercept, r2, std_err) como ajuste_lineal; NaN con menos de 3 puntos"""
+    n = est['n']
+    if n < 3:
+        return np.nan, np.nan, np.nan, np.nan
+    Sxx = est['sxx'] - est['sx'] ** 2 / n
+    Syy = est['syy'] - est['sy'] ** 2 / n
+    Sxy = est['sxy'] - est['sx'] * est['sy'] / n
+    if Sxx <= 0:
+        return np.nan, np.nan, np.nan, np.nan
+    slope = Sxy / Sxx
+    intercept = (est['sy'] - slope * est['sx']) / n
+    r2 = Sxy ** 2 / (Sxx * Syy) if Syy > 0 else 1.0
+    std_err = np.sqrt(max(Syy - slope * Sxy, 0.0) / (n - 2) / Sxx)
+    return slope, intercept, r2, std_err
+
+
+# --- Fuentes de datos -------------------------------------------------------
+
+def _parsear(linea):
+    """'I,B' (o separado por espacios/;) -> (I, B_mT); None si no es un punto"""
+    partes = linea.replace(';', ',').replace('\t', ',').replace(' ', ',').split(',')
+    valores = [p for p in partes if p]
+    if len(valores) < 2:
+        return None
+    try:
+        return float(valores[0]), float(valores[1])
+    except ValueError:
+        return None
+
+
+def leer_serial(puerto, baudrate=9600, timeout=1.0):
+    """Puntos (I, B_mT) desde un puerto serie (requiere pyserial)"""
+    try:
+        import serial
+    except ImportError:
+        raise ImportError("Se necesita pyserial para leer del puerto serie: pip install pyserial")
+    with serial.Serial(puerto, baudrate, timeout=timeout) as puerto_serie:
+        while True:
+            linea = puerto_serie.readline()
+            if not linea:
+                continue
+            linea = linea.decode('ascii', errors='ignore').strip()
+            if linea.upper() == 'FIN':
+                return
+            punto = _parsear(linea)
+            if punto:
+                yield punto
+
+
+def leer_socket(host, puerto, timeout=10.0):
+    """Puntos (I, B_mT) desde un socket TCP; termina al cerrar la conexion o con 'FIN'"""
+    with socket.create_connection((host, puerto), timeout=timeout) as conexion:
+        for linea in conexion.makefile('r', encoding='ascii', errors='ignore'):
+            linea = linea.strip()
+            if linea.upper() == 'FIN':
+                return
+            punto = _parsear(linea)
+            if punto:
+                yield punto
+
+
+def instrumento_simulado(datos, periodo=0.2, ruido=0.01, semilla=0):
+    """Reproduce I y B de un conjunto de datos con ruido relativo, un punto cada `periodo` s"""
+    rng = np.random.default_rng(semilla)
+    for I, B in zip(datos['I'], datos['B']):
+        time.sleep(periodo)
+        yield float(I), float(B * (1 + ruido * rng.standard_normal()))
+
+
+def servidor_simulado(datos, host='127.0.0.1', puerto=0, **kwargs):
+    """Servidor TCP que envia los puntos del instrumento simulado; devuelve (servidor, puerto)"""
+    class Manejador(socketserver.StreamRequestHandler):
+        def handle(self):
+            for I, B in instrumento_simulado(datos, **kwargs):
+                self.wfile.write(f"{I:.6g},{B:.6g}\n".encode('ascii'))
+            self.wfile.write(b"FIN\n")
+
+    servidor = socketserver.ThreadingTCPServer((host, puerto), Manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, servidor.server_address[1]
+
+
+# --- Grafica en vivo --------------------------------------------------------
+
+def _en_hilo(fuente):
+    """Leer la fuente en un hilo; la cola recibe puntos y None al terminar"""
+    cola = queue.Queue()
+
+    def leer():
+        try:
+            for punto in fuente:
+                cola.put(punto)
+        finally:
+            cola.put(None)
+
+    threading.Thread(target=leer, daemon=True).start()
+    return cola
+
+
+def adquirir(nombre, fuente, fps=30.0, mostrar=True, I_max=None, B_max=None):
+    """Grafica en vivo hasta agotar la fuente; devuelve los datos adquiridos y la regresion
+
+    Los limites de los ejes se fijan al inicio (de los datos de referencia
+    si no se dan) y solo se vuelve a dibujar el fondo si un punto se sale.
+    """
+    clave, factor, _ = CONFIGURACIONES[nombre]
+    ref = getattr(gg, clave)
+    k_mu0 = factor(ref)
+    I_max = I_max or 1.1 * float(np.max(ref['I']))
+    B_max = B_max or 1.2 * float(np.max(ref['B']))
+
+    # Ventana interactiva: pyplot, con el mismo estilo que las figuras finales
+    with render.style(gg.ESTILO):
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.set_xlim(0, I_max)
+        ax.set_ylim(0, B_max)
+        ax.set_xlabel('Corriente I [A]')
+        ax.set_ylabel('Campo magnético B [mT]')
+        ax.set_title(f'{ref["etiqueta"]} (en vivo)')
+        ax.grid(True, alpha=0.3)
+        puntos, = ax.plot([], [], 'bo', markersize=8, animated=True, label='Datos experimentales')
+        recta, = ax.plot([], [], 'r-', linewidth=2, animated=True, label='Ajuste lineal')
+        texto = ax.text(0.02, 0.95, '', transform=ax.transAxes, va='top', animated=True,
+                        bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+        ax.legend(loc='lower right')
+    if mostrar:
+        plt.show(block=False)
+    fig.canvas.draw()
+    fondo = fig.canvas.copy_from_bbox(fig.bbox)
+
+    est = estadisticos_vacios()
+    I_lista, B_lista = [], []
+    cola = _en_hilo(fuente)
+    intervalo = 1.0 / fps
+    cuadros = 0
+    t0 = time.perf_counter()
+    terminado = False
+    while not terminado:
+        inicio_cuadro = time.perf_counter()
+        # Vaciar todo lo que llego desde el ultimo cuadro
+        while True:
+            try:
+                punto = cola.get_nowait()
+            except queue.Empty:
+                break
+            if punto is None:
+                terminado = True
+                break
+            I, B = punto
+            I_lista.append(I)
+            B_lista.append(B)
+            agregar_punto(est, I, B * 1e-3)
+
+        if I_lista and (max(I_lista) > ax.get_xlim()[1] or max(B_lista) > ax.get_ylim()[1]):
+            ax.set_xlim(0, 1.1 * max(I_lista))
+            ax.set_ylim(0, 1.2 * max(B_lista))
+            fig.canvas.draw()
+            fondo = fig.canvas.copy_from_bbox(fig.bbox)
+
+        slope, intercept, r2, std_err = regresion(est)
+        puntos.set_data(I_lista, B_lista)
+        if np.isfinite(slope):
+            I_fit = np.array([0.0, ax.get_xlim()[1]])
+            recta.set_data(I_fit, (slope * I_fit + intercept) * 1e3)
+            texto.set_text(f'n = {est["n"]}   R² = {r2:.4f}\n'
+                           f'mu0 = {slope*k_mu0*1e6:.3f} ± {std_err*k_mu0*1e6:.3f} x10^-6 T·m/A')
+        else:
+            texto.set_text(f'n = {est["n"]}')
+
+        fig.canvas.restore_region(fondo)
+        for artista in (puntos, recta, texto):
+            ax.draw_artist(artista)
+        fig.canvas.blit(fig.bbox)
+        fig.canvas.flush_events()
+        cuadros += 1
+
+        espera = intervalo - (time.perf_counter() - inicio_cuadro)
+        if espera > 0 and not terminado:
+            time.sleep(espera)
+
+    duracion = time.perf_counter() - t0
+    plt.close(fig)
+    slope, intercept, r2, std_err = regresion(est)
+    return {
+        'I': np.array(I_lista), 'B': np.array(B_lista),
+        'slope': slope, 'intercept': intercept, 'r2': r2, 'std_err': std_err,
+        'mu0': slope * k_mu0, 'sigma_mu0': std_err * k_mu0,
+        'fps': cuadros / duracion if duracion > 0 else np.nan,
+    }
+
+
+def guardar_figura_final(nombre, I, B):
+    """Figura con la funcion por lotes grafica_* y los datos adquiridos"""
+    clave, _, grafica = CONFIGURACIONES[nombre]
+    original = gg.flujo.get(clave)
+    # Solo se recalculan el ajuste, mu0 y las graficas que dependen de este conjunto
+    gg.flujo.set(clave, dict(original, I=np.asarray(I, dtype=float), B=np.asarray(B, dtype=float)))
+    try:
+        gg.crear_carpeta_graficas()
+        gg.flujo.get(grafica)
+    finally:
+        gg.flujo.set(clave, original)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Adquisicion en vivo de B vs I (I9)')
+    parser.add_argument('configuracion', choices=sorted(CONFIGURACIONES))
+    origen = parser.add_mutually_exclusive_group()
+    origen.add_argument('--serial', help='puerto serie del instrumento')
+    origen.add_argument('--socket', help='host:puerto del instrumento')
+    parser.add_argument('--baudrate', type=int, default=9600)
+    parser.add_argument('--periodo', type=float, default=0.2, help='segundos por punto (simulado)')
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--sin-ventana', action='store_true', help='no mostrar la ventana')
+    args = parser.parse_args()
+
+    if args.serial:
+        fuente = leer_serial(args.serial, args.baudrate)
+    elif args.socket:
+        host, puerto = args.socket.rsplit(':', 1)
+        fuente = leer_socket(host, int(puerto))
+    else:
+        fuente = instrumento_simulado(getattr(gg, CONFIGURACIONES[args.configuracion][0]), args.periodo)
+
+    res = adquirir(args.configuracion, fuente, args.fps, mostrar=not args.sin_ventana)
+    if len(res['I']) < 3:
+        sys.stderr.write("ERROR: se necesitan al menos 3 puntos para el ajuste\n")
+        return 1
+    print(f"{len(res['I'])} puntos, {res['fps']:.1f} cuadros/s")
+    print(f"mu0 = {res['mu0']*1e6:.3f} ± {res['sigma_mu0']*1e6:.3f} x10^-6 T·m/A  (R² = {res['r2']:.4f})")
+    guardar_figura_final(args.configuracion, res['I'], res['B'])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ajuste conjunto de mu0 con todas las configuraciones de I9
+
+En lugar de ajustar cada configuracion por separado y promediar, se ajusta
+un solo mu0 a todos los datos a la vez:
+
+    B_ci = mu0 * G_c * (1 + d_c) * I_ci + b_c
+
+con G_c el factor geometrico ideal (1/(2 pi s), 1/(2R), N/l), b_c un
+offset por configuracion y d_c una correccion geometrica relativa con
+prior gaussiano (d_c ~ N(0, sigma_geom)). Los priors entran como residuos
+adicionales, asi que todo es un unico problema de minimos cuadrados
+disperso, resuelto por Gauss-Newton con ecuaciones normales dispersas.
+
+En los solenoides l es la longitud del devanado (generar_graficas.geometria);
+la columna L de los datos es la inductancia, no una longitud.
+
+Si chi2/g.l. del ajuste supera CHI2_RED_MAX el modelo no describe los
+datos (y la covarianza reescalada tampoco es fiable): se emite un aviso y
+el resultado queda marcado con 'ajuste_valido' = False.
+
+Varios grupos de estudiantes se apilan en el mismo problema: cada grupo
+tiene sus propios parametros y la matriz normal es diagonal por bloques.
+"""
+
+import warnings
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
+
+from generar_graficas import (
+    mu0_teorico, conductor_data, espiras_data, geometria, solenoide1_data, solenoide2_data,
+)
+
+CONFIGURACIONES = ('conductor', 'espira', 'solenoide1', 'solenoide2')
+
+# Incertidumbre del teslametro: fraccion de la lectura + resolucion (mT)
+exactitud_B = (0.005, 0.001)
+sigma_geom = 0.10  # prior de las correcciones geometricas relativas
+CHI2_RED_MAX = 5.0  # chi2/g.l. por encima del cual el ajuste no es aceptable
+
+
+def factores_geometricos():
+    """Factor ideal G de cada configuracion (B = mu0 * G * I)"""
+    return np.array([
+        1.0 / (2 * np.pi * conductor_data['s']),
+        1.0 / (2 * espiras_data['R']),
+        solenoide1_data['N'] / geometria['solenoide1']['longitud'],
+        solenoide2_data['N'] / geometria['solenoide2']['longitud'],
+    ])
+
+
+def datos_grupo_base():
+    """Los datos de generar_graficas.py como un grupo"""
+    return {
+        'conductor': (conductor_data['I'], conductor_data['B']),
+        'espira': (espiras_data['I'], espiras_data['B']),
+        'solenoide1': (solenoide1_data['I'], solenoide1_data['B']),
+        'solenoide2': (solenoide2_data['I'], solenoide2_data['B']),
+    }
+
+
+def _apilar(grupos):
+    """Vectores planos (grupo, configuracion, I, B[T], sigma[T]) de todos los grupos"""
+    g_idx, c_idx, I, B = [], [], [], []
+    for g, datos in enumerate(grupos):
+        for c, nombre in enumerate(CONFIGURACIONES):
+            Ic, Bc = (np.asarray(x, dtype=float) for x in datos[nombre])
+            g_idx.append(np.full(Ic.size, g))
+            c_idx.append(np.full(Ic.size, c))
+            I.append(Ic)
+            B.append(Bc * 1e-3)
+    B = np.concatenate(B)
+    sigma = exactitud_B[0] * np.abs(B) + exactitud_B[1] * 1e-3
+    return np.concatenate(g_idx), np.concatenate(c_idx), np.concatenate(I), B, sigma
+
+
+def ajustar_conjunto(grupos=None, G=None, sigma_geom=sigma_geom, max_iter=20, tol=1e-12):
+    """Gauss-Newton disperso para mu0, offsets y correcciones de todos los grupos
+
+    Parametros por grupo (P = 9): [m, b_1..b_4, d_1..d_4] con m = mu0/mu0_teorico
+    y b en mT. Devuelve mu0, su incertidumbre y la covarianza completa por grupo.
+    """
+    grupos = [datos_grupo_base()] if grupos is None else list(grupos)
+    G = factores_geometricos() if G is None else np.asarray(G, dtype=float)
+    n_c = len(CONFIGURACIONES)
+    P = 1 + 2 * n_c
+    n_g = len(grupos)
+    g, c, I, B, sigma = _apilar(grupos)
+    n = B.size
+
+    # Columnas de cada residuo de datos
+    col_m = g * P
+    col_b = g * P + 1 + c
+    col_d = g * P + 1 + n_c + c
+    # Residuos de prior: uno por (grupo, configuracion)
+    gp = np.repeat(np.arange(n_g), n_c)
+    cp = np.tile(np.arange(n_c), n_g)
+    col_prior = gp * P + 1 + n_c + cp
+    filas_prior = n + np.arange(n_g * n_c)
+
+    x = np.zeros(n_g * P)
+    x[::P] = 1.0
+    escala_mu = mu0_teorico
+
+    for _ in range(max_iter):
+        m, b, d = x[col_m], x[col_b] * 1e-3, x[col_d]
+        pendiente = escala_mu * G[c] * I
+        modelo = m * pendiente * (1 + d) + b
+        r = np.concatenate([(B - modelo) / sigma, -x[col_prior] / sigma_geom])
+
+        # Jacobiano de los residuos (dispersos: 3 entradas por dato, 1 por prior)
+        filas = np.concatenate([np.tile(np.arange(n), 3), filas_prior])
+        cols = np.concatenate([col_m, col_b, col_d, col_prior])
+        vals = np.concatenate([-pendiente * (1 + d) / sigma, -1e-3 / sigma,
+                               -m * pendiente / sigma, np.full(n_g * n_c, -1.0 / sigma_geom)])
+        J = sparse.csr_matrix((vals, (filas, cols)), shape=(n + n_g * n_c, n_g * P))
+        JtJ = (J.T @ J).tocsc()
+        paso = spsolve(JtJ, -(J.T @ r))
+        x += paso
+        if np.max(np.abs(paso)) < tol:
+            break
+
+    m, b, d = x[col_m], x[col_b] * 1e-3, x[col_d]
+    r = np.concatenate([(B - (m * escala_mu * G[c] * I * (1 + d) + b)) / sigma, -x[col_prior] / sigma_geom])
+    chi2_grupo = np.bincount(np.concatenate([g, gp]), weights=r ** 2, minlength=n_g)
+    n_grupo = np.bincount(g, minlength=n_g)
+    gl = n_grupo - 2 * n_c - 1 + n_c  # los priors aportan n_c residuos
+
+    chi2_red = chi2_grupo / np.maximum(gl, 1)
+
+    # Covarianza: inversa de cada bloque P x P de J^T J
+    JtJ = JtJ.tocoo()
+    bloques = np.zeros((n_g, P, P))
+    np.add.at(bloques, (JtJ.row // P, JtJ.row % P, JtJ.col % P), JtJ.data)
+    cov = np.linalg.inv(bloques) * np.maximum(chi2_red, 1.0)[:, None, None]
+
+    valido = chi2_red <= CHI2_RED_MAX
+    if not valido.all():
+        malos = ', '.join(f'{k} (chi2/g.l. = {chi2_red[k]:.1f})' for k in np.flatnonzero(~valido))
+        warnings.warn(f'ajuste conjunto inconsistente con los datos en los grupos {malos}; '
+                      f'mu0 y su incertidumbre no son fiables', RuntimeWarning, stacklevel=2)
+
+    params = x.reshape(n_g, P)
+    return {
+        'mu0': params[:, 0] * escala_mu,
+        'sigma_mu0': np.sqrt(cov[:, 0, 0]) * escala_mu,
+        'offsets_mT': params[:, 1:1 + n_c],
+        'correcciones': params[:, 1 + n_c:],
+        'cov': cov,
+        'chi2': chi2_grupo,
+        'gl': gl,
+        'ajuste_valido': valido,
+    }
+
+
+def main():
+    res = ajustar_conjunto()
+    mu0, s = res['mu0'][0], res['sigma_mu0'][0]
+    error = abs(mu0 - mu0_teorico) / mu0_teorico * 100
+    print("Ajuste conjunto de mu0 (todas las configuraciones):")
+    print(f"  mu0 = {mu0*1e6:.3f} ± {s*1e6:.3f} x10^-6 T·m/A  (error relativo {error:.1f}%)")
+    print(f"  chi2 = {res['chi2'][0]:.1f} con {res['gl'][0]} g.l.")
+    if not res['ajuste_valido'][0]:
+        print(f"  [AVISO] chi2/g.l. > {CHI2_RED_MAX:g}: el modelo no describe los datos, "
+              f"mu0 no es fiable")
+    for k, nombre in enumerate(CONFIGURACIONES):
+        print(f"  {nombre:<11} offset = {res['offsets_mT'][0, k]:+.4f} mT  "
+              f"correccion geometrica = {res['correcciones'][0, k]*100:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Analisis por lotes de mu0 para muchos grupos
+I9: Estudio del campo magnético producido por diferentes configuraciones de corriente
+
+Mismo esquema que datos/ para cada grupo (<raiz>/<grupo>/, ver
+tools/lab_store.py). Los ajustes B vs I de las cuatro configuraciones se
+hacen a la vez sobre el eje de grupos (tools/group_batch.py), las figuras
+por grupo se dibujan en un pool de procesos (o de hilos con --hilos) y el
+resumen marca los grupos atipicos.
+
+    python analisis_lote.py entregas/
+    python analisis_lote.py --sinteticos 100
+    python analisis_lote.py --sinteticos 30 --hilos
+"""
+
+import argparse
+import tempfile
+import time
+import numpy as np
+from pathlib import Path
+
+from group_batch import flag_outliers, linregress_batch, load_groups, render_pool, stack, synthesize_groups
+from results_db import ResultsDB, input_hash
+import render
+
+from generar_graficas import ESTILO, geometria, mu0_teorico
+
+# Configuracion -> (conjunto de datos, factor pendiente -> mu0 a partir de los parametros del grupo)
+CONFIGURACIONES = {
+    'conductor': ('conductor_data', lambda g, c: 2 * np.pi * stack(g, c, 's')),
+    'espira': ('espiras_data', lambda g, c: 2 * stack(g, c, 'R')),
+    'solenoide1': ('solenoide1_data', lambda g, c: geometria['solenoide1']['longitud'] / stack(g, c, 'N')),
+    'solenoide2': ('solenoide2_data', lambda g, c: geometria['solenoide2']['longitud'] / stack(g, c, 'N')),
+}
+
+COLUMNAS_MEDIDAS = {conjunto: ('B',) for conjunto, _ in CONFIGURACIONES.values()}
+
+
+def ajustar_lote(grupos):
+    """mu0, incertidumbre, pendiente, intercepto y R² por configuracion, arreglos (grupos,)"""
+    resultados = {}
+    for clave, (conjunto, factor) in CONFIGURACIONES.items():
+        ajuste = linregress_batch(stack(grupos, conjunto, 'I'), stack(grupos, conjunto, 'B') * 1e-3)
+        f = factor(grupos, conjunto)
+        resultados[clave] = {
+            'mu0': f * ajuste['slope'],
+            'sigma': f * ajuste['stderr'],
+            'pendiente': ajuste['slope'],
+            'intercepto': ajuste['intercept'],
+            'r2': ajuste['r2'],
+            'error': np.abs(f * ajuste['slope'] - mu0_teorico) / mu0_teorico,
+        }
+    return resultados
+
+
+def grafica_grupo(nombre, datos, ajustes, carpeta, dpi=100):
+    """Figura resumen de un grupo: cuatro ajustes B vs I y comparacion de mu0"""
+    with render.style(ESTILO):
+        fig, ejes = render.subplots(2, 3, figsize=(15, 9))
+        for ax, (clave, (conjunto, _)) in zip(ejes.flat, CONFIGURACIONES.items()):
+            I, B = np.asarray(datos[conjunto]['I']), np.asarray(datos[conjunto]['B'])
+            a = ajustes[clave]
+            I_fit = np.linspace(0, I.max() * 1.1, 100)
+            ax.plot(I, B, 'bo', markersize=6, label='Datos')
+            ax.plot(I_fit, (a['pendiente'] * I_fit + a['intercepto']) * 1e3, 'r-', linewidth=2,
+                    label=f'Ajuste (R²={a["r2"]:.4f})')
+            ax.set_title(f'{datos[conjunto]["etiqueta"]}\nmu0 = {a["mu0"] * 1e6:.2f}x10^-6 T·m/A')
+            ax.set_xlabel('Corriente I [A]')
+            ax.set_ylabel('B [mT]')
+            ax.grid(True, alpha=0.3)
+            ax.legend(fontsize=9)
+
+        ax = ejes.flat[4]
+        claves = list(CONFIGURACIONES)
+        x_pos = np.arange(len(claves))
+        ax.bar(x_pos, [ajustes[c]['mu0'] * 1e6 for c in claves], 0.6,
+               yerr=[ajustes[c]['sigma'] * 1e6 for c in claves], color='skyblue', label='Grupo')
+        ax.axhline(mu0_teorico * 1e6, color='r', linestyle='--', linewidth=2, label='Teórico')
+        ax.set_xticks(x_pos)
+        ax.set_xticklabels(claves, fontsize=9)
+        ax.set_ylabel('mu0 [x10^-6 T·m/A]')
+        ax.set_title('Comparación de mu0')
+        ax.legend(fontsize=9)
+        ax.grid(True, alpha=0.3, axis='y')
+        ejes.flat[5].axis('off')
+
+        fig.suptitle(f'I9 - {nombre}')
+        # Margenes fijos: tight_layout costaria mas que el resto de la figura
+        fig.subplots_adjust(left=0.06, right=0.98, bottom=0.07, top=0.88, wspace=0.3, hspace=0.45)
+    ruta = Path(carpeta) / f'{nombre}.png'
+    render.save(fig, ruta, ESTILO, dpi=dpi)
+    return str(ruta)
+
+
+def resumen_lote(nombres, resultados):
+    """Resumen por configuracion con los grupos atipicos marcados; devuelve {grupo: [configuraciones]}"""
+    atipicos = {}
+    print("\n" + "="*60)
+    print(f"RESUMEN DEL LOTE - {len(nombres)} grupos")
+    print("="*60)
+    print(f"Valor teorico: mu0 = {mu0_teorico*1e6:.2f}x10^-6 T·m/A")
+    for clave, r in resultados.items():
+        mu0 = r['mu0'] * 1e6
+        print(f"{clave}:")
+        print(f"  mu0 mediana: {np.nanmedian(mu0):.3f}x10^-6 T·m/A "
+              f"(IQR {np.nanpercentile(mu0, 25):.3f} - {np.nanpercentile(mu0, 75):.3f}), "
+              f"error mediano: {np.nanmedian(r['error']) * 100:.1f}%")
+        for i in np.flatnonzero(flag_outliers(r['mu0'])):
+            print(f"  [ATIPICO] {nombres[i]}: mu0 = {mu0[i]:.3f}x10^-6 T·m/A, R2: {r['r2'][i]:.4f}")
+            atipicos.setdefault(nombres[i], []).append(clave)
+    print()
+    print(f"Grupos con algun resultado atipico: {len(atipicos)}")
+    for nombre, claves in sorted(atipicos.items()):
+        print(f"  {nombre}: {', '.join(claves)}")
+    print("="*60)
+    return atipicos
+
+
+def registrar_lote(nombres, grupos, resultados, sesion=None):
+    """Guarda los resultados de cada grupo en resultados.sqlite (tools/results_db.py)"""
+    db = ResultsDB()
+    if not db.enabled:
+        return
+    try:
+        for i, nombre in enumerate(nombres):
+            datos = [grupos[nombre][c] for c, _ in CONFIGURACIONES.values()]
+            with db.run('i9', 'analisis_lote.py', input_hash(*datos), session=sesion, group=nombre) as run:
+                for clave, r in resultados.items():
+                    if np.isfinite(r['mu0'][i]):
+                        run.add('mu0', clave, r['mu0'][i], r['sigma'][i], 'T*m/A', mu0_teorico)
+    finally:
+        db.close()
+
+
+def analizar(raiz, salida='graficas/lote', procesos=None, graficas=True, sesion=None, hilos=False,
+             registrar=True):
+    """Ajustes, figuras, resumen y registro de todos los grupos bajo `raiz`
+
+    Con registrar=False (grupos simulados) no se escribe en resultados.sqlite.
+    """
+    t0 = time.perf_counter()
+    grupos = load_groups(raiz)
+    nombres = list(grupos)
+    if not nombres:
+        raise ValueError(f'no hay grupos en {raiz}')
+    resultados = ajustar_lote(grupos)
+    t_ajuste = time.perf_counter() - t0
+
+    if graficas:
+        Path(salida).mkdir(parents=True, exist_ok=True)
+        trabajos = [(nombre, grupos[nombre],
+                     {c: {k: float(r[k][i]) for k in r} for c, r in resultados.items()}, salida)
+                    for i, nombre in enumerate(nombres)]
+        render_pool(grafica_grupo, trabajos, procesos, threads=hilos)
+    t_total = time.perf_counter() - t0
+
+    atipicos = resumen_lote(nombres, resultados)
+    if registrar:
+        registrar_lote(nombres, grupos, resultados, sesion)
+    print(f"Ajustes: {t_ajuste * 1e3:.0f} ms; total con figuras: {t_total:.1f} s")
+    return resultados, atipicos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analisis de mu0 para muchos grupos.')
+    parser.add_argument('raiz', nargs='?', help='carpeta con un almacen de datos por grupo')
+    parser.add_argument('--sinteticos', type=int, metavar='N', help='simular N grupos a partir de datos/')
+    parser.add_argument('--salida', default='graficas/lote')
+    parser.add_argument('--procesos', type=int)
+    parser.add_argument('--hilos', action='store_true', help='dibujar en hilos en lugar de procesos')
+    parser.add_argument('--sin-graficas', action='store_true')
+    parser.add_argument('--sesion', help='etiqueta del semestre para resultados.sqlite')
+    args = parser.parse_args()
+    if args.raiz is None and not args.sinteticos:
+        parser.error('indique la carpeta de grupos o --sinteticos N')
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        raiz = args.raiz
+        if args.sinteticos:
+            raiz = carpeta
+            synthesize_groups(Path(__file__).resolve().parent / 'datos', raiz, args.sinteticos, COLUMNAS_MEDIDAS)
+        # Los grupos simulados no van al almacen de resultados de los semestres
+        analizar(raiz, args.salida, args.procesos, not args.sin_graficas, args.sesion, args.hilos,
+                 registrar=not args.sinteticos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor numerico de Biot-Savart para las configuraciones de I9
+
+Cada conductor se discretiza en segmentos rectos (inicio, fin). El campo de
+un segmento recto tiene forma cerrada, asi que el resultado solo depende de
+que tan bien los segmentos siguen la geometria real, no de una cuadratura.
+La suma segmento-por-punto se hace en bloques (puntos x segmentos) para
+acotar la memoria, con los productos punto y la suma sobre segmentos como
+productos de matrices (BLAS). Rinde unos 3e7 pares punto-segmento por
+segundo; sirve para los puntos de medida y mapas de algunos miles de
+puntos. Mapas grandes de espiras y solenoides: campo_eliptico.py.
+
+Con el campo por unidad de corriente y de mu0, la pendiente B/I medida da
+mu0 directamente con la geometria real (conductor finito con retorno,
+espira con sus terminales, solenoide de longitud finita).
+"""
+
+import warnings
+import numpy as np
+
+from generar_graficas import (
+    ajuste_lineal, conductor_data, espiras_data, geometria, solenoide1_data, solenoide2_data,
+)
+
+
+def polilinea(puntos):
+    """Segmentos (inicio, fin) que unen puntos consecutivos (n, 3)"""
+    puntos = np.asarray(puntos, dtype=float)
+    return puntos[:-1], puntos[1:]
+
+
+def unir(*trayectorias):
+    """Concatenar varias trayectorias (inicio, fin)"""
+    return (np.concatenate([t[0] for t in trayectorias]),
+            np.concatenate([t[1] for t in trayectorias]))
+
+
+def conductor_rectilineo(longitud, retorno, n=400):
+    """Conductor recto sobre el eje z con el circuito de retorno rectangular
+
+    La ida va por x=0 de -L/2 a L/2; el retorno cierra el lazo a x=retorno.
+    """
+    h = longitud / 2
+    esquinas = np.array([[0, 0, -h], [0, 0, h], [retorno, 0, h], [retorno, 0, -h], [0, 0, -h]])
+    tramos = []
+    for p0, p1 in zip(esquinas[:-1], esquinas[1:]):
+        t = np.linspace(0.0, 1.0, n + 1)[:, None]
+        tramos.append(polilinea(p0 + t * (p1 - p0)))
+    return unir(*tramos)
+
+
+def espira_circular(radio, n=256, z=0.0):
+    """Espira circular en el plano z, centrada en el eje"""
+    phi = np.linspace(0.0, 2 * np.pi, n + 1)
+    return polilinea(np.column_stack([radio * np.cos(phi), radio * np.sin(phi), np.full_like(phi, z)]))
+
+
+def solenoide(n_vueltas, radio, longitud, n_por_vuelta=32):
+    """Helice de `n_vueltas` centrada en el origen a lo largo de z"""
+    phi = np.linspace(0.0, 2 * np.pi * n_vueltas, n_vueltas * n_por_vuelta + 1)
+    z = np.linspace(-longitud / 2, longitud / 2, phi.size)
+    return polilinea(np.column_stack([radio * np.cos(phi), radio * np.sin(phi), z]))
+
+
+def _auxiliares(inicio, fin):
+    """Terminos de un bloque de segmentos que no dependen del punto"""
+    return (np.einsum('ij,ij->i', inicio, inicio), np.einsum('ij,ij->i', fin, fin),
+            np.einsum('ij,ij->i', inicio, fin), np.column_stack([inicio - fin, np.cross(inicio, fin)]))
+
+
+def _campo_bloque(puntos, inicio, fin, auxiliares):
+    """Suma exacta de segmentos rectos sobre un bloque de puntos
+
+    Con r1 = p - a y r2 = p - b, r1 x r2 = p x (a - b) + a x b, y los
+    productos punto salen de |p|^2, p.a, p.b y a.b. Asi los productos
+    (puntos x 3) @ (3 x segmentos) y la suma final factor @ [a - b, a x b]
+    van a BLAS, y por par punto-segmento solo quedan unas 15 operaciones
+    elementales (raices y division), hechas en sitio.
+    """
+    a2, b2, ab, dc = auxiliares
+    p2 = np.einsum('ij,ij->i', puntos, puntos)[:, None]
+    pa = puntos @ inicio.T
+    pb = puntos @ fin.T
+    r1r2 = p2 - pa - pb + ab
+    # |r1|^2 = |p|^2 - 2 p.a + |a|^2 (redondeo: se recorta en 0)
+    pa *= -2.0
+    pa += p2
+    pa += a2
+    n1 = np.sqrt(np.maximum(pa, 0.0, out=pa), out=pa)
+    pb *= -2.0
+    pb += p2
+    pb += b2
+    n2 = np.sqrt(np.maximum(pb, 0.0, out=pb), out=pb)
+    prod = n1 * n2
+    den = r1r2
+    den += prod
+    den *= prod
+    n1 += n2
+    # Puntos sobre el propio segmento: contribucion nula
+    factor = np.divide(n1, den, out=np.zeros_like(den), where=den > 1e-30)
+    suma = factor @ dc
+    return np.cross(puntos, suma[:, :3]) + suma[:, 3:]
+
+
+def campo_B(trayectoria, puntos, corriente=1.0, mu0=4 * np.pi * 1e-7,
+            tam_bloque=1_000_000, pares_max=1e10):
+    """Campo B (T) en `puntos` (n, 3) producido por la trayectoria
+
+    `tam_bloque` limita el numero de pares punto-segmento por bloque
+    (unos 8 MB por arreglo intermedio). El costo es lineal en puntos x
+    segmentos: unos 3e7 pares/s por nucleo, de modo que 10^6 puntos con
+    un solenoide de 1000 vueltas (32000 segmentos) toman del orden de
+    20 min. Para mapas de espiras y solenoides se usa campo_eliptico.py;
+    por encima de `pares_max` pares se emite una advertencia.
+    """
+    inicio, fin = (np.ascontiguousarray(x, dtype=float) for x in trayectoria)
+    puntos = np.atleast_2d(np.asarray(puntos, dtype=float))
+    n_seg = inicio.shape[0]
+    if puntos.shape[0] * n_seg > pares_max:
+        warnings.warn(f'{puntos.shape[0]} puntos x {n_seg} segmentos: unos '
+                      f'{puntos.shape[0] * n_seg / 3e7 / 60:.0f} min; para espiras y solenoides '
+                      f'use campo_eliptico.campo_cartesiano', stacklevel=2)
+    pasos_seg = max(1, min(n_seg, 8192, tam_bloque))
+    pasos_pts = max(1, tam_bloque // pasos_seg)
+    B = np.zeros_like(puntos)
+    for s0 in range(0, n_seg, pasos_seg):
+        bloque = inicio[s0:s0 + pasos_seg], fin[s0:s0 + pasos_seg]
+        auxiliares = _auxiliares(*bloque)
+        for i0 in range(0, puntos.shape[0], pasos_pts):
+            B[i0:i0 + pasos_pts] += _campo_bloque(puntos[i0:i0 + pasos_pts], *bloque, auxiliares)
+    return B * (mu0 / (4 * np.pi)) * corriente
+
+
+def ajustar_mu0(trayectoria, punto, I, B_mT, componente=None):
+    """mu0 a partir de la pendiente B/I y el campo geometrico en el punto de medida
+
+    El campo es lineal en mu0: B = mu0 * I * g, con g de la geometria real.
+    """
+    g = campo_B(trayectoria, np.atleast_2d(punto), corriente=1.0, mu0=1.0)[0]
+    g = np.linalg.norm(g) if componente is None else abs(g[componente])
+    slope, _, r2, std_err = ajuste_lineal(I, B_mT)
+    return slope / g, std_err / g, r2
+
+
+def configuraciones():
+    """Trayectoria, punto de medida y datos de cada configuracion de I9"""
+    g = geometria
+    return {
+        'Conductor rectilineo': (
+            conductor_rectilineo(g['conductor']['longitud'], g['conductor']['retorno']),
+            [-conductor_data['s'], 0.0, 0.0], conductor_data),
+        'Espira circular': (
+            espira_circular(espiras_data['R']), [0.0, 0.0, 0.0], espiras_data),
+        'Solenoide N=500': (
+            solenoide(solenoide1_data['N'], g['solenoide1']['radio'], g['solenoide1']['longitud']),
+            [0.0, 0.0, 0.0], solenoide1_data),
+        'Solenoide N=1000': (
+            solenoide(solenoide2_data['N'], g['solenoide2']['radio'], g['solenoide2']['longitud']),
+            [0.0, 0.0, 0.0], solenoide2_data),
+    }
+
+
+def main():
+    print("mu0 con la geometria real (Biot-Savart numerico):")
+    for nombre, (trayectoria, punto, datos) in configuraciones().items():
+        mu0, err, r2 = ajustar_mu0(trayectoria, punto, datos['I'], datos['B'])
+        print(f"  {nombre:<22} mu0 = {mu0*1e6:.3f} ± {err*1e6:.3f} x10^-6 T·m/A  "
+              f"({trayectoria[0].shape[0]} segmentos)")
+
+
+if __name__ == "__main__":
+    main()
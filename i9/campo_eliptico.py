@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Campo exacto fuera del eje de espiras y solenoides (integrales elipticas)
+
+Espira circular: forma cerrada con las integrales elipticas completas K y E
+(scipy.special.ellipk / ellipe, parametro m = k^2).
+
+Solenoide finito (lamina de corriente): expresion de Derby y Olbert con la
+integral eliptica generalizada cel(kc, p, c, s), evaluada con el algoritmo
+de Bulirsch vectorizado. Tambien se puede evaluar como superposicion de N
+espiras coaxiales.
+
+Todo se calcula en coordenadas cilindricas (rho, z) sobre mallas de
+puntos; es varios ordenes de magnitud mas rapido que sumar segmentos en
+biot_savart.py, contra el cual se verifica en `verificar_contra_biot_savart`.
+"""
+
+import numpy as np
+from scipy.special import ellipe, ellipk
+
+from generar_graficas import ESTILO, geometria, mu0_teorico, solenoide1_data, solenoide2_data, crear_carpeta_graficas
+import render
+
+
+def campo_espira(radio, rho, z, corriente=1.0, mu0=mu0_teorico):
+    """(B_rho, B_z) de una espira de radio `radio` en el plano z=0"""
+    rho = np.abs(np.asarray(rho, dtype=float))
+    z = np.asarray(z, dtype=float)
+    a = radio
+    suma2 = (a + rho) ** 2 + z ** 2
+    dif2 = (a - rho) ** 2 + z ** 2
+    m = 4 * a * rho / suma2
+    K = ellipk(m)
+    E = ellipe(m)
+    c = mu0 * corriente / (2 * np.pi * np.sqrt(suma2))
+    Bz = c * (K + (a ** 2 - rho ** 2 - z ** 2) / dif2 * E)
+    # En el eje B_rho -> 0; se evita la division por rho
+    en_eje = rho < 1e-12 * a
+    rho_seguro = np.where(en_eje, 1.0, rho)
+    Brho = np.where(en_eje, 0.0, c * z / rho_seguro * (-K + (a ** 2 + rho ** 2 + z ** 2) / dif2 * E))
+    return Brho, Bz
+
+
+def cel(kc, p, c, s, max_iter=60, tol=1e-12):
+    """Integral eliptica completa generalizada de Bulirsch (p > 0), vectorizada"""
+    kc, p, c, s = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (kc, p, c, s)))
+    k = np.abs(kc)
+    pp = np.sqrt(p)
+    ss = s / pp
+    cc = c.copy()
+    em = np.ones_like(k)
+    f = cc
+    cc = cc + ss / pp
+    g = k / pp
+    ss = 2 * (ss + f * g)
+    pp = g + pp
+    g = em
+    em = k + em
+    kk = k
+    for _ in range(max_iter):
+        if np.all(np.abs(g - k) <= g * tol):
+            break
+        k = 2 * np.sqrt(kk)
+        kk = k * em
+        f = cc
+        cc = cc + ss / pp
+        g = kk / pp
+        ss = 2 * (ss + f * g)
+        pp = g + pp
+        g = em
+        em = k + em
+    return (np.pi / 2) * (ss + cc * em) / (em * (em + pp))
+
+
+def campo_solenoide(n_vueltas, radio, longitud, rho, z, corriente=1.0, mu0=mu0_teorico):
+    """(B_rho, B_z) de un solenoide finito como lamina de corriente (Derby-Olbert)"""
+    rho = np.abs(np.asarray(rho, dtype=float))
+    z = np.asarray(z, dtype=float)
+    a = radio
+    # Sobre la lamina (rho = a) gamma = 0 y p = 0; se desplaza un poco
+    rho = np.where(np.abs(rho - a) < 1e-12 * a, a * (1 - 1e-9), rho)
+    B0 = mu0 * (n_vueltas / longitud) * corriente / np.pi
+    gamma = (a - rho) / (a + rho)
+    Brho = 0.0
+    Bz = 0.0
+    for signo, zk in ((1.0, z + longitud / 2), (-1.0, z - longitud / 2)):
+        raiz = np.sqrt(zk ** 2 + (rho + a) ** 2)
+        alfa = a / raiz
+        beta = zk / raiz
+        k = np.sqrt((zk ** 2 + (a - rho) ** 2) / (zk ** 2 + (a + rho) ** 2))
+        Brho = Brho + signo * alfa * cel(k, 1.0, 1.0, -1.0)
+        Bz = Bz + signo * beta * cel(k, gamma ** 2, 1.0, gamma)
+    return B0 * Brho, B0 * a / (a + rho) * Bz
+
+
+def campo_solenoide_espiras(n_vueltas, radio, longitud, rho, z, corriente=1.0,
+                            mu0=mu0_teorico, tam_bloque=2_000_000):
+    """Solenoide como superposicion de N espiras coaxiales, en bloques de puntos"""
+    rho = np.ravel(np.asarray(rho, dtype=float))
+    z = np.ravel(np.asarray(z, dtype=float))
+    # Cada espira en el centro de su tramo L/N de la lamina
+    z_espiras = -longitud / 2 + (np.arange(n_vueltas) + 0.5) * longitud / n_vueltas
+    paso = max(1, tam_bloque // n_vueltas)
+    Brho = np.empty_like(rho)
+    Bz = np.empty_like(z)
+    for i in range(0, rho.size, paso):
+        br, bz = campo_espira(radio, rho[i:i + paso, None], z[i:i + paso, None] - z_espiras,
+                              corriente, mu0)
+        Brho[i:i + paso] = br.sum(axis=1)
+        Bz[i:i + paso] = bz.sum(axis=1)
+    return Brho, Bz
+
+
+def campo_cartesiano(campo, puntos, *args, **kwargs):
+    """Evaluar un campo axisimetrico (rho, z) en puntos cartesianos (n, 3)"""
+    puntos = np.atleast_2d(np.asarray(puntos, dtype=float))
+    x, y, z = puntos.T
+    rho = np.hypot(x, y)
+    Brho, Bz = campo(*args, rho, z, **kwargs)
+    rho_seguro = np.where(rho > 0, rho, 1.0)
+    return np.column_stack([Brho * x / rho_seguro, Brho * y / rho_seguro, Bz])
+
+
+def mapa_campo(n_vueltas, radio, longitud, corriente=1.0, n_rho=200, n_z=400, extension=1.5):
+    """Malla (rho, z) con |B| y componentes para un solenoide"""
+    rho = np.linspace(0.0, extension * 2 * radio, n_rho)
+    z = np.linspace(-extension * longitud, extension * longitud, n_z)
+    R, Z = np.meshgrid(rho, z)
+    Brho, Bz = campo_solenoide(n_vueltas, radio, longitud, R, Z, corriente)
+    return {'rho': R, 'z': Z, 'Brho': Brho, 'Bz': Bz, 'B': np.hypot(Brho, Bz)}
+
+
+def grafica_mapa_solenoide(datos, nombre_archivo, corriente=1.0):
+    """Mapa 2D de |B| y perfil en el eje de un solenoide de I9"""
+    g = datos['geometria']
+    mapa = mapa_campo(datos['N'], g['radio'], g['longitud'], corriente)
+    z_eje = mapa['z'][:, 0]
+    _, Bz_eje = campo_solenoide(datos['N'], g['radio'], g['longitud'], 0.0, z_eje, corriente)
+
+    with render.style(ESTILO):
+        fig, (ax1, ax2) = render.subplots(1, 2, figsize=(14, 6))
+        c = ax1.pcolormesh(mapa['z'] * 1e3, mapa['rho'] * 1e3, mapa['B'] * 1e3, shading='auto')
+        ax1.streamplot(mapa['z'][:, 0] * 1e3, mapa['rho'][0] * 1e3, mapa['Bz'].T, mapa['Brho'].T,
+                       color='w', density=1.0, linewidth=0.6)
+        fig.colorbar(c, ax=ax1, label='|B| [mT]')
+        ax1.set_xlabel('z [mm]')
+        ax1.set_ylabel('rho [mm]')
+        ax1.set_title(f'{datos["etiqueta"]}\nI = {corriente:.1f} A')
+
+        ax2.plot(z_eje * 1e3, Bz_eje * 1e3, 'b-', linewidth=2, label='Derby-Olbert (eje)')
+        B_ideal = mu0_teorico * datos['N'] / g['longitud'] * corriente
+        ax2.axhline(B_ideal * 1e3, color='r', linestyle='--', label='mu0 n I (ideal)')
+        ax2.set_xlabel('z [mm]')
+        ax2.set_ylabel('B_z [mT]')
+        ax2.set_title('Perfil en el eje')
+        ax2.grid(True, alpha=0.3)
+        ax2.legend()
+
+        fig.tight_layout()
+    render.save(fig, nombre_archivo, ESTILO, dpi=300, bbox_inches='tight')
+    print(f"[OK] Grafica guardada: {nombre_archivo}")
+
+
+def verificar_contra_biot_savart(n_puntos=200, semilla=0):
+    """Error relativo maximo frente a la suma de segmentos de biot_savart.py"""
+    from biot_savart import campo_B, espira_circular
+    rng = np.random.default_rng(semilla)
+    a = 0.02
+    puntos = rng.uniform(-0.05, 0.05, (n_puntos, 3))
+    B_num = campo_B(espira_circular(a, n=4096), puntos)
+    B_eli = campo_cartesiano(campo_espira, puntos, a)
+    err_espira = np.max(np.linalg.norm(B_num - B_eli, axis=1) / np.linalg.norm(B_num, axis=1))
+
+    # Solenoide de lamina frente a la superposicion de espiras
+    N, L = 200, 0.05
+    rho = rng.uniform(0, 0.04, n_puntos)
+    z = rng.uniform(-0.06, 0.06, n_puntos)
+    br1, bz1 = campo_solenoide(N, a, L, rho, z)
+    br2, bz2 = campo_solenoide_espiras(N, a, L, rho, z)
+    lejos = np.abs(rho - a) > 0.005  # cerca de la lamina las espiras discretas difieren
+    err_solenoide = np.max(np.hypot(br1 - br2, bz1 - bz2)[lejos] / np.hypot(br2, bz2)[lejos])
+    return err_espira, err_solenoide
+
+
+def main():
+    crear_carpeta_graficas()
+    for datos, nombre in ((solenoide1_data, 'solenoide1'), (solenoide2_data, 'solenoide2')):
+        grafica_mapa_solenoide(dict(datos, geometria=geometria[nombre]),
+                               f'graficas/mapa_{nombre}.png')
+    err_espira, err_solenoide = verificar_contra_biot_savart()
+    print(f"Error relativo maximo vs Biot-Savart: espira {err_espira:.2e}, "
+          f"solenoide (lamina vs espiras) {err_solenoide:.2e}")
+
+
+if __name__ == "__main__":
+    main()
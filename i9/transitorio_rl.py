@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inductancia de los solenoides de I9 a partir de transitorios RL
+
+En generar_graficas.py L = 9 mH y L = 36 mH son datos de placa. Aqui se
+miden: el solenoide se excita con una onda cuadrada y se captura el voltaje
+aplicado y la corriente (osciloscopio o DAQ). Cada flanco del voltaje da un
+transitorio
+
+    i(t) = c + A * exp(-t / tau)
+
+(subida: A = -I_inf, bajada: A = +I_inf; c absorbe offsets). R sale del
+salto de voltaje entre el salto de corriente y L = tau * R.
+
+La captura se recorre por bloques de un memmap: los flancos se detectan
+vectorizados y las ventanas de cada pulso se ajustan en lotes con
+Gauss-Newton batched, acumulando solo sumas, de modo que la memoria no
+crece con la duracion de la captura.
+
+Formato de captura: binario crudo float32 intercalado (V, I), o .npy
+(muestras, 2).
+"""
+
+import tempfile
+import numpy as np
+from pathlib import Path
+
+from generar_graficas import solenoide1_data, solenoide2_data
+
+CANALES = ('V', 'I')
+
+
+def abrir_captura(ruta, dtype=np.float32, n_canales=2):
+    """Arreglo (muestras, canales) mapeado en memoria"""
+    ruta = Path(ruta)
+    if ruta.suffix == '.npy':
+        return np.load(ruta, mmap_mode='r')
+    datos = np.memmap(ruta, dtype=dtype, mode='r')
+    return datos[:datos.size - datos.size % n_canales].reshape(-1, n_canales)
+
+
+def detectar_flancos(v, umbral, histeresis):
+    """Indices donde v cruza el umbral (con histeresis), vectorizado
+
+    Estado alto si v > umbral + histeresis, bajo si v < umbral - histeresis;
+    entre ambos se mantiene el estado anterior.
+    """
+    estado = np.full(v.shape, np.nan)
+    estado[v > umbral + histeresis] = 1.0
+    estado[v < umbral - histeresis] = 0.0
+    definido = ~np.isnan(estado)
+    if not definido.any():
+        return np.zeros(0, dtype=np.intp)
+    # Rellenar hacia adelante los valores indefinidos; los iniciales toman el
+    # primer estado definido (no son un flanco)
+    idx = np.where(definido, np.arange(v.size), 0)
+    idx[:np.argmax(definido)] = np.argmax(definido)
+    np.maximum.accumulate(idx, out=idx)
+    estado = estado[idx]
+    return np.flatnonzero(np.diff(estado) != 0) + 1
+
+
+def niveles_voltaje(v, n_bloques=64, largo=4096, separacion_min=20.0, semilla=0):
+    """Niveles bajo y alto de la onda cuadrada y el ruido, sobre toda la captura
+
+    Se toman `n_bloques` tramos de `largo` muestras en posiciones aleatorias
+    (sin alias con el periodo de la onda); los niveles son los percentiles
+    5 y 95 y el ruido sale de la MAD de las diferencias entre muestras
+    consecutivas. Si los niveles no estan separados por al menos
+    `separacion_min` veces el ruido no hay flancos que detectar con
+    fiabilidad y se lanza ValueError.
+    """
+    n = v.shape[0]
+    if n <= n_bloques * largo:
+        tramos = [np.asarray(v, dtype=float)]
+    else:
+        rng = np.random.default_rng(semilla)
+        inicios = np.sort(rng.choice(n - largo, size=n_bloques, replace=False))
+        tramos = [np.asarray(v[i:i + largo], dtype=float) for i in inicios]
+    muestras = np.concatenate(tramos)
+    bajo, alto = np.percentile(muestras, [5, 95])
+    saltos = np.concatenate([np.diff(x) for x in tramos])
+    ruido = np.median(np.abs(saltos - np.median(saltos))) / 0.6745 / np.sqrt(2)
+    if not alto - bajo > separacion_min * ruido:
+        raise ValueError(f"Niveles de voltaje no separados: bajo {bajo:.4g}, alto {alto:.4g}, "
+                         f"ruido {ruido:.3g}; indique umbral e histeresis")
+    return bajo, alto, ruido
+
+
+def ajustar_pulsos(t, Y, max_iter=30):
+    """Gauss-Newton batched de y = c + A exp(-k t) para cada fila de Y
+
+    Devuelve parametros (n, 3) [c, A, k], su covarianza (n, 3, 3) y el
+    ruido estimado por pulso.
+    """
+    n, m = Y.shape
+    dt = t[1] - t[0]
+    cola = max(1, m // 10)
+    c = Y[:, -cola:].mean(axis=1)
+    A = Y[:, 0] - c
+    area = np.sum(Y - c[:, None], axis=1) * dt
+    k = np.where(np.abs(area) > 0, A / np.where(area == 0, 1.0, area), 1.0 / (t[-1] / 5))
+    k = np.clip(k, 1.0 / t[-1], 1.0 / dt)
+    p = np.column_stack([c, A, k])
+
+    for _ in range(max_iter):
+        e = np.exp(-p[:, 2:3] * t)
+        r = Y - (p[:, 0:1] + p[:, 1:2] * e)
+        J = np.stack([np.ones_like(e), e, -p[:, 1:2] * t * e], axis=2)
+        JtJ = np.einsum('nmi,nmj->nij', J, J)
+        JtJ += 1e-9 * np.einsum('nii->ni', JtJ)[:, :, None] * np.eye(3)
+        paso = np.linalg.solve(JtJ, np.einsum('nmi,nm->ni', J, r)[:, :, None])[:, :, 0]
+        p += paso
+        p[:, 2] = np.maximum(p[:, 2], 1e-3 / t[-1])
+        if np.max(np.abs(paso[:, 2]) / p[:, 2]) < 1e-10:
+            break
+
+    e = np.exp(-p[:, 2:3] * t)
+    r = Y - (p[:, 0:1] + p[:, 1:2] * e)
+    J = np.stack([np.ones_like(e), e, -p[:, 1:2] * t * e], axis=2)
+    s2 = np.sum(r ** 2, axis=1) / (m - 3)
+    cov = np.linalg.inv(np.einsum('nmi,nmj->nij', J, J)) * s2[:, None, None]
+    return p, cov, np.sqrt(s2)
+
+
+def analizar_captura(ruta, fs, ventana_s, pre_s=None, umbral=None, histeresis=None,
+                     tam_bloque=1 << 20, tam_lote=256, dtype=np.float32):
+    """L, R y tau de todos los pulsos de una captura, en memoria constante
+
+    `ventana_s` es la duracion ajustada despues de cada flanco (unos 5 tau,
+    menor que medio periodo de la onda cuadrada). `pre_s` es el tramo antes
+    del flanco usado para el voltaje previo. Si no se da `umbral` se toma el
+    punto medio entre los niveles de niveles_voltaje(), muestreados en toda
+    la captura, con una histeresis del 10 % de su separacion.
+    """
+    datos = abrir_captura(ruta, dtype)
+    n_total = datos.shape[0]
+    n_ventana = int(round(ventana_s * fs))
+    n_pre = int(round((pre_s if pre_s is not None else ventana_s / 10) * fs))
+    t = np.arange(n_ventana) / fs
+    if umbral is None:
+        bajo, alto, _ = niveles_voltaje(datos[:, 0])
+        umbral = 0.5 * (alto + bajo)
+        histeresis = 0.1 * (alto - bajo) if histeresis is None else histeresis
+    histeresis = 0.0 if histeresis is None else histeresis
+
+    # Sumas acumuladas: n, sum x, sum x^2 para tau, R, L y sum var(tau) del ajuste
+    sumas = {nombre: np.zeros(3) for nombre in ('tau', 'R', 'L')}
+    sumas['var_tau'] = np.zeros(1)
+    pendientes_V, pendientes_I = [], []
+    ultimo = -1
+    inicio = 0
+    resto = np.zeros((0, 2))
+
+    def procesar(lote_V, lote_I):
+        V = np.array(lote_V)
+        Y = np.array(lote_I)
+        p, cov, _ = ajustar_pulsos(t, Y[:, n_pre:])
+        dV = V[:, n_pre + n_ventana // 2:].mean(axis=1) - V[:, :n_pre].mean(axis=1)
+        tau = 1.0 / p[:, 2]
+        R = np.abs(dV / p[:, 1])
+        L = tau * R
+        for nombre, x in (('tau', tau), ('R', R), ('L', L)):
+            sumas[nombre] += (x.size, x.sum(), np.sum(x ** 2))
+        sumas['var_tau'] += np.sum(cov[:, 2, 2] / p[:, 2] ** 4)
+
+    while inicio < n_total or resto.shape[0]:
+        bloque = np.asarray(datos[inicio:inicio + tam_bloque], dtype=float)
+        fin_captura = inicio + bloque.shape[0] >= n_total
+        base = inicio - resto.shape[0]
+        seg = np.vstack([resto, bloque]) if resto.size else bloque
+        for f in detectar_flancos(seg[:, 0], umbral, histeresis):
+            g = base + f
+            if g <= ultimo:
+                continue
+            if f + n_ventana > seg.shape[0]:
+                break  # se completa en el siguiente bloque
+            ultimo = g
+            if f < n_pre:
+                continue
+            pendientes_V.append(seg[f - n_pre:f + n_ventana, 0])
+            pendientes_I.append(seg[f - n_pre:f + n_ventana, 1])
+            if len(pendientes_V) >= tam_lote:
+                procesar(pendientes_V, pendientes_I)
+                pendientes_V, pendientes_I = [], []
+        inicio += bloque.shape[0]
+        if fin_captura:
+            break
+        resto = seg[-(n_pre + n_ventana):]
+    if pendientes_V:
+        procesar(pendientes_V, pendientes_I)
+
+    n = int(sumas['tau'][0])
+    if n == 0:
+        raise ValueError(f"No se detectaron pulsos completos en {ruta}")
+    resultado = {'n_pulsos': n}
+    for nombre in ('tau', 'R', 'L'):
+        _, s1, s2 = sumas[nombre]
+        media = s1 / n
+        disp = np.sqrt(max(s2 / n - media ** 2, 0.0) * n / max(n - 1, 1))
+        resultado[nombre] = media
+        resultado[f'sigma_{nombre}'] = disp / np.sqrt(n)
+        resultado[f'dispersion_{nombre}'] = disp
+    # Incertidumbre del ajuste individual (media cuadratica) como referencia
+    resultado['sigma_tau_ajuste'] = np.sqrt(sumas['var_tau'][0] / n)
+    return resultado
+
+
+def comprobar_escalamiento(L1, sL1, N1, L2, sL2, N2):
+    """Cociente L2/L1 frente a (N2/N1)^2 (misma longitud y radio)"""
+    cociente = L2 / L1
+    sigma = cociente * np.hypot(sL1 / L1, sL2 / L2)
+    esperado = (N2 / N1) ** 2
+    return {'cociente': cociente, 'sigma': sigma, 'esperado': esperado,
+            'z': (cociente - esperado) / sigma if sigma > 0 else np.inf}
+
+
+def generar_captura_sintetica(ruta, L, R, V=5.0, fs=50000.0, periodo=0.2, duracion=8.0,
+                              ruido=0.02, offset_I=0.01, semilla=0):
+    """Captura float32 (V, I) de un RL excitado con onda cuadrada 0..V"""
+    rng = np.random.default_rng(semilla)
+    n = int(fs * duracion)
+    medio = int(round(periodo / 2 * fs))
+    v = np.where((np.arange(n) // medio) % 2 == 0, V, 0.0)
+    # Solucion exacta por tramos: i[n+1] = i_inf + (i[n] - i_inf) e^{-dt R/L}
+    a = np.exp(-R / (L * fs))
+    i = np.empty(n)
+    actual = 0.0
+    for k0 in range(0, n, medio):
+        m = np.arange(min(n, k0 + medio) - k0)
+        i_inf = v[k0] / R
+        i[k0:k0 + m.size] = i_inf + (actual - i_inf) * a ** m
+        actual = i_inf + (actual - i_inf) * a ** m.size
+    datos = np.column_stack([v + ruido * rng.standard_normal(n),
+                             i + offset_I + ruido * rng.standard_normal(n)])
+    datos.astype(np.float32).tofile(ruta)
+    return Path(ruta)
+
+
+def main():
+    fs = 50000.0
+    casos = ((solenoide1_data, 2.5), (solenoide2_data, 5.0))
+    medidas = []
+    with tempfile.TemporaryDirectory() as carpeta:
+        print("Transitorios RL (capturas sinteticas con L de placa):")
+        for datos, R in casos:
+            ruta = generar_captura_sintetica(Path(carpeta) / f"rl_N{datos['N']}.bin", datos['L'], R, fs=fs)
+            res = analizar_captura(ruta, fs, ventana_s=0.09)
+            medidas.append(res)
+            print(f"  N={datos['N']:<5} {res['n_pulsos']} pulsos  "
+                  f"tau = {res['tau']*1e3:.4f} ± {res['sigma_tau']*1e3:.4f} ms  "
+                  f"R = {res['R']:.4f} ± {res['sigma_R']:.4f} Ohm  "
+                  f"L = {res['L']*1e3:.3f} ± {res['sigma_L']*1e3:.3f} mH  "
+                  f"(placa {datos['L']*1e3:.0f} mH)")
+    esc = comprobar_escalamiento(medidas[0]['L'], medidas[0]['sigma_L'], solenoide1_data['N'],
+                                 medidas[1]['L'], medidas[1]['sigma_L'], solenoide2_data['N'])
+    print(f"  L2/L1 = {esc['cociente']:.4f} ± {esc['sigma']:.4f}  "
+          f"(N2/N1)^2 = {esc['esperado']:.1f}  z = {esc['z']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,143 +3,134 @@
 Generador de graficas para el laboratorio de Inducción Electromagnética y Ley de Faraday
 """
 
+from pathlib import Path
+
 import numpy as np
-import matplotlib.pyplot as plt
 from scipy import stats
 import pandas as pd
 
-# Configuracion de matplotlib
-plt.rcParams['font.family'] = 'DejaVu Sans'
-plt.rcParams['axes.unicode_minus'] = False
-plt.rcParams['font.size'] = 11
+from inferencia_bayesiana import muestrear_posterior, prediccion_posterior, intervalos, v_promedio
 
-# Datos experimentales - Fase 1: Voltaje vs Velocidad
-datos_fase1 = {
-    'Altura_cm': [10, 20, 30, 40, 50],
-    'Velocidad_ms': [1.40, 1.98, 2.43, 2.80, 3.13],
-    'Voltaje_mV': [8.20, 12.30, 15.80, 18.50, 21.20]
+# Configuracion de matplotlib, aplicada a cada figura con render.style()
+ESTILO = {
+    'font.family': 'DejaVu Sans',
+    'axes.unicode_minus': False,
+    'font.size': 11,
 }
 
-# Datos experimentales - Fase 2: Voltaje vs Numero de espiras
-datos_fase2 = {
-    'Espiras': [200, 400, 600],
-    'Voltaje_mV': [15.83, 31.25, 47.05],
-    'Incertidumbre_mV': [0.10, 0.12, 0.13]
-}
+from lab_store import load_store
+import render
+
+datos_lab = load_store(Path(__file__).resolve().parent / 'datos')
+
+datos_fase1 = datos_lab['datos_fase1']
+datos_fase2 = datos_lab['datos_fase2']
 
 # Crear DataFrames
-df1 = pd.DataFrame(datos_fase1)
-df2 = pd.DataFrame(datos_fase2)
+df1 = pd.DataFrame(dict(datos_fase1))
+df2 = pd.DataFrame(dict(datos_fase2))
 
 # GRAFICA 1: Voltaje vs Velocidad
 slope1, intercept1, r1, p_value1, std_err1 = stats.linregress(df1['Velocidad_ms'], df1['Voltaje_mV'])
 r2_1 = r1**2
 
-plt.figure(figsize=(10, 6))
-plt.scatter(df1['Velocidad_ms'], df1['Voltaje_mV'], color='blue', s=80, alpha=0.7, 
-           label='Datos experimentales', zorder=3)
+with render.style(ESTILO):
+    fig, ax = render.subplots(figsize=(10, 6))
+    ax.scatter(df1['Velocidad_ms'], df1['Voltaje_mV'], color='blue', s=80, alpha=0.7, 
+               label='Datos experimentales', zorder=3)
 
-velocidad_teorica = np.linspace(df1['Velocidad_ms'].min(), df1['Velocidad_ms'].max(), 100)
-voltaje_teorico = slope1 * velocidad_teorica + intercept1
-plt.plot(velocidad_teorica, voltaje_teorico, 'r--', linewidth=2, 
-         label=f'Regresión lineal: V = {slope1:.2f}v + {intercept1:.2f}\n($R^2$ = {r2_1:.4f})')
+    velocidad_teorica = np.linspace(df1['Velocidad_ms'].min(), df1['Velocidad_ms'].max(), 100)
+    voltaje_teorico = slope1 * velocidad_teorica + intercept1
+    ax.plot(velocidad_teorica, voltaje_teorico, 'r--', linewidth=2, 
+             label=f'Regresión lineal: V = {slope1:.2f}v + {intercept1:.2f}\n($R^2$ = {r2_1:.4f})')
 
-plt.xlabel('Velocidad del imán (m/s)', fontsize=12)
-plt.ylabel('Voltaje inducido (mV)', fontsize=12)
-plt.title('Voltaje Inducido vs Velocidad del Imán\nBobina 1 (N = 200 espiras)', fontsize=14, fontweight='bold')
-plt.grid(True, alpha=0.3, linestyle='--')
-plt.legend(loc='best', fontsize=10)
-plt.tight_layout()
-plt.savefig('graficas/voltaje_vs_velocidad.png', dpi=300, bbox_inches='tight')
-plt.close()
+    ax.set_xlabel('Velocidad del imán (m/s)', fontsize=12)
+    ax.set_ylabel('Voltaje inducido (mV)', fontsize=12)
+    ax.set_title('Voltaje Inducido vs Velocidad del Imán\nBobina 1 (N = 200 espiras)', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.legend(loc='best', fontsize=10)
+    fig.tight_layout()
+render.save(fig, 'graficas/voltaje_vs_velocidad.png', ESTILO, dpi=300, bbox_inches='tight')
 
 # GRAFICA 2: Voltaje vs Numero de Espiras
 slope2, intercept2, r2, p_value2, std_err2 = stats.linregress(df2['Espiras'], df2['Voltaje_mV'])
 r2_2 = r2**2
 
-plt.figure(figsize=(10, 6))
-plt.errorbar(df2['Espiras'], df2['Voltaje_mV'], yerr=df2['Incertidumbre_mV'], 
-            fmt='o', color='green', markersize=8, capsize=5, capthick=2,
-            label='Datos experimentales', zorder=3, alpha=0.7)
-
-espiras_teorica = np.linspace(df2['Espiras'].min(), df2['Espiras'].max(), 100)
-voltaje_teorico2 = slope2 * espiras_teorica + intercept2
-plt.plot(espiras_teorica, voltaje_teorico2, 'r--', linewidth=2, 
-         label=f'Regresión lineal: V = {slope2:.4f}N + {intercept2:.2f}\n($R^2$ = {r2_2:.4f})')
-
-plt.xlabel('Número de espiras', fontsize=12)
-plt.ylabel('Voltaje inducido (mV)', fontsize=12)
-plt.title('Voltaje Inducido vs Número de Espiras\n(h = 30 cm constante)', fontsize=14, fontweight='bold')
-plt.grid(True, alpha=0.3, linestyle='--')
-plt.legend(loc='best', fontsize=10)
-plt.tight_layout()
-plt.savefig('graficas/voltaje_vs_espiras.png', dpi=300, bbox_inches='tight')
-plt.close()
+with render.style(ESTILO):
+    fig, ax = render.subplots(figsize=(10, 6))
+    ax.errorbar(df2['Espiras'], df2['Voltaje_mV'], yerr=df2['Incertidumbre_mV'], 
+                fmt='o', color='green', markersize=8, capsize=5, capthick=2,
+                label='Datos experimentales', zorder=3, alpha=0.7)
+
+    espiras_teorica = np.linspace(df2['Espiras'].min(), df2['Espiras'].max(), 100)
+    voltaje_teorico2 = slope2 * espiras_teorica + intercept2
+    ax.plot(espiras_teorica, voltaje_teorico2, 'r--', linewidth=2, 
+             label=f'Regresión lineal: V = {slope2:.4f}N + {intercept2:.2f}\n($R^2$ = {r2_2:.4f})')
+
+    ax.set_xlabel('Número de espiras', fontsize=12)
+    ax.set_ylabel('Voltaje inducido (mV)', fontsize=12)
+    ax.set_title('Voltaje Inducido vs Número de Espiras\n(h = 30 cm constante)', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.legend(loc='best', fontsize=10)
+    fig.tight_layout()
+render.save(fig, 'graficas/voltaje_vs_espiras.png', ESTILO, dpi=300, bbox_inches='tight')
 
 # GRAFICA 3: Comparacion Teorica vs Experimental
-# Valores teoricos estimados (usando modelo simplificado)
-B_estimado = 0.2  # T (campo magnetico del iman)
-A_bobina = np.pi * (0.015)**2  # m^2 (area de la bobina, radio 1.5 cm)
-L_bobina = 0.05  # m (longitud de la bobina)
-v_promedio = 2.43  # m/s (velocidad promedio)
-dt_estimado = L_bobina / v_promedio  # s
-
-# Calcular voltaje teorico para cada bobina
-voltaje_teorico_200 = 200 * B_estimado * A_bobina / dt_estimado * 1000  # mV
-voltaje_teorico_400 = 400 * B_estimado * A_bobina / dt_estimado * 1000  # mV
-voltaje_teorico_600 = 600 * B_estimado * A_bobina / dt_estimado * 1000  # mV
-
-voltajes_teoricos = [voltaje_teorico_200, voltaje_teorico_400, voltaje_teorico_600]
-
-plt.figure(figsize=(10, 6))
-x_pos = np.arange(len(df2['Espiras']))
-width = 0.35
-
-bars1 = plt.bar(x_pos - width/2, df2['Voltaje_mV'], width, yerr=df2['Incertidumbre_mV'],
-                label='Experimental', color='blue', alpha=0.7, capsize=5)
-bars2 = plt.bar(x_pos + width/2, voltajes_teoricos, width,
-                label='Teórico (estimado)', color='red', alpha=0.7)
-
-plt.xlabel('Número de espiras', fontsize=12)
-plt.ylabel('Voltaje inducido (mV)', fontsize=12)
-plt.title('Comparación: Valores Experimentales vs Teóricos\n(Estimación basada en Ley de Faraday)', 
-          fontsize=14, fontweight='bold')
-plt.xticks(x_pos, df2['Espiras'])
-plt.legend(loc='best', fontsize=10)
-plt.grid(True, alpha=0.3, linestyle='--', axis='y')
-plt.tight_layout()
-plt.savefig('graficas/comparacion_teorica_experimental.png', dpi=300, bbox_inches='tight')
-plt.close()
+# B, A y L como parametros con prior en los valores del modelo simple
+# V = N B A v / L (inferencia_bayesiana.py):
+# las barras teoricas usan la prediccion posterior con su intervalo del 95%
+posterior = muestrear_posterior()
+prediccion = prediccion_posterior(posterior, df2['Espiras'], v_promedio)
+voltajes_teoricos = prediccion['mediana']
+error_teorico = [prediccion['mediana'] - prediccion['inferior'],
+                 prediccion['superior'] - prediccion['mediana']]
+
+with render.style(ESTILO):
+    fig, ax = render.subplots(figsize=(10, 6))
+    x_pos = np.arange(len(df2['Espiras']))
+    width = 0.35
+
+    bars1 = ax.bar(x_pos - width/2, df2['Voltaje_mV'], width, yerr=df2['Incertidumbre_mV'],
+                    label='Experimental', color='blue', alpha=0.7, capsize=5)
+    bars2 = ax.bar(x_pos + width/2, voltajes_teoricos, width, yerr=error_teorico,
+                    label='Teórico (posterior, IC 95%)', color='red', alpha=0.7, capsize=5)
+
+    ax.set_xlabel('Número de espiras', fontsize=12)
+    ax.set_ylabel('Voltaje inducido (mV)', fontsize=12)
+    ax.set_title('Comparación: Valores Experimentales vs Teóricos\n(Estimación basada en Ley de Faraday)', 
+              fontsize=14, fontweight='bold')
+    ax.set_xticks(x_pos, df2['Espiras'])
+    ax.legend(loc='best', fontsize=10)
+    ax.grid(True, alpha=0.3, linestyle='--', axis='y')
+    fig.tight_layout()
+render.save(fig, 'graficas/comparacion_teorica_experimental.png', ESTILO, dpi=300, bbox_inches='tight')
 
 # GRAFICA 4: Analisis de Incertidumbres
-plt.figure(figsize=(12, 6))
-
-# Subplot 1: Voltaje con barras de error (Fase 1)
-plt.subplot(1, 2, 1)
-incertidumbres_fase1 = [0.08, 0.10, 0.12, 0.14, 0.16]  # Valores estimados basados en desviaciones estándar
-plt.errorbar(df1['Velocidad_ms'], df1['Voltaje_mV'], yerr=incertidumbres_fase1, 
-            fmt='o', color='blue', markersize=8, capsize=5, capthick=2, 
-            alpha=0.7, label='Datos con incertidumbre')
-plt.xlabel('Velocidad del imán (m/s)', fontsize=11)
-plt.ylabel('Voltaje inducido (mV)', fontsize=11)
-plt.title('Voltaje Inducido con Barras de Error\n(Fase 1: Variación de velocidad)', fontsize=12, fontweight='bold')
-plt.grid(True, alpha=0.3, linestyle='--')
-plt.legend(loc='best', fontsize=9)
-
-# Subplot 2: Voltaje con barras de error (Fase 2)
-plt.subplot(1, 2, 2)
-plt.errorbar(df2['Espiras'], df2['Voltaje_mV'], yerr=df2['Incertidumbre_mV'], 
-            fmt='s', color='green', markersize=8, capsize=5, capthick=2, 
-            alpha=0.7, label='Datos con incertidumbre')
-plt.xlabel('Número de espiras', fontsize=11)
-plt.ylabel('Voltaje inducido (mV)', fontsize=11)
-plt.title('Voltaje Inducido con Barras de Error\n(Fase 2: Variación de espiras)', fontsize=12, fontweight='bold')
-plt.grid(True, alpha=0.3, linestyle='--')
-plt.legend(loc='best', fontsize=9)
-
-plt.tight_layout()
-plt.savefig('graficas/analisis_incertidumbres.png', dpi=300, bbox_inches='tight')
-plt.close()
+with render.style(ESTILO):
+    fig, (ax1, ax2) = render.subplots(1, 2, figsize=(12, 6))
+
+    # Subplot 1: Voltaje con barras de error (Fase 1)
+    ax1.errorbar(df1['Velocidad_ms'], df1['Voltaje_mV'], yerr=df1['Incertidumbre_mV'], 
+                fmt='o', color='blue', markersize=8, capsize=5, capthick=2, 
+                alpha=0.7, label='Datos con incertidumbre')
+    ax1.set_xlabel('Velocidad del imán (m/s)', fontsize=11)
+    ax1.set_ylabel('Voltaje inducido (mV)', fontsize=11)
+    ax1.set_title('Voltaje Inducido con Barras de Error\n(Fase 1: Variación de velocidad)', fontsize=12, fontweight='bold')
+    ax1.grid(True, alpha=0.3, linestyle='--')
+    ax1.legend(loc='best', fontsize=9)
+
+    # Subplot 2: Voltaje con barras de error (Fase 2)
+    ax2.errorbar(df2['Espiras'], df2['Voltaje_mV'], yerr=df2['Incertidumbre_mV'], 
+                fmt='s', color='green', markersize=8, capsize=5, capthick=2, 
+                alpha=0.7, label='Datos con incertidumbre')
+    ax2.set_xlabel('Número de espiras', fontsize=11)
+    ax2.set_ylabel('Voltaje inducido (mV)', fontsize=11)
+    ax2.set_title('Voltaje Inducido con Barras de Error\n(Fase 2: Variación de espiras)', fontsize=12, fontweight='bold')
+    ax2.grid(True, alpha=0.3, linestyle='--')
+    ax2.legend(loc='best', fontsize=9)
+
+    fig.tight_layout()
+render.save(fig, 'graficas/analisis_incertidumbres.png', ESTILO, dpi=300, bbox_inches='tight')
 
 # GRAFICA 5: Relacion V/N constante
 V_N_200 = df2['Voltaje_mV'].iloc[0] / df2['Espiras'].iloc[0]
@@ -149,21 +140,21 @@ V_N_600 = df2['Voltaje_mV'].iloc[2] / df2['Espiras'].iloc[2]
 V_N_promedio = np.mean([V_N_200, V_N_400, V_N_600])
 V_N_std = np.std([V_N_200, V_N_400, V_N_600])
 
-plt.figure(figsize=(10, 6))
-plt.bar(['200 espiras', '400 espiras', '600 espiras'], 
-        [V_N_200, V_N_400, V_N_600], 
-        color=['blue', 'green', 'red'], alpha=0.7)
-plt.axhline(y=V_N_promedio, color='black', linestyle='--', linewidth=2, 
-           label=f'Promedio: {V_N_promedio:.4f} ± {V_N_std:.4f} mV/espira')
-plt.xlabel('Configuración de bobina', fontsize=12)
-plt.ylabel('V/N (mV/espira)', fontsize=12)
-plt.title('Verificación de Proporcionalidad: V/N Constante\n(Confirma V ∝ N)', 
-          fontsize=14, fontweight='bold')
-plt.legend(loc='best', fontsize=10)
-plt.grid(True, alpha=0.3, linestyle='--', axis='y')
-plt.tight_layout()
-plt.savefig('graficas/verificacion_proporcionalidad.png', dpi=300, bbox_inches='tight')
-plt.close()
+with render.style(ESTILO):
+    fig, ax = render.subplots(figsize=(10, 6))
+    ax.bar(['200 espiras', '400 espiras', '600 espiras'], 
+            [V_N_200, V_N_400, V_N_600], 
+            color=['blue', 'green', 'red'], alpha=0.7)
+    ax.axhline(y=V_N_promedio, color='black', linestyle='--', linewidth=2, 
+               label=f'Promedio: {V_N_promedio:.4f} ± {V_N_std:.4f} mV/espira')
+    ax.set_xlabel('Configuración de bobina', fontsize=12)
+    ax.set_ylabel('V/N (mV/espira)', fontsize=12)
+    ax.set_title('Verificación de Proporcionalidad: V/N Constante\n(Confirma V ∝ N)', 
+              fontsize=14, fontweight='bold')
+    ax.legend(loc='best', fontsize=10)
+    ax.grid(True, alpha=0.3, linestyle='--', axis='y')
+    fig.tight_layout()
+render.save(fig, 'graficas/verificacion_proporcionalidad.png', ESTILO, dpi=300, bbox_inches='tight')
 
 print("="*60)
 print("Gráficas generadas exitosamente!")
@@ -174,6 +165,9 @@ print(f"  Coeficiente de determinación R²: {r2_1:.4f}")
 print(f"\nFase 2 - Voltaje vs Espiras:")
 print(f"  Pendiente: {slope2:.4f} ± {std_err2:.4f} mV/espira")
 print(f"  Coeficiente de determinación R²: {r2_2:.4f}")
+print(f"\nInferencia bayesiana (mediana e IC 95%):")
+for nombre, (med, lo, hi) in intervalos(posterior['muestras']).items():
+    print(f"  {nombre}: {med:.4g} [{lo:.4g}, {hi:.4g}]")
 print(f"\nProporcionalidad V/N:")
 print(f"  Valor promedio: {V_N_promedio:.4f} ± {V_N_std:.4f} mV/espira")
 print("="*60)
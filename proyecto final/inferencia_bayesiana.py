@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Inferencia bayesiana de B_estimado, A_bobina y L_bobina (Faraday)
+
+generar_graficas.py usa el modelo simple V = N B A v / L con valores
+supuestos para B, A y L. Aqui los tres son parametros con priors
+log-normales centrados en esos valores, mas una dispersion relativa
+adicional s (lo que el modelo simple no explica), y se muestrean a partir
+de los voltajes medidos de datos_fase1 y datos_fase2.
+
+Nota: en este modelo los datos solo fijan la combinacion B A / L; como se
+reparte entre los tres parametros lo deciden los priors. Las predicciones
+de voltaje (que dependen solo de la combinacion) si quedan bien
+determinadas.
+
+El muestreador es el de conjunto con movimiento "stretch" de Goodman y
+Weare: los caminantes se dividen en dos mitades y cada mitad se propone y
+evalua en una sola llamada vectorizada de NumPy.
+"""
+
+import numpy as np
+
+from simulacion_iman import datos_fase1, datos_fase2
+
+PARAMETROS = ('B_estimado', 'A_bobina', 'L_bobina', 'dispersion')
+
+# Prior log-normal: (mediana, desviacion de ln). B es la suposicion mas gruesa.
+priors = {
+    'B_estimado': (0.2, 1.5),                 # T
+    'A_bobina': (np.pi * 0.015 ** 2, 0.3),    # m^2
+    'L_bobina': (0.05, 0.2),                  # m
+    'dispersion': (0.05, 1.0),                # relativa
+}
+v_promedio = 2.43  # m/s, velocidad de la fase 2 (h = 30 cm)
+
+
+def datos_combinados():
+    """N, v, V (mV) y sigma (mV) de las dos fases en un solo conjunto"""
+    n1 = len(datos_fase1['Voltaje_mV'])
+    N = np.r_[np.full(n1, 200.0), datos_fase2['Espiras']]
+    v = np.r_[datos_fase1['Velocidad_ms'], np.full(len(datos_fase2['Espiras']), v_promedio)]
+    V = np.r_[datos_fase1['Voltaje_mV'], datos_fase2['Voltaje_mV']]
+    sigma = np.r_[datos_fase1['Incertidumbre_mV'], datos_fase2['Incertidumbre_mV']]
+    return N, v, V, sigma
+
+
+def voltaje_modelo(theta, N, v):
+    """V (mV) para cada fila de theta = ln[B, A, L, s], forma (caminantes, datos)"""
+    k = np.exp(theta[:, 0] + theta[:, 1] - theta[:, 2])
+    return k[:, None] * np.asarray(N) * np.asarray(v) * 1e3
+
+
+def log_posterior(theta, N, v, V, sigma):
+    """ln p(theta | datos) sin normalizar, para todos los caminantes a la vez"""
+    mu = np.log([priors[p][0] for p in PARAMETROS])
+    sd = np.array([priors[p][1] for p in PARAMETROS])
+    lp = -0.5 * np.sum(((theta - mu) / sd) ** 2, axis=1)
+    modelo = voltaje_modelo(theta, N, v)
+    var = sigma ** 2 + (np.exp(theta[:, 3:4]) * modelo) ** 2
+    return lp - 0.5 * np.sum((V - modelo) ** 2 / var + np.log(var), axis=1)
+
+
+def muestreador_conjunto(log_prob, p0, n_pasos, a=2.0, semilla=0):
+    """Cadena (pasos, caminantes, dim) del movimiento stretch vectorizado"""
+    rng = np.random.default_rng(semilla)
+    p = np.array(p0, dtype=float)
+    n, dim = p.shape
+    mitades = (np.arange(n) < n // 2, np.arange(n) >= n // 2)
+    lp = log_prob(p)
+    cadena = np.empty((n_pasos, n, dim))
+    aceptados = 0
+    for paso in range(n_pasos):
+        for activa, otra in (mitades, mitades[::-1]):
+            k = int(activa.sum())
+            # z ~ g(z) proporcional a 1/sqrt(z) en [1/a, a]
+            z = ((a - 1) * rng.random(k) + 1) ** 2 / a
+            companeros = p[otra][rng.integers(0, int(otra.sum()), k)]
+            propuesta = companeros + z[:, None] * (p[activa] - companeros)
+            lp_nuevo = log_prob(propuesta)
+            acepta = np.log(rng.random(k)) < (dim - 1) * np.log(z) + lp_nuevo - lp[activa]
+            idx = np.flatnonzero(activa)[acepta]
+            p[idx] = propuesta[acepta]
+            lp[idx] = lp_nuevo[acepta]
+            aceptados += acepta.sum()
+        cadena[paso] = p
+    return cadena, aceptados / (n_pasos * n)
+
+
+def muestrear_posterior(n_caminantes=64, n_pasos=2000, quemado=400, semilla=0):
+    """Muestras posteriores en unidades fisicas (columnas en el orden de PARAMETROS)"""
+    N, v, V, sigma = datos_combinados()
+    rng = np.random.default_rng(semilla)
+    mu = np.log([priors[p][0] for p in PARAMETROS])
+    sd = np.array([priors[p][1] for p in PARAMETROS])
+    # Arranque: prior con B ajustado para que la combinacion reproduzca los datos
+    p0 = mu + 0.1 * sd * rng.standard_normal((n_caminantes, len(PARAMETROS)))
+    k_datos = np.sum(V * N * v) / np.sum((N * v) ** 2) * 1e-3
+    p0[:, 0] += np.log(k_datos) - (mu[0] + mu[1] - mu[2])
+    cadena, aceptacion = muestreador_conjunto(lambda t: log_posterior(t, N, v, V, sigma),
+                                              p0, n_pasos, semilla=semilla)
+    muestras = np.exp(cadena[quemado:].reshape(-1, len(PARAMETROS)))
+    return {'muestras': muestras, 'aceptacion': aceptacion}
+
+
+def intervalos(muestras, nivel=0.95):
+    """Mediana e intervalo de credibilidad central de cada parametro"""
+    q = np.percentile(muestras, [50, 50 * (1 - nivel), 50 * (1 + nivel)], axis=0)
+    return {p: tuple(q[:, j]) for j, p in enumerate(PARAMETROS)}
+
+
+def prediccion_posterior(posterior, espiras, v=v_promedio, nivel=0.95):
+    """Mediana e intervalo de V (mV) para cada numero de espiras"""
+    m = posterior['muestras']
+    k = m[:, 0] * m[:, 1] / m[:, 2]
+    V = k[:, None] * np.asarray(espiras, dtype=float) * v * 1e3
+    q = np.percentile(V, [50, 50 * (1 - nivel), 50 * (1 + nivel)], axis=0)
+    return {'mediana': q[0], 'inferior': q[1], 'superior': q[2]}
+
+
+def main():
+    import time
+    t0 = time.perf_counter()
+    posterior = muestrear_posterior()
+    duracion = time.perf_counter() - t0
+    print(f"{posterior['muestras'].shape[0]} muestras en {duracion:.2f} s "
+          f"(aceptacion {posterior['aceptacion']:.2f})")
+    unidades = {'B_estimado': 'T', 'A_bobina': 'm^2', 'L_bobina': 'm', 'dispersion': ''}
+    for p, (med, lo, hi) in intervalos(posterior['muestras']).items():
+        print(f"  {p:<11} = {med:.4g} [{lo:.4g}, {hi:.4g}] {unidades[p]}  (prior {priors[p][0]:.4g})")
+    pred = prediccion_posterior(posterior, datos_fase2['Espiras'])
+    for N, med, lo, hi, medido in zip(datos_fase2['Espiras'], pred['mediana'], pred['inferior'],
+                                      pred['superior'], datos_fase2['Voltaje_mV']):
+        print(f"  N = {N}  V = {med:.2f} [{lo:.2f}, {hi:.2f}] mV  medido = {medido:.2f} mV")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Simulacion de la induccion de un iman que cae a traves de una bobina
+
+En generar_graficas.py el voltaje teorico se estima como N*B*A/dt con
+dt = L_bobina / v_promedio. Aqui el iman es un dipolo puntual que cae por
+gravedad (con arrastre cuadratico opcional) a lo largo del eje de una
+bobina de N espiras repartidas uniformemente en su longitud. El flujo por
+una espira de radio R con el dipolo a distancia axial z es
+
+    Phi(z) = mu0 m R^2 / (2 (R^2 + z^2)^(3/2))
+
+y el enlace de flujo es la suma sobre todas las espiras. La fem es
+eps(t) = -dLambda/dt = -v(t) * dLambda/dz, evaluada en forma cerrada.
+
+Las alturas de datos_fase1 y los numeros de espiras de datos_fase2 son
+dimensiones de lote: las trayectorias de todas las alturas se integran a la
+vez y cada trayectoria se evalua para todas las bobinas. Las combinaciones de
+parametros adicionales (radio, arrastre, ...) se reparten en un pool de
+procesos.
+"""
+
+import itertools
+import os
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from lab_store import load_store
+
+datos_lab = load_store(Path(__file__).resolve().parent / 'datos')
+
+datos_fase1 = datos_lab['datos_fase1']
+datos_fase2 = datos_lab['datos_fase2']
+
+mu0 = 4 * np.pi * 1e-7  # T·m/A
+g = 9.81  # m/s^2
+
+# Estimaciones de generar_graficas.py y dimensiones supuestas del iman
+B_estimado = 0.2  # T, se usa como remanencia del iman
+bobina = {'radio': 0.015, 'longitud': 0.05}
+iman = {'radio': 0.005, 'longitud': 0.01, 'densidad': 7500.0, 'Cd': 0.8}
+densidad_aire = 1.2  # kg/m^3
+
+
+def momento_dipolar(Br=B_estimado, radio=iman['radio'], longitud=iman['longitud']):
+    """m = Br V / mu0 para un iman cilindrico uniformemente magnetizado"""
+    return Br * np.pi * radio ** 2 * longitud / mu0
+
+
+def coeficiente_arrastre(radio=iman['radio'], longitud=iman['longitud'],
+                         densidad=iman['densidad'], Cd=iman['Cd']):
+    """k de dv/dt = -g - k v|v| (1/m)"""
+    area = np.pi * radio ** 2
+    masa = densidad * area * longitud
+    return 0.5 * densidad_aire * Cd * area / masa
+
+
+def trayectorias(alturas, longitud_bobina, k_arrastre=0.0, dt=1e-4, margen=0.1):
+    """z(t) y v(t) de caida libre desde cada altura sobre la entrada de la bobina
+
+    El eje z apunta hacia arriba con origen en el centro de la bobina. Se
+    integra con RK4 de paso fijo, todas las alturas a la vez, hasta que el
+    ultimo iman queda `margen` m por debajo de la bobina.
+    """
+    h = np.asarray(alturas, dtype=float)
+    z = h + longitud_bobina / 2
+    v = np.zeros_like(z)
+    z_fin = -longitud_bobina / 2 - margen
+    # Tiempo de caida sin arrastre como cota (con arrastre se alarga un poco)
+    t_max = np.sqrt(2 * (z.max() - z_fin) / g) * 1.05
+    n = int(np.ceil(t_max / dt)) + 1
+    Z = np.empty((h.size, n))
+    V = np.empty((h.size, n))
+
+    def a(v):
+        return -g - k_arrastre * v * np.abs(v)
+
+    for i in range(n):
+        Z[:, i] = z
+        V[:, i] = v
+        k1v = a(v)
+        k2v = a(v + 0.5 * dt * k1v)
+        k3v = a(v + 0.5 * dt * k2v)
+        k4v = a(v + dt * k3v)
+        z = z + dt * (v + dt / 6 * (k1v + k2v + k3v))
+        v = v + dt / 6 * (k1v + 2 * k2v + 2 * k3v + k4v)
+    return np.arange(n) * dt, Z, V
+
+
+def posiciones_espiras(n_espiras, longitud):
+    """z de cada espira, repartidas uniformemente en la longitud de la bobina"""
+    return -longitud / 2 + (np.arange(n_espiras) + 0.5) * longitud / n_espiras
+
+
+def enlace_flujo(z, n_espiras, radio, longitud, m, tam_bloque=64):
+    """Lambda(z) y dLambda/dz sumando el flujo de cada espira (z arbitrario)"""
+    z = np.asarray(z, dtype=float)
+    R2 = radio ** 2
+    Lam = np.zeros_like(z)
+    dLam = np.zeros_like(z)
+    zk = posiciones_espiras(n_espiras, longitud)
+    for i in range(0, zk.size, tam_bloque):
+        d = z[..., None] - zk[i:i + tam_bloque]
+        s = R2 + d * d
+        base = mu0 * m * R2 / (2 * s * np.sqrt(s))
+        Lam += base.sum(axis=-1)
+        dLam += (-3 * base * d / s).sum(axis=-1)
+    return Lam, dLam
+
+
+def simular(alturas, espiras, radio=bobina['radio'], longitud=bobina['longitud'],
+            Br=B_estimado, arrastre=False, dt=1e-4, alcance=10.0):
+    """fem(t) para cada (altura, N); devuelve arreglos (n_alturas, n_espiras, ...)
+
+    El flujo solo se evalua donde el iman esta a menos de `alcance` radios de
+    los extremos de la bobina; fuera de esa zona la fem es despreciable.
+    """
+    m = momento_dipolar(Br)
+    k = coeficiente_arrastre() if arrastre else 0.0
+    t, Z, V = trayectorias(alturas, longitud, k, dt)
+    cerca = np.abs(Z) < longitud / 2 + alcance * radio
+    fem = np.zeros((len(alturas), len(espiras), t.size))
+    enlace = np.zeros_like(fem)
+    for j, N in enumerate(espiras):
+        Lam, dLam = enlace_flujo(Z[cerca], N, radio, longitud, m)
+        enlace[:, j][cerca] = Lam
+        fem[:, j][cerca] = -V[cerca] * dLam
+    pico = np.max(np.abs(fem), axis=-1)
+    # Flujo integrado: area del primer lobulo (iman entrando) = Lambda maximo
+    flujo = np.sum(np.clip(fem, 0, None), axis=-1) * dt
+    v_centro = -V[np.arange(len(alturas)), np.argmin(np.abs(Z), axis=1)]
+    return {
+        't': t, 'fem': fem, 'enlace': enlace,
+        'pico_V': pico, 'flujo_Wb': flujo, 'enlace_max_Wb': enlace.max(axis=-1),
+        'v_centro': v_centro,
+    }
+
+
+def _trabajo(args):
+    """Worker del pool: un punto de la grilla, solo resumenes (sin formas de onda)"""
+    alturas, espiras, opciones = args
+    res = simular(alturas, espiras, **opciones)
+    return opciones, {k: res[k] for k in ('pico_V', 'flujo_Wb', 'enlace_max_Wb', 'v_centro')}
+
+
+def simular_grilla(alturas, espiras, n_procesos=None, **ejes):
+    """Barrido de la grilla completa: alturas x espiras x producto de `ejes`
+
+    Cada valor de `ejes` es una lista (p. ej. radio=[0.012, 0.015],
+    arrastre=[False, True]); cada combinacion es una tarea del pool y dentro
+    de ella alturas y espiras se vectorizan.
+    """
+    nombres = list(ejes)
+    tareas = [(alturas, espiras, dict(zip(nombres, valores)))
+              for valores in itertools.product(*(ejes[n] for n in nombres))]
+    n_procesos = n_procesos or min(len(tareas), os.cpu_count() or 1)
+    if n_procesos == 1:
+        return [_trabajo(t) for t in tareas]
+    with ProcessPoolExecutor(max_workers=n_procesos) as pool:
+        return list(pool.map(_trabajo, tareas))
+
+
+def estimacion_simple(espiras, v=2.43, Br=B_estimado):
+    """Estimacion de generar_graficas.py: N B A / (L / v), en V"""
+    A = np.pi * bobina['radio'] ** 2
+    return np.asarray(espiras) * Br * A / (bobina['longitud'] / v)
+
+
+def main():
+    import time
+    alturas = np.array(datos_fase1['Altura_cm']) / 100
+    espiras = datos_fase2['Espiras']
+
+    res = simular(alturas, [200], arrastre=True)
+    print("Fase 1 (N = 200): fem pico simulada vs medida")
+    for h, v, pico, medido in zip(datos_fase1['Altura_cm'], res['v_centro'], res['pico_V'][:, 0],
+                                  datos_fase1['Voltaje_mV']):
+        print(f"  h = {h:2d} cm  v = {v:.2f} m/s  pico = {pico*1e3:6.2f} mV  medido = {medido:.2f} mV")
+
+    res = simular([0.30], espiras, arrastre=True)
+    simple = estimacion_simple(espiras)
+    print("Fase 2 (h = 30 cm): simulada / estimacion simple / medida")
+    for N, pico, s, medido in zip(espiras, res['pico_V'][0], simple, datos_fase2['Voltaje_mV']):
+        print(f"  N = {N}  pico = {pico*1e3:6.2f} mV  simple = {s*1e3:6.2f} mV  medido = {medido:.2f} mV")
+
+    t0 = time.perf_counter()
+    grilla = simular_grilla(alturas, espiras,
+                            radio=[0.012, 0.015, 0.018], Br=[0.1, 0.2, 0.3], arrastre=[False, True])
+    print(f"Grilla de {len(grilla) * alturas.size * len(espiras)} casos en {time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
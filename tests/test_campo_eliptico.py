@@ -0,0 +1,65 @@
+"""Campos eliptico y de Derby-Olbert (i9/campo_eliptico.py) frente a biot_savart.campo_B"""
+import numpy as np
+import pytest
+
+from biot_savart import campo_B, espira_circular, solenoide
+from campo_eliptico import campo_cartesiano, campo_espira, campo_solenoide, campo_solenoide_espiras
+
+RADIO = 0.02
+
+
+def puntos_cilindricos(rng, rho_min, rho_max, z_max, n=100):
+    """Puntos cartesianos (n, 3) y su vector radial unitario (n, 2)"""
+    rho = rng.uniform(rho_min, rho_max, n)
+    phi = rng.uniform(0.0, 2 * np.pi, n)
+    radial = np.column_stack([np.cos(phi), np.sin(phi)])
+    return np.column_stack([rho[:, None] * radial, rng.uniform(-z_max, z_max, n)]), radial
+
+
+def test_espira_coincide_con_suma_de_segmentos():
+    puntos = np.random.default_rng(0).uniform(-0.05, 0.05, (200, 3))
+    B_num = campo_B(espira_circular(RADIO, n=4096), puntos)
+    B_eli = campo_cartesiano(campo_espira, puntos, RADIO)
+    error = np.linalg.norm(B_num - B_eli, axis=1) / np.linalg.norm(B_num, axis=1)
+    assert error.max() < 1e-5
+
+
+def test_espira_en_el_eje():
+    z = np.linspace(-0.05, 0.05, 11)
+    _, bz = campo_espira(RADIO, np.zeros_like(z), z, corriente=2.0)
+    esperado = 4e-7 * np.pi * 2.0 * RADIO**2 / (2 * (RADIO**2 + z**2) ** 1.5)
+    np.testing.assert_allclose(bz, esperado, rtol=1e-12)
+
+
+@pytest.mark.parametrize('rho_min, rho_max, tolerancia', [
+    (0.0, 0.6 * RADIO, 0.01),         # interior
+    (1.5 * RADIO, 3 * RADIO, 0.02),   # exterior
+])
+def test_solenoide_finito_coincide_con_helice(rho_min, rho_max, tolerancia):
+    """Solo B_rho y B_z: la helice tiene ademas la componente azimutal de su paso"""
+    N, L = 200, 0.09
+    puntos, radial = puntos_cilindricos(np.random.default_rng(1), rho_min, rho_max, L)
+    B_num = campo_B(solenoide(N, RADIO, L, n_por_vuelta=64), puntos)
+    B_lam = campo_cartesiano(campo_solenoide, puntos, N, RADIO, L)
+    d_rho = np.sum((B_num[:, :2] - B_lam[:, :2]) * radial, axis=1)
+    d_z = B_num[:, 2] - B_lam[:, 2]
+    error = np.hypot(d_rho, d_z) / np.linalg.norm(B_lam, axis=1)
+    assert error.max() < tolerancia
+
+
+def test_solenoide_en_el_eje():
+    N, L = 200, 0.09
+    z = np.linspace(-L, L, 21)
+    _, bz = campo_solenoide(N, RADIO, L, np.zeros_like(z), z)
+    extremos = (z + L / 2) / np.hypot(z + L / 2, RADIO) - (z - L / 2) / np.hypot(z - L / 2, RADIO)
+    np.testing.assert_allclose(bz, 4e-7 * np.pi * N / L / 2 * extremos, rtol=1e-9)
+
+
+def test_lamina_frente_a_espiras_lejos_del_devanado():
+    N, L = 200, 0.05
+    rng = np.random.default_rng(2)
+    rho = np.r_[rng.uniform(0, 0.015, 100), rng.uniform(0.025, 0.04, 100)]
+    z = rng.uniform(-0.06, 0.06, rho.size)
+    br1, bz1 = campo_solenoide(N, RADIO, L, rho, z)
+    br2, bz2 = campo_solenoide_espiras(N, RADIO, L, rho, z)
+    assert np.max(np.hypot(br1 - br2, bz1 - bz2) / np.hypot(br2, bz2)) < 1e-3
@@ -0,0 +1,88 @@
+"""Extraccion de guias (tools/extract_guides.py) con texto dentro de Form XObjects"""
+import json
+
+import pytest
+
+pytest.importorskip('pdfminer')
+from pdfminer.high_level import extract_text
+
+from extract_guides import page_fingerprints, process_directory
+
+FUENTE = b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'
+
+
+def _stream(contenido, dic=b''):
+    return b'<< ' + dic + b' /Length %d >>\nstream\n' % len(contenido) + contenido + b'\nendstream'
+
+
+def pdf_con_formularios(textos):
+    """PDF de una pagina por texto; cada pagina solo hace `/X1 Do` y el texto esta en su XObject
+
+    Cada linea del texto es una fila; las celdas separadas por '|' van en columnas.
+    """
+    n = len(textos)
+    # 1 catalogo, 2 paginas, 3 fuente, luego (pagina, contenido, formulario) por texto
+    paginas = [4 + 3 * i for i in range(n)]
+    objetos = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % p for p in paginas) + b'] /Count %d >>' % n,
+        FUENTE,
+    ]
+    for p, texto in zip(paginas, textos):
+        cuerpo = b'\n'.join(b'BT /F1 12 Tf %d %d Td (%s) Tj ET' % (72 + 150 * j, 700 - 20 * k, celda.encode())
+                            for k, linea in enumerate(texto.split('\n'))
+                            for j, celda in enumerate(linea.split('|')))
+        objetos += [
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R '
+            b'/Resources << /XObject << /X1 %d 0 R >> >> >>' % (p + 1, p + 2),
+            _stream(b'q /X1 Do Q'),
+            _stream(cuerpo, b'/Type /XObject /Subtype /Form /BBox [0 0 612 792] '
+                            b'/Resources << /Font << /F1 3 0 R >> >>'),
+        ]
+    salida = b'%PDF-1.4\n'
+    posiciones = []
+    for i, obj in enumerate(objetos, start=1):
+        posiciones.append(len(salida))
+        salida += b'%d 0 obj\n' % i + obj + b'\nendobj\n'
+    xref = len(salida)
+    salida += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objetos) + 1)
+    salida += b''.join(b'%010d 00000 n \n' % pos for pos in posiciones)
+    salida += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objetos) + 1, xref)
+    return salida
+
+
+def test_paginas_con_el_mismo_contenido_tienen_claves_distintas(tmp_path):
+    pdf = tmp_path / 'guia.pdf'
+    pdf.write_bytes(pdf_con_formularios(['Pagina uno', 'Pagina dos']))
+    claves = page_fingerprints(pdf)
+    assert len(set(claves)) == 2
+
+    # Misma pagina en otro archivo: misma clave; otro texto en el XObject: otra clave
+    (tmp_path / 'copia.pdf').write_bytes(pdf_con_formularios(['Pagina uno']))
+    (tmp_path / 'editada.pdf').write_bytes(pdf_con_formularios(['Pagina tres']))
+    assert page_fingerprints(tmp_path / 'copia.pdf')[0] == claves[0]
+    assert page_fingerprints(tmp_path / 'editada.pdf')[0] != claves[0]
+
+
+def test_texto_y_tablas_dentro_de_xobjects(tmp_path):
+    src = tmp_path / 'guias'
+    src.mkdir()
+    pdf = src / 'guia.pdf'
+    tabla = 'R [ohm]|V [V]\n100|1.5\nTabla 1. Medidas'
+    pdf.write_bytes(pdf_con_formularios(['Pagina uno', 'Pagina dos', tabla]))
+
+    stats = process_directory(src, tmp_path / 'salida', workers=1)
+    assert stats['pages'] == 3 and stats['pages_extracted'] == 3
+
+    texto = (tmp_path / 'salida' / 'guia_extracted.txt').read_text(encoding='utf-8')
+    assert texto == extract_text(str(pdf))
+    assert 'Pagina uno' in texto and 'Pagina dos' in texto
+
+    tablas = json.loads((tmp_path / 'salida' / 'guia_tables.json').read_text(encoding='utf-8'))
+    assert [t['table'] for t in tablas] == ['Tabla 1']
+    assert tablas[0]['page'] == 3
+    assert tablas[0]['columns'] == [{'name': 'R', 'unit': 'ohm'}, {'name': 'V', 'unit': 'V'}]
+    assert tablas[0]['rows'] == [['100', '1.5']]
+
+    # Segunda pasada: nada cambia, nada se vuelve a extraer
+    assert process_directory(src, tmp_path / 'salida', workers=1)['pages_extracted'] == 0
@@ -0,0 +1,26 @@
+"""Analisis de capturas de forma de onda (i7/formas_onda.py)"""
+import numpy as np
+import pytest
+
+from formas_onda import analizar_traza, generar_traza_sintetica
+
+FS = 10000.0
+
+
+@pytest.mark.parametrize('duracion', [1.0, 10.0])
+def test_armonicos_y_potencias(tmp_path, duracion):
+    # 1 s a 10 kHz es mas corto que tam_fft = 2^14: un solo segmento de 8192
+    ruta = generar_traza_sintetica(tmp_path / 'caso.bin', fs=FS, duracion=duracion)
+    r = analizar_traza(ruta, FS)
+    df = FS / 8192 if duracion == 1.0 else FS / (1 << 14)
+    assert abs(r['f0'] - 60.0) <= df
+    assert r['Vp_armonicos'][0] == pytest.approx(60.0, rel=0.02)
+    assert r['Ip_THD'] == pytest.approx(0.05, abs=0.01)
+    assert r['Qp'] == pytest.approx(60.0 * 0.2 * np.sin(0.3), rel=0.05)
+    assert r['eficiencia'] == pytest.approx(29.0 * 0.4 * np.cos(0.05) / (60.0 * 0.2 * np.cos(0.3)), rel=1e-3)
+
+
+def test_traza_demasiado_corta(tmp_path):
+    ruta = generar_traza_sintetica(tmp_path / 'corta.bin', fs=FS, duracion=0.01)
+    with pytest.raises(ValueError, match='demasiado corta'):
+        analizar_traza(ruta, FS)
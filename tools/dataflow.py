@@ -0,0 +1,139 @@
+"""Lazy, memoised dataflow graph for the lab scripts.
+
+A script declares its raw datasets as sources and every derived quantity
+(fits, physical constants, figures, summary tables) as a node computed from
+named inputs:
+
+    flow = Graph()
+    flow.source('conductor_data', data)
+    flow.define('fit_conductor', lambda d: linregress(d['I'], d['B']), 'conductor_data')
+
+    @flow.node('mu0_conductor', 'fit_conductor', 'conductor_data')
+    def mu0(fit, d):
+        return 2 * np.pi * d['s'] * fit[0]
+
+    flow.get('mu0_conductor')      # evaluates fit_conductor once, then mu0_conductor
+
+Values are computed on first request and cached. Replacing a source with
+set() drops the cached values of its transitive dependents only, so after
+editing one dataset the next get() recomputes exactly the nodes downstream of
+it. `evaluations` counts how many times each node ran, which makes "computed
+once per run" checkable.
+"""
+from collections import Counter
+import threading
+
+
+class Graph:
+    """Named sources and derived nodes with lazy evaluation and invalidation."""
+
+    def __init__(self):
+        self._functions = {}
+        self._inputs = {}
+        self._dependents = {}
+        self._values = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+        self.evaluations = Counter()
+
+    def __contains__(self, name):
+        return name in self._inputs
+
+    @property
+    def names(self) -> list:
+        return list(self._inputs)
+
+    def inputs(self, name) -> tuple:
+        return self._inputs[name]
+
+    def _register(self, name, inputs):
+        if name in self._inputs:
+            raise ValueError(f'node {name!r} is already defined')
+        for upstream in inputs:
+            if upstream not in self._inputs:
+                raise KeyError(f'{name!r} depends on unknown node {upstream!r}')
+        self._inputs[name] = tuple(inputs)
+        self._dependents[name] = []
+        self._locks[name] = threading.RLock()
+        for upstream in inputs:
+            self._dependents[upstream].append(name)
+
+    def source(self, name, value) -> None:
+        """Raw input node holding `value`."""
+        self._register(name, ())
+        self._values[name] = value
+
+    def define(self, name, function, *inputs) -> None:
+        """Derived node: function(*values of inputs), evaluated on demand."""
+        self._register(name, inputs)
+        self._functions[name] = function
+
+    def node(self, name, *inputs):
+        """Decorator form of define(); returns the function unchanged."""
+        def register(function):
+            self.define(name, function, *inputs)
+            return function
+        return register
+
+    def get(self, name):
+        """Value of a node, computing it (and any stale inputs) if needed."""
+        with self._guard:
+            if name in self._values:
+                return self._values[name]
+            lock = self._locks[name]
+        # One lock per node: concurrent callers of the same node wait for a
+        # single evaluation, different nodes evaluate in parallel.
+        with lock:
+            if name in self._values:
+                return self._values[name]
+            args = [self.get(upstream) for upstream in self._inputs[name]]
+            value = self._functions[name](*args)
+            with self._guard:
+                self._values[name] = value
+                self.evaluations[name] += 1
+            return value
+
+    def set(self, name, value) -> list:
+        """Replace a source value; returns the dependents that were invalidated."""
+        if name in self._functions:
+            raise ValueError(f'{name!r} is a derived node, not a source')
+        with self._guard:
+            self._values[name] = value
+        return self.invalidate(name, include_self=False)
+
+    def invalidate(self, name, include_self=True) -> list:
+        """Drop cached values of `name` and everything downstream of it."""
+        stale = self.downstream(name)
+        if include_self and name in self._functions:
+            stale.insert(0, name)
+        with self._guard:
+            for node in stale:
+                self._values.pop(node, None)
+        return stale
+
+    def downstream(self, name) -> list:
+        """Transitive dependents of `name` in evaluation order."""
+        seen, order = set(), []
+
+        def visit(node):
+            for dependent in self._dependents[node]:
+                if dependent not in seen:
+                    seen.add(dependent)
+                    visit(dependent)
+                    order.append(dependent)
+        visit(name)
+        return order[::-1]
+
+    def upstream(self, name) -> set:
+        """Every node `name` depends on, directly or not."""
+        found = set()
+        pending = list(self._inputs[name])
+        while pending:
+            node = pending.pop()
+            if node not in found:
+                found.add(node)
+                pending.extend(self._inputs[node])
+        return found
+
+    def is_cached(self, name) -> bool:
+        return name in self._values
@@ -0,0 +1,309 @@
+"""Batch text and table extraction for the lab guide PDFs.
+
+Every page is fingerprinted by hashing its content streams and the resources
+they use (fonts, ToUnicode maps, Form XObjects and their own resources,
+recursively), and extraction results are cached per page under that key. Re-running after editing a guide
+only re-extracts the pages whose content actually changed; untouched files
+are skipped entirely through a per-file hash manifest. Pages that need work
+are processed in a process pool.
+
+Besides plain text (same as pdfminer's extract_text, including text drawn
+inside Form XObjects), each "Tabla N" caption
+is paired with the text lines laid out right above it and turned into a
+column schema (header cells, units in brackets, row labels).
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import re
+import sys
+
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LAParams, LTContainer, LTFigure, LTText, LTTextBox, LTTextLine
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+from pdfminer.psparser import PSLiteral
+
+CACHE_VERSION = 2
+CAPTION_RE = re.compile(r'^\s*(Tabla\s+(\d+))\s*[.:]?\s*(.*)$', re.IGNORECASE)
+UNIT_RE = re.compile(r'^(.*?)\s*\[([^\]]+)\]\s*$')
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_object(digest, obj, seen: dict) -> None:
+    """Feed a PDF object into `digest`, following references recursively.
+
+    Object numbers are not hashed, so identical pages from different files
+    share a key; a reference already on the path is hashed by the order in
+    which it was first reached, which keeps cycles (e.g. /Parent) finite.
+    """
+    if isinstance(obj, PDFObjRef):
+        if obj.objid in seen:
+            digest.update(f'<ref {seen[obj.objid]}>'.encode())
+            return
+        seen[obj.objid] = len(seen)
+        obj = obj.resolve()
+    if isinstance(obj, dict):
+        digest.update(b'<<')
+        for name in sorted(obj, key=str):
+            digest.update(f'/{name}'.encode())
+            _hash_object(digest, obj[name], seen)
+        digest.update(b'>>')
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b'[')
+        for item in obj:
+            _hash_object(digest, item, seen)
+        digest.update(b']')
+    elif isinstance(obj, PDFStream):
+        _hash_object(digest, obj.attrs, seen)
+        data = obj.get_data()
+        digest.update(f'stream {len(data)}:'.encode())
+        digest.update(data)
+    elif isinstance(obj, PSLiteral):
+        digest.update(f'/{obj.name}'.encode())
+    elif isinstance(obj, bytes):
+        digest.update(f'({len(obj)}:'.encode())
+        digest.update(obj)
+    else:
+        digest.update(repr(obj).encode())
+
+
+def page_fingerprints(path: Path) -> list:
+    """One hash per page from its media box, content streams and resources."""
+    keys = []
+    with open(path, 'rb') as fh:
+        document = PDFDocument(PDFParser(fh))
+        for page in PDFPage.create_pages(document):
+            digest = hashlib.sha256(f'v{CACHE_VERSION}:{page.mediabox}'.encode())
+            contents = page.contents if isinstance(page.contents, list) else [page.contents]
+            for stream in contents:
+                stream = resolve1(stream)
+                if stream is not None:
+                    digest.update(stream.get_data())
+            _hash_object(digest, page.resources, {})
+            keys.append(digest.hexdigest())
+    return keys
+
+
+def _layout_text(layout) -> str:
+    """Page text in the same order and form as pdfminer's TextConverter."""
+    parts = []
+
+    def render(item):
+        if isinstance(item, LTContainer):
+            for child in item:
+                render(child)
+        elif isinstance(item, LTText):
+            parts.append(item.get_text())
+        if isinstance(item, LTTextBox):
+            parts.append('\n')
+
+    render(layout)
+    return ''.join(parts) + '\f'
+
+
+def _text_lines(layout) -> list:
+    """(x0, y0, x1, y1, text) for every text line on a page, top to bottom.
+
+    Characters inside Form XObjects (LTFigure) are left ungrouped by the
+    default layout analysis, so figures are analysed here with all_texts to
+    turn them into lines. This regroups the figure in place: take the page
+    text before calling it.
+    """
+    lines = []
+
+    def walk(obj):
+        if isinstance(obj, LTTextLine):
+            text = obj.get_text().strip()
+            if text:
+                lines.append((obj.x0, obj.y0, obj.x1, obj.y1, ' '.join(text.split())))
+        elif hasattr(obj, '__iter__'):
+            for child in obj:
+                walk(child)
+
+    figure_params = LAParams(all_texts=True)
+    for obj in layout:
+        if isinstance(obj, LTFigure):
+            obj.analyze(figure_params)
+    walk(layout)
+    lines.sort(key=lambda ln: (-ln[3], ln[0]))
+    return lines
+
+
+def _group_rows(lines: list, tolerance: float) -> list:
+    """Cluster lines into rows by vertical centre, each row sorted by x."""
+    rows = []
+    for line in sorted(lines, key=lambda ln: -(ln[1] + ln[3]) / 2):
+        centre = (line[1] + line[3]) / 2
+        if rows and abs(rows[-1][0] - centre) <= tolerance:
+            rows[-1][1].append(line)
+        else:
+            rows.append([centre, [line]])
+    return [sorted(cells, key=lambda ln: ln[0]) for _, cells in rows]
+
+
+def _column(header: list, cell) -> int:
+    """Index of the header cell whose horizontal centre is closest."""
+    centre = (cell[0] + cell[2]) / 2
+    return min(range(len(header)), key=lambda j: abs((header[j][0] + header[j][2]) / 2 - centre))
+
+
+def parse_tables(lines: list) -> list:
+    """Column schemas for every "Tabla N" caption on a page.
+
+    The table body is the block of lines right above the caption; it ends at
+    the previous caption or at a vertical gap wider than three line heights.
+    """
+    if not lines:
+        return []
+    heights = sorted(ln[3] - ln[1] for ln in lines)
+    line_height = heights[len(heights) // 2] or 10.0
+    tables = []
+    top_limit = float('inf')
+    for line in sorted(lines, key=lambda ln: -ln[3]):
+        match = CAPTION_RE.match(line[4])
+        if not match:
+            continue
+        caption_top = line[3]
+        above = [ln for ln in lines if caption_top <= ln[1] < top_limit and not CAPTION_RE.match(ln[4])]
+        rows = _group_rows(above, line_height / 2)
+        rows.reverse()  # closest to the caption first
+        body = []
+        previous = caption_top
+        for row in rows:
+            bottom = min(c[1] for c in row)
+            if bottom - previous > 3 * line_height:
+                break
+            body.append(row)
+            previous = max(c[3] for c in row)
+        body.reverse()
+        top_limit = line[1]
+
+        columns = []
+        cells = []
+        if body:
+            header = body[0]
+            for cell in header:
+                unit = UNIT_RE.match(cell[4])
+                columns.append({'name': unit.group(1) if unit else cell[4],
+                                'unit': unit.group(2) if unit else None})
+            for row in body[1:]:
+                values = [''] * len(header)
+                for cell in row:
+                    j = _column(header, cell)
+                    values[j] = (values[j] + ' ' + cell[4]).strip()
+                cells.append(values)
+        tables.append({
+            'table': match.group(1),
+            'number': int(match.group(2)),
+            'caption': match.group(3).strip(),
+            'columns': columns,
+            'rows': cells,
+        })
+    tables.sort(key=lambda t: t['number'])
+    return tables
+
+
+def extract_page(task: tuple) -> tuple:
+    """Worker: layout analysis of a single page (runs in the pool)."""
+    path, index, key = task
+    layout = next(iter(extract_pages(path, page_numbers=[index], laparams=LAParams())), None)
+    if layout is None:
+        return key, {'text': '', 'tables': []}
+    text = _layout_text(layout)
+    return key, {'text': text, 'tables': parse_tables(_text_lines(layout))}
+
+
+def _load_json(path: Path, default):
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return default
+
+
+def process_directory(src: Path, out: Path, workers=None, recursive=False) -> dict:
+    """Extract every PDF under `src` into `out`, reusing cached pages."""
+    cache_dir = out / '.page_cache'
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = cache_dir / 'manifest.json'
+    manifest = _load_json(manifest_path, {})
+    pdfs = sorted(src.rglob('*.pdf') if recursive else src.glob('*.pdf'))
+    stats = {'files': len(pdfs), 'files_skipped': 0, 'pages': 0, 'pages_extracted': 0}
+
+    plans = []
+    tasks = []
+    queued = set()
+    for pdf in pdfs:
+        digest = file_hash(pdf)
+        entry = manifest.get(str(pdf))
+        if entry and entry['hash'] == digest and all((cache_dir / f'{k}.json').exists() for k in entry['pages']):
+            keys = entry['pages']
+            stats['files_skipped'] += 1
+        else:
+            keys = page_fingerprints(pdf)
+            manifest[str(pdf)] = {'hash': digest, 'pages': keys}
+        stats['pages'] += len(keys)
+        plans.append((pdf, keys))
+        for index, key in enumerate(keys):
+            if key not in queued and not (cache_dir / f'{key}.json').exists():
+                tasks.append((str(pdf), index, key))
+            queued.add(key)
+
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for key, result in pool.map(extract_page, tasks, chunksize=4):
+                (cache_dir / f'{key}.json').write_text(json.dumps(result, ensure_ascii=False), encoding='utf-8')
+        stats['pages_extracted'] = len(tasks)
+
+    for pdf, keys in plans:
+        pages = [_load_json(cache_dir / f'{k}.json', {'text': '', 'tables': []}) for k in keys]
+        relative = pdf.relative_to(src).with_suffix('')
+        target = out / relative.parent
+        target.mkdir(parents=True, exist_ok=True)
+        text = ''.join(p['text'] for p in pages)
+        (target / f'{relative.name}_extracted.txt').write_text(text, encoding='utf-8')
+        tables = [dict(t, page=i + 1) for i, p in enumerate(pages) for t in p['tables']]
+        (target / f'{relative.name}_tables.json').write_text(
+            json.dumps(tables, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Extract text and tables from lab guide PDFs.')
+    parser.add_argument('src', nargs='?', default='.', help='directory with the guide PDFs')
+    parser.add_argument('--out', default=None, help='output directory (default: same as src)')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size')
+    parser.add_argument('--recursive', action='store_true', help='also look in subdirectories')
+    args = parser.parse_args()
+
+    src = Path(args.src)
+    if not src.is_dir():
+        sys.stderr.write(f'ERROR: directory not found: {src}\n')
+        return 1
+
+    try:
+        stats = process_directory(src, Path(args.out) if args.out else src, args.workers, args.recursive)
+    except Exception as exc:
+        sys.stderr.write(f'ERROR extracting guides: {exc}\n')
+        return 2
+
+    print(f"{stats['files']} PDFs, {stats['pages']} pages "
+          f"({stats['pages_extracted']} extracted, {stats['files_skipped']} files unchanged)")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,143 @@
+"""Batch processing of many student groups that share one lab schema.
+
+Each group's data is a lab store (see lab_store.py) in its own directory:
+
+    <root>/<group>/esquema.json
+    <root>/<group>/<dataset>/<column>.npy
+
+load_groups() opens them all lazily, stack() turns one column into a
+(groups, points) array padded with NaN, and linregress_batch() fits every
+group at once, so the fitting cost of 100 groups is a handful of NumPy
+reductions. Figures, the slow part, are drawn by render_pool() in worker
+processes or threads; flag_outliers() marks groups whose result is far
+from the rest.
+
+The lab-specific side (which fits, which figures) lives in each lab's
+analisis_lote.py.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import os
+import shutil
+
+import numpy as np
+
+from lab_store import load_store, save_dataset
+from render import run_threads
+
+
+def load_groups(root) -> dict:
+    """{group name: {dataset: Dataset}} for every store directory under root, sorted by name."""
+    root = Path(root)
+    return {d.name: load_store(d) for d in sorted(root.iterdir()) if (d / 'esquema.json').exists()}
+
+
+def stack(groups: dict, dataset: str, key: str) -> np.ndarray:
+    """Column `key` of `dataset` for every group, shape (groups, points), padded with NaN.
+
+    Scalars give shape (groups,); None entries inside lists become NaN.
+    """
+    values = [groups[g][dataset][key] for g in groups]
+    if all(np.ndim(v) == 0 for v in values):
+        return np.array([np.nan if v is None else v for v in values], dtype=float)
+    rows = [np.array([np.nan if x is None else x for x in np.ravel(v)], dtype=float) for v in values]
+    out = np.full((len(rows), max(r.size for r in rows)), np.nan)
+    for i, r in enumerate(rows):
+        out[i, :r.size] = r
+    return out
+
+
+def linregress_batch(x, y) -> dict:
+    """Least-squares line per row of (groups, points) arrays, ignoring NaN pairs.
+
+    Returns arrays of shape (groups,) with the same quantities as
+    scipy.stats.linregress: slope, intercept, r2, stderr (of the slope),
+    plus n. Rows with fewer than three valid points get NaN stderr, rows
+    with fewer than two get NaN everywhere.
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    ok = np.isfinite(x) & np.isfinite(y)
+    n = ok.sum(axis=-1)
+    xz, yz = np.where(ok, x, 0.0), np.where(ok, y, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        xm = xz.sum(axis=-1) / n
+        ym = yz.sum(axis=-1) / n
+        dx = np.where(ok, x - xm[..., None], 0.0)
+        dy = np.where(ok, y - ym[..., None], 0.0)
+        sxx = (dx * dx).sum(axis=-1)
+        syy = (dy * dy).sum(axis=-1)
+        sxy = (dx * dy).sum(axis=-1)
+        slope = sxy / sxx
+        r2 = np.clip(sxy * sxy / (sxx * syy), 0.0, 1.0)
+        stderr = np.sqrt((1 - r2) * syy / sxx / (n - 2))
+    stderr = np.where(n > 2, stderr, np.nan)
+    return {'slope': slope, 'intercept': ym - slope * xm, 'r2': r2, 'stderr': stderr, 'n': n}
+
+
+def flag_outliers(values, threshold: float = 3.5) -> np.ndarray:
+    """Boolean mask of outliers along the last axis (modified z-score, median/MAD).
+
+    Iglewicz and Hoaglin's rule: |0.6745 (x - median) / MAD| > threshold.
+    NaN results are flagged as well, since they mean the fit failed.
+    """
+    values = np.asarray(values, dtype=float)
+    median = np.nanmedian(values, axis=-1, keepdims=True)
+    mad = np.nanmedian(np.abs(values - median), axis=-1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = 0.6745 * (values - median) / mad
+    z = np.where(mad > 0, z, 0.0)
+    return ~np.isfinite(values) | (np.abs(z) > threshold)
+
+
+def render_pool(function, jobs, processes: int = None, threads: bool = False) -> list:
+    """function(*job) for every job, in worker processes when there is more than one CPU.
+
+    `function` must be importable at module level; datasets from lab_store
+    pickle as paths, so jobs stay small. With threads=True the jobs run in a
+    thread pool of `processes` threads instead (render.run_threads): nothing
+    is pickled and the workers share the datasets already opened, which
+    requires a pyplot-free `function` (render.py) and suits medium batches.
+    """
+    if threads:
+        return run_threads(function, jobs, processes)
+    jobs = list(jobs)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(jobs) < 2:
+        return [function(*job) for job in jobs]
+    chunk = max(1, len(jobs) // (4 * processes))
+    with ProcessPoolExecutor(processes) as pool:
+        return list(pool.map(function, *zip(*jobs), chunksize=chunk))
+
+
+def synthesize_groups(source, root, n_groups: int, columns: dict, noise: float = 0.02,
+                      spread: float = 0.03, n_outliers: int = 2, seed: int = 0) -> list:
+    """Write `n_groups` perturbed copies of the lab store at `source` under `root`.
+
+    `columns` maps dataset -> measured columns to perturb. Each group gets a
+    systematic factor (1 + spread * N(0, 1)) and point noise of relative
+    size `noise`; `n_outliers` groups get a 30 % systematic error. Used to
+    exercise the batch mode without real submissions.
+    """
+    rng = np.random.default_rng(seed)
+    root = Path(root)
+    base = load_store(source)
+    names = [f'grupo_{i + 1:03d}' for i in range(n_groups)]
+    bad = set(rng.choice(n_groups, size=min(n_outliers, n_groups), replace=False).tolist())
+    for i, name in enumerate(names):
+        directory = root / name
+        if directory.exists():
+            shutil.rmtree(directory)
+        factor = 1 + spread * rng.standard_normal() + (0.3 if i in bad else 0.0)
+        for dataset_name, dataset in base.items():
+            data = {}
+            for key in dataset:
+                value = dataset[key]
+                if key in columns.get(dataset_name, ()):
+                    array = np.array(value, dtype=float)
+                    array = array * factor * (1 + noise * rng.standard_normal(array.shape))
+                    value = array.tolist() if isinstance(value, list) else array
+                elif isinstance(value, np.ndarray) and value.dtype != object:
+                    value = np.array(value)
+                data[key] = value
+            save_dataset(directory, dataset_name, data, dataset.units, dataset.description)
+    return names
@@ -0,0 +1,382 @@
+"""Asyncio scheduler for automated source/meter sweeps (i2 I-V, i9 B-I).
+
+One programmable supply is stepped through a list of setpoints while any
+number of meters are read at every point. All instruments talk a line-based
+SCPI-like protocol over TCP (LAN instruments or serial-to-TCP bridges), each
+on its own connection, so a slow or unresponsive meter never holds up the
+others: every command and query has its own timeout and retry budget, and
+the reads of one point are issued concurrently.
+
+Rows are appended to a CSV as soon as a point completes and are also pushed
+to an asyncio queue for an analysis consumer (e.g. the incremental
+regression of i9/adquisicion_en_vivo.py).
+
+Drivers are pluggable: subclass Instrument and register it with
+@register_driver('name'). A simulated bench (one supply plus meters sharing
+the same physical state, with first-order settling and optional dropped
+replies) is included for testing:
+
+    python tools/instrument_sweep.py --simulate --points 0.2:2.0:10 --out sweep.csv
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import csv
+import math
+import random
+import sys
+import time
+
+DRIVERS = {}
+
+
+def register_driver(name: str):
+    """Class decorator adding a driver to DRIVERS under `name`."""
+    def decorator(cls):
+        DRIVERS[name] = cls
+        return cls
+    return decorator
+
+
+class InstrumentError(RuntimeError):
+    """An instrument failed to answer after all retries."""
+
+
+class Instrument:
+    """Line-based TCP instrument with per-query timeout and retries."""
+
+    def __init__(self, name: str, host: str, port: int, timeout: float = 1.0, retries: int = 3):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout)
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await asyncio.wait_for(self._writer.wait_closed(), self.timeout)
+            except (OSError, asyncio.TimeoutError):
+                pass
+            self._writer = None
+
+    async def _reconnect(self) -> None:
+        await self.close()
+        await self.connect()
+
+    async def write(self, command: str) -> None:
+        """Send a command that has no reply, with the same timeout and retries as query().
+
+        Only idempotent commands (setpoints, output state) should be sent this
+        way: after a timeout it is unknown whether the instrument got it.
+        """
+        await self._with_retries(command, reply=False)
+
+    async def query(self, command: str) -> str:
+        """Send a query and wait for one reply line, retrying on timeout.
+
+        After a timeout the connection is reopened so a late reply can not be
+        mistaken for the answer to the next query.
+        """
+        return await self._with_retries(command, reply=True)
+
+    async def _exchange(self, command: str, reply: bool):
+        async with self._lock:
+            if self._writer is None:  # a previous reconnect failed
+                await self.connect()
+            self._writer.write((command + '\n').encode('ascii'))
+            await asyncio.wait_for(self._writer.drain(), self.timeout)
+            if not reply:
+                return None
+            line = await asyncio.wait_for(self._reader.readline(), self.timeout)
+        if not line:
+            raise ConnectionError('connection closed')
+        return line.decode('ascii').strip()
+
+    async def _with_retries(self, command: str, reply: bool):
+        delay = 0.01
+        for attempt in range(self.retries + 1):
+            try:
+                return await self._exchange(command, reply)
+            except (asyncio.TimeoutError, ConnectionError, OSError):
+                if attempt == self.retries:
+                    break
+                await asyncio.sleep(delay)
+                delay *= 2
+                try:
+                    await self._reconnect()
+                except (asyncio.TimeoutError, OSError):
+                    pass
+        what = 'no reply to' if reply else 'could not send'
+        raise InstrumentError(f'{self.name}: {what} {command!r} after {self.retries + 1} attempts')
+
+
+@register_driver('supply')
+class Supply(Instrument):
+    """Programmable supply in current (i9) or voltage (i2) mode."""
+
+    def __init__(self, *args, mode: str = 'CURR', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mode = mode
+
+    async def set(self, value: float) -> None:
+        await self.write(f'SOUR:{self.mode} {value:.6g}')
+
+    async def output(self, on: bool) -> None:
+        await self.write(f'OUTP {"ON" if on else "OFF"}')
+
+
+@register_driver('meter')
+class Meter(Instrument):
+    """Meter returning one number per MEAS? query."""
+
+    async def read(self) -> float:
+        return float(await self.query('MEAS?'))
+
+
+async def read_meters(meters: list) -> dict:
+    """Read every meter concurrently; a failed meter gives NaN."""
+    results = await asyncio.gather(*(m.read() for m in meters), return_exceptions=True)
+    values = {}
+    for meter, value in zip(meters, results):
+        if isinstance(value, Exception):
+            sys.stderr.write(f'WARNING: {value}\n')
+            value = math.nan
+        values[meter.name] = value
+    return values
+
+
+async def wait_settled(meters: list, settle: float, tolerance: float = None, max_wait: float = 5.0) -> dict:
+    """Wait the fixed settling time, then (optionally) until readings stop changing.
+
+    While waiting for stability a meter that gives no reading (NaN after
+    all its retries) raises InstrumentError instead of being waited on.
+    """
+    await asyncio.sleep(settle)
+    values = await read_meters(meters)
+    if tolerance is None:
+        return values
+    deadline = time.monotonic() + max_wait
+    while True:
+        failed = [k for k, v in values.items() if math.isnan(v)]
+        if failed:
+            raise InstrumentError(f'no reading from {", ".join(failed)} while waiting for the output to settle')
+        if time.monotonic() >= deadline:
+            return values
+        await asyncio.sleep(settle / 4)
+        new = await read_meters(meters)
+        stable = all(abs(new[k] - values[k]) <= tolerance * max(abs(new[k]), 1e-12) for k in new)
+        values = new
+        if stable:
+            return values
+
+
+async def _switch_off(supply: Supply):
+    """Setpoint 0 and output off, each attempted even if the other fails; returns the first error."""
+    error = None
+    for step in (lambda: supply.set(0.0), lambda: supply.output(False)):
+        try:
+            await step()
+        except Exception as exc:  # best effort: the bench must not stay energized
+            error = error or exc
+    return error
+
+
+async def run_sweep(supply: Supply, meters: list, setpoints, settle: float = 0.05,
+                    tolerance: float = None, out: Path = None, results: asyncio.Queue = None) -> list:
+    """Step the supply through `setpoints`, reading all meters at each point.
+
+    Every finished row is appended to `out` (CSV, flushed per row) and put on
+    `results`; a final None marks the end of the sweep. The supply is set to
+    0 and switched off however the sweep ends (errors, timeouts,
+    cancellation); a failure there is raised only if the sweep itself
+    succeeded.
+    """
+    rows = []
+    fields = ['setpoint', 't_s'] + [m.name for m in meters]
+    handle = open(out, 'w', newline='', encoding='utf-8') if out else None
+    writer = csv.DictWriter(handle, fieldnames=fields) if handle else None
+    if writer:
+        writer.writeheader()
+    t0 = time.monotonic()
+    try:
+        await supply.output(True)
+        for value in setpoints:
+            await supply.set(value)
+            readings = await wait_settled(meters, settle, tolerance)
+            row = {'setpoint': value, 't_s': round(time.monotonic() - t0, 4), **readings}
+            rows.append(row)
+            if writer:
+                writer.writerow(row)
+                handle.flush()
+            if results is not None:
+                await results.put(row)
+    finally:
+        shutdown_error = await _switch_off(supply)
+        if handle:
+            handle.close()
+        if results is not None:
+            await results.put(None)
+    if shutdown_error is not None:
+        raise shutdown_error
+    return rows
+
+
+# --- Simulated bench ---------------------------------------------------------
+
+class SimulatedBench:
+    """Shared physical state behind the simulated supply and meters.
+
+    The supply output relaxes towards the setpoint with time constant `tau`;
+    each meter reports a linear response of it plus noise. `drop_rate` is the
+    probability that a meter silently ignores a query (exercises retries).
+    """
+
+    def __init__(self, tau: float = 0.01, drop_rate: float = 0.0, seed: int = 0):
+        self.tau = tau
+        self.drop_rate = drop_rate
+        self.rng = random.Random(seed)
+        self.setpoint = 0.0
+        self.start = 0.0
+        self.t_set = time.monotonic()
+        self.enabled = False
+
+    def output(self) -> float:
+        if not self.enabled:
+            return 0.0
+        elapsed = time.monotonic() - self.t_set
+        return self.setpoint + (self.start - self.setpoint) * math.exp(-elapsed / self.tau)
+
+    def set(self, value: float) -> None:
+        self.start = self.output()
+        self.setpoint = value
+        self.t_set = time.monotonic()
+
+
+async def serve_simulated(bench: SimulatedBench, role: str, gain: float = 1.0,
+                          noise: float = 0.0, latency: float = 0.002, host: str = '127.0.0.1'):
+    """Start one simulated instrument; returns (server, port)."""
+    async def handle(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode('ascii').strip().upper()
+                reply = None
+                if command == '*IDN?':
+                    reply = f'SIMULATED,{role.upper()},0,1.0'
+                elif command.startswith('SOUR:') and role == 'supply':
+                    bench.set(float(command.split()[1]))
+                elif command.startswith('OUTP') and role == 'supply':
+                    bench.enabled = command.endswith('ON')
+                    bench.set(bench.setpoint)
+                elif command == 'MEAS?':
+                    if bench.rng.random() < bench.drop_rate:
+                        continue
+                    await asyncio.sleep(latency)
+                    value = gain * bench.output() * (1 + noise * bench.rng.gauss(0, 1))
+                    reply = f'{value:.6g}'
+                if reply is not None:
+                    writer.write((reply + '\n').encode('ascii'))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def parse_points(spec: str) -> list:
+    """'start:stop:n' (inclusive, like linspace) or a comma-separated list."""
+    if ':' in spec:
+        start, stop, n = spec.split(':')
+        n = int(n)
+        step = (float(stop) - float(start)) / max(n - 1, 1)
+        return [round(float(start) + k * step, 10) for k in range(n)]
+    return [float(x) for x in spec.split(',') if x]
+
+
+async def _consume(results: asyncio.Queue) -> None:
+    """Default analysis consumer: print each row as it arrives."""
+    while True:
+        row = await results.get()
+        if row is None:
+            return
+        readings = '  '.join(f'{k}={v:.5g}' for k, v in row.items() if k not in ('setpoint', 't_s'))
+        print(f"  {row['setpoint']:>8.4g}  ({row['t_s']:.2f} s)  {readings}")
+
+
+async def _main(args) -> int:
+    servers = []
+    if args.simulate:
+        bench = SimulatedBench(tau=args.settle / 5, drop_rate=args.drop_rate)
+        server, port = await serve_simulated(bench, 'supply')
+        servers.append(server)
+        supply = Supply('supply', '127.0.0.1', port, args.timeout, args.retries, mode=args.mode)
+        meters = []
+        # i9: B = mu0 n I (mT) and a shunt ammeter; i2: voltmeter and ammeter across 60 ohm
+        for name, gain in (('B_mT', 6.28), ('I_A', 1.0)) if args.mode == 'CURR' else (('V_V', 1.0), ('I_A', 1 / 60)):
+            server, port = await serve_simulated(bench, 'meter', gain, noise=0.002)
+            servers.append(server)
+            meters.append(Meter(name, '127.0.0.1', port, args.timeout, args.retries))
+    else:
+        host, port = args.supply.rsplit(':', 1)
+        supply = Supply('supply', host, int(port), args.timeout, args.retries, mode=args.mode)
+        meters = []
+        for spec in args.meter:
+            name, address = spec.split('=', 1)
+            host, port = address.rsplit(':', 1)
+            meters.append(DRIVERS[args.meter_driver](name, host, int(port), args.timeout, args.retries))
+
+    try:
+        await asyncio.gather(supply.connect(), *(m.connect() for m in meters))
+        results = asyncio.Queue()
+        start = time.monotonic()
+        consumer = asyncio.create_task(_consume(results))
+        rows = await run_sweep(supply, meters, parse_points(args.points), args.settle,
+                               args.tolerance, Path(args.out) if args.out else None, results)
+        await consumer
+        print(f'{len(rows)} points in {time.monotonic() - start:.2f} s')
+    except (InstrumentError, OSError) as exc:
+        sys.stderr.write(f'ERROR: {exc}\n')
+        return 2
+    finally:
+        await asyncio.gather(supply.close(), *(m.close() for m in meters))
+        for server in servers:
+            server.close()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Automated supply/meter sweep.')
+    parser.add_argument('--points', default='0.2:2.0:10', help="'start:stop:n' or comma-separated setpoints")
+    parser.add_argument('--mode', choices=('CURR', 'VOLT'), default='CURR', help='supply mode (i9: CURR, i2: VOLT)')
+    parser.add_argument('--settle', type=float, default=0.05, help='settling time per point [s]')
+    parser.add_argument('--tolerance', type=float, default=None, help='relative stability required after settling')
+    parser.add_argument('--timeout', type=float, default=0.5, help='per-query timeout [s]')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--out', default=None, help='CSV file for the results')
+    parser.add_argument('--simulate', action='store_true', help='use the simulated bench')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='simulated dropped replies')
+    parser.add_argument('--supply', default=None, help='host:port of the supply')
+    parser.add_argument('--meter', action='append', default=[], help='name=host:port (repeatable)')
+    parser.add_argument('--meter-driver', default='meter', choices=sorted(DRIVERS))
+    args = parser.parse_args()
+    if not args.simulate and (not args.supply or not args.meter):
+        parser.error('give --supply and at least one --meter, or use --simulate')
+    return asyncio.run(_main(args))
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
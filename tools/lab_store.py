@@ -0,0 +1,159 @@
+"""On-disk store for the lab datasets with lazy memory-mapped columns.
+
+Each lab keeps its data in a `datos/` directory next to its scripts:
+
+    datos/esquema.json              catalog: datasets, columns, units, metadata
+    datos/<dataset>/<column>.npy    one plain .npy file per numeric column
+
+Numeric columns are opened with np.load(mmap_mode='r') the first time they
+are accessed, so opening a store costs one small JSON read regardless of how
+large the columns are, and processes that map the same file share the pages
+through the OS cache. Non-numeric values (labels, scalars, lists with None)
+live in the catalog as metadata and come back as the original Python types.
+
+Datasets behave like the read-only dicts the scripts used to define inline
+(`conductor_data['I']`, `datos_fase1['Altura_cm']`, `dict(ds, I=...)`), and
+pickle as a reference to their directory so a process pool reopens them
+instead of copying the arrays.
+
+The modules in tools/ are installed once with `pip install -e .` from the
+repository root (pyproject.toml); the lab scripts then import them directly
+(`from lab_store import load_store`).
+
+    python tools/lab_store.py i9/datos            # list datasets and units
+"""
+from collections.abc import Mapping
+from pathlib import Path
+import json
+import sys
+
+import numpy as np
+
+SCHEMA = 'esquema.json'
+FORMAT_VERSION = 1
+
+
+class Dataset(Mapping):
+    """Read-only mapping of one dataset; numeric columns are memory-mapped on access."""
+
+    def __init__(self, root: Path, name: str, entry: dict):
+        self._root = Path(root)
+        self.name = name
+        self.description = entry.get('descripcion', '')
+        self._columns = entry.get('columnas', {})
+        self._meta = entry.get('meta', {})
+        self._loaded = {}
+        self._order = entry.get('orden', list(self._columns) + list(self._meta))
+
+    def __getitem__(self, key):
+        if key in self._columns:
+            if key not in self._loaded:
+                spec = self._columns[key]
+                array = np.load(self._root / spec['archivo'], mmap_mode='r')
+                self._loaded[key] = array.tolist() if spec.get('tipo') == 'lista' else array
+            return self._loaded[key]
+        if key in self._meta:
+            spec = self._meta[key]
+            value = spec['valor']
+            if spec.get('tipo') == 'objeto':
+                return np.array(value, dtype=object)
+            return value
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __repr__(self):
+        return f'Dataset({self.name!r}, columns={list(self._columns)})'
+
+    def __reduce__(self):
+        return (_open_dataset, (str(self._root), self.name))
+
+    def unit(self, key):
+        """Unit string of a column or metadata value (None if dimensionless/unknown)."""
+        spec = self._columns.get(key) or self._meta.get(key) or {}
+        return spec.get('unidad')
+
+    @property
+    def units(self) -> dict:
+        return {k: self.unit(k) for k in self._order}
+
+
+def _open_dataset(root: str, name: str) -> Dataset:
+    return load_store(root)[name]
+
+
+def load_store(root) -> dict:
+    """{name: Dataset} for a lab's `datos/` directory (columns are not read yet)."""
+    root = Path(root)
+    catalog = json.loads((root / SCHEMA).read_text(encoding='utf-8'))
+    return {name: Dataset(root, name, entry) for name, entry in catalog['datasets'].items()}
+
+
+def _is_numeric(value) -> bool:
+    array = np.asarray(value) if isinstance(value, (list, tuple, np.ndarray)) else None
+    return array is not None and array.dtype.kind in 'biuf' and array.size > 0
+
+
+def save_dataset(root, name: str, data: Mapping, units: dict = None, description: str = '') -> None:
+    """Write (or replace) one dataset in the store at `root`.
+
+    Numeric arrays and numeric lists become .npy columns; everything else is
+    kept as JSON metadata. `units` maps keys to unit strings.
+    """
+    root = Path(root)
+    units = units or {}
+    catalog_path = root / SCHEMA
+    catalog = (json.loads(catalog_path.read_text(encoding='utf-8')) if catalog_path.exists()
+               else {'version': FORMAT_VERSION, 'datasets': {}})
+    directory = root / name
+    directory.mkdir(parents=True, exist_ok=True)
+    for old in directory.glob('*.npy'):
+        old.unlink()
+
+    columns, meta = {}, {}
+    for key, value in data.items():
+        if _is_numeric(value):
+            array = np.ascontiguousarray(value)
+            np.save(directory / f'{key}.npy', array)
+            columns[key] = {'archivo': f'{name}/{key}.npy', 'dtype': array.dtype.str,
+                            'forma': list(array.shape), 'unidad': units.get(key)}
+            if isinstance(value, list):
+                columns[key]['tipo'] = 'lista'
+        else:
+            if isinstance(value, np.ndarray):
+                spec = {'valor': value.tolist(), 'tipo': 'objeto'}
+            elif isinstance(value, np.generic):
+                spec = {'valor': value.item()}
+            else:
+                spec = {'valor': value}
+            spec['unidad'] = units.get(key)
+            meta[key] = spec
+    catalog['datasets'][name] = {'descripcion': description, 'columnas': columns,
+                                 'meta': meta, 'orden': list(data)}
+    catalog_path.write_text(json.dumps(catalog, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+
+
+def main() -> int:
+    if len(sys.argv) != 2:
+        sys.stderr.write('usage: lab_store.py <datos directory>\n')
+        return 1
+    try:
+        store = load_store(sys.argv[1])
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f'ERROR: {exc}\n')
+        return 2
+    for name, dataset in store.items():
+        print(f'{name}: {dataset.description}')
+        for key, unit in dataset.units.items():
+            value = dataset[key]
+            shape = f'{np.shape(value)}' if isinstance(value, (np.ndarray, list)) else repr(value)
+            print(f'    {key:<22} [{unit or "-"}]  {shape}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+"""Pyplot-free figure construction that can run in several threads at once.
+
+pyplot keeps a global figure manager and the lab scripts used to set their
+fonts in the global rcParams, so two figures could not be built at the same
+time in one process. Figures made here are plain matplotlib.figure.Figure
+objects attached to their own Agg canvas; nothing is registered with
+pyplot, so they need no plt.close() and are freed like any other object.
+
+Styles are still rcParams, and matplotlib reads them both when artists are
+created (fonts, label sizes) and while drawing (tick locators size the
+ticks from the font, formatters check axes.unicode_minus). style() applies
+a script's rc dictionary under a process-wide lock, and save() draws the
+figure under the same style, so every figure gets exactly its own style
+whatever the other threads are doing. What runs outside the lock is the PNG
+encoding, usually the larger part of a dpi=300 savefig, and Pillow
+releases the GIL while compressing.
+
+    with style(ESTILO):
+        fig, ax = subplots(figsize=(8, 4.5))
+        ax.plot(x, y)
+        fig.tight_layout()
+    save(fig, 'graficas/serie.png', ESTILO, dpi=300, bbox_inches='tight')
+
+run_threads() maps a figure function over jobs in a thread pool. Threads
+share the already loaded (memory-mapped) datasets, which avoids the fork
+and pickling cost of a process pool for builds of a few dozen figures.
+Building and drawing are serialised by the style lock, so the gain comes
+from PNG compression overlapping with the next figure; for large batches
+group_batch.render_pool keeps worker processes.
+
+    python tools/render.py                 # compare sequential and threaded rendering
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import os
+import threading
+
+import matplotlib
+import matplotlib.image
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+_STYLE_LOCK = threading.RLock()
+
+
+class _Canvas(FigureCanvasAgg):
+    """Agg canvas that can hand back the rendered PNG image instead of encoding it."""
+
+    pending = None
+
+    def print_png(self, filename_or_obj, *, metadata=None, pil_kwargs=None, **_ignored):
+        # _ignored: dpi, orientation, ... which print_figure passes to non-matplotlib canvases
+        if self.pending is None:
+            return super().print_png(filename_or_obj, metadata=metadata, pil_kwargs=pil_kwargs)
+        # Same steps as FigureCanvasAgg.print_png, with the encoding left to save()
+        FigureCanvasAgg.draw(self)
+        self.pending.append(dict(fname=filename_or_obj, arr=np.array(self.buffer_rgba()), format='png',
+                                 origin='upper', dpi=self.figure.dpi, metadata=metadata, pil_kwargs=pil_kwargs))
+
+
+@contextmanager
+def style(rc: dict = None):
+    """Apply `rc` while the figures of the block are built; one block at a time per process."""
+    with _STYLE_LOCK, matplotlib.rc_context(rc):
+        yield
+
+
+def figure(figsize=None, **kwargs) -> Figure:
+    """Figure with its own Agg canvas, not known to pyplot."""
+    fig = Figure(figsize=figsize, **kwargs)
+    _Canvas(fig)
+    return fig
+
+
+def subplots(nrows: int = 1, ncols: int = 1, *, figsize=None, squeeze: bool = True,
+             sharex=False, sharey=False, subplot_kw: dict = None, gridspec_kw: dict = None, **fig_kw):
+    """(fig, axes) with the same return convention as pyplot.subplots."""
+    fig = figure(figsize=figsize, **fig_kw)
+    axes = fig.subplots(nrows, ncols, sharex=sharex, sharey=sharey, squeeze=squeeze,
+                        subplot_kw=subplot_kw, gridspec_kw=gridspec_kw)
+    return fig, axes
+
+
+def save(fig, path, rc: dict = None, **kwargs) -> None:
+    """fig.savefig(path, **kwargs) drawn under style(rc); PNG files are encoded after releasing it."""
+    canvas = fig.canvas
+    deferred = isinstance(canvas, _Canvas)
+    if deferred:
+        canvas.pending = []
+    try:
+        with style(rc):
+            fig.savefig(path, **kwargs)
+        images = canvas.pending if deferred else []
+    finally:
+        if deferred:
+            canvas.pending = None
+    for image in images:
+        matplotlib.image.imsave(**image)
+
+
+def run_threads(function, jobs, threads: int = None) -> list:
+    """[function(*job) for job in jobs], evaluated in a thread pool; results keep job order.
+
+    threads defaults to the CPU count (LAB_RENDER_THREADS overrides it);
+    with one thread or one job everything runs in the calling thread.
+    """
+    jobs = [job if isinstance(job, tuple) else (job,) for job in jobs]
+    threads = threads or int(os.environ.get('LAB_RENDER_THREADS') or 0) or os.cpu_count() or 1
+    threads = min(threads, len(jobs))
+    if threads <= 1:
+        return [function(*job) for job in jobs]
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(lambda job: function(*job), jobs))
+
+
+def _benchmark(n_figures: int = 12, points: int = 20000) -> None:
+    import tempfile
+    import time
+
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((n_figures, points)).cumsum(axis=1)
+    rc = {'font.size': 11, 'axes.labelsize': 12}
+
+    def draw(i, folder):
+        with style(rc):
+            fig, ax = subplots(figsize=(8, 4.5))
+            ax.plot(data[i], linewidth=0.8)
+            ax.set_xlabel('muestra')
+            ax.set_title(f'serie {i}')
+            fig.tight_layout()
+        save(fig, os.path.join(folder, f'{i}.png'), rc, dpi=150)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for threads in (1, os.cpu_count() or 1, 4):
+            start = time.perf_counter()
+            run_threads(draw, [(i, folder) for i in range(n_figures)], threads)
+            print(f'{n_figures} figures, {threads} thread(s): {time.perf_counter() - start:.2f} s')
+
+
+if __name__ == '__main__':
+    _benchmark()
@@ -0,0 +1,350 @@
+"""SQLite warehouse for fit results across runs, groups and semesters.
+
+Every run of a lab script can record its fitted quantities (rho in i3, mu0 in
+i9, k and efficiency in i7, ...) together with their uncertainty, the
+reference value, a hash of the input datasets and a timestamp:
+
+    from results_db import ResultsDB, input_hash
+
+    with ResultsDB().run('i9', 'generar_graficas.py', input_hash(conductor_data)) as run:
+        run.add('mu0', 'conductor', mu0, sigma, unit='T*m/A', reference=mu0_teorico)
+
+All rows of a run are inserted in a single transaction when the block exits,
+so recording adds well under a millisecond to a build. The database lives in
+`resultados.sqlite` at the repository root unless LAB_RESULTS_DB points
+elsewhere; setting LAB_RESULTS_DB to an empty string disables recording.
+
+Results are denormalised (lab, quantity, config next to each value) and
+covered by composite indexes, so selections such as one quantity over a
+semester are answered from the index without touching the table. Per
+configuration error statistics come from a summary table maintained by an
+insert trigger. On 10^6 rows both take milliseconds.
+
+    python tools/results_db.py                      # per-configuration summary
+    python tools/results_db.py --lab i9 --quantity mu0
+    python tools/results_db.py --bench 1000000      # timing on a scratch database
+"""
+from collections.abc import Mapping
+from pathlib import Path
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / 'resultados.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    lab         TEXT NOT NULL,
+    script      TEXT NOT NULL,
+    session     TEXT,
+    group_name  TEXT,
+    input_hash  TEXT,
+    created_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id          INTEGER PRIMARY KEY,
+    run_id      INTEGER NOT NULL REFERENCES runs(id),
+    lab         TEXT NOT NULL,
+    quantity    TEXT NOT NULL,
+    config      TEXT NOT NULL,
+    value       REAL NOT NULL,
+    uncertainty REAL,
+    reference   REAL,
+    rel_error   REAL,
+    unit        TEXT,
+    session     TEXT,
+    group_name  TEXT,
+    input_hash  TEXT,
+    created_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS error_summary (
+    lab         TEXT NOT NULL,
+    quantity    TEXT NOT NULL,
+    config      TEXT NOT NULL,
+    n           INTEGER NOT NULL,
+    total       REAL NOT NULL,
+    total_sq    REAL NOT NULL,
+    lowest      REAL NOT NULL,
+    highest     REAL NOT NULL,
+    PRIMARY KEY (lab, quantity, config)
+);
+CREATE TRIGGER IF NOT EXISTS results_summary AFTER INSERT ON results
+WHEN NEW.rel_error IS NOT NULL BEGIN
+    INSERT INTO error_summary VALUES (NEW.lab, NEW.quantity, NEW.config, 1, NEW.rel_error,
+                                      NEW.rel_error * NEW.rel_error, NEW.rel_error, NEW.rel_error)
+    ON CONFLICT (lab, quantity, config) DO UPDATE SET
+        n = n + 1, total = total + excluded.total, total_sq = total_sq + excluded.total_sq,
+        lowest = MIN(lowest, excluded.lowest), highest = MAX(highest, excluded.highest);
+END;
+CREATE INDEX IF NOT EXISTS results_time
+    ON results (lab, quantity, created_at, config, value, uncertainty, rel_error);
+CREATE INDEX IF NOT EXISTS results_session
+    ON results (session, lab, quantity);
+CREATE INDEX IF NOT EXISTS results_hash
+    ON results (input_hash);
+"""
+
+COLUMNS = ('run_id', 'lab', 'quantity', 'config', 'value', 'uncertainty', 'reference', 'rel_error',
+           'unit', 'session', 'group_name', 'input_hash', 'created_at')
+TEXT_COLUMNS = ('lab', 'quantity', 'config', 'unit', 'session', 'group_name', 'input_hash')
+
+
+def input_hash(*datasets) -> str:
+    """SHA-256 (hex, 16 chars) of the keys and values of dict-like datasets."""
+    digest = hashlib.sha256()
+    for data in datasets:
+        items = sorted(data.items()) if isinstance(data, Mapping) else [('', data)]
+        for key, value in items:
+            digest.update(str(key).encode('utf-8'))
+            array = np.asarray(value)
+            if array.dtype.kind in 'biuf':
+                digest.update(array.dtype.str.encode('ascii'))
+                digest.update(np.ascontiguousarray(array).tobytes())
+            else:
+                digest.update(repr(array.tolist()).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def _optional_float(value):
+    return None if value is None else float(value)
+
+
+class Run:
+    """Rows of one script execution; written when the `with` block exits."""
+
+    def __init__(self, db: 'ResultsDB', lab: str, script: str, inputs: str = None,
+                 session: str = None, group: str = None):
+        self.db = db
+        self.lab = lab
+        self.script = script
+        self.inputs = inputs
+        self.session = session
+        self.group = group
+        self.created_at = time.time()
+        self.rows = []
+
+    def add(self, quantity: str, config: str, value: float, uncertainty: float = None,
+            unit: str = None, reference: float = None) -> None:
+        value = float(value)
+        rel_error = None
+        if reference:
+            rel_error = abs(value - reference) / abs(reference)
+        self.rows.append((quantity, str(config), value, _optional_float(uncertainty),
+                          _optional_float(reference), rel_error, unit))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None and self.rows:
+            self.db._insert(self)
+
+
+class ResultsDB:
+    """Connection to the results warehouse (schema is created on first use)."""
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.environ.get('LAB_RESULTS_DB', DEFAULT_PATH)
+        self.enabled = str(path) != ''
+        self.path = Path(path) if self.enabled else None
+        self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def run(self, lab: str, script: str, inputs: str = None, session: str = None,
+            group: str = None) -> Run:
+        """Collect the results of one execution (see Run.add)."""
+        return Run(self, lab, script, inputs, session, group)
+
+    def _insert(self, run: Run) -> None:
+        if not self.enabled:
+            return
+        try:
+            with self.conn:
+                cur = self.conn.execute(
+                    'INSERT INTO runs (lab, script, session, group_name, input_hash, created_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (run.lab, run.script, run.session, run.group, run.inputs, run.created_at))
+                run_id = cur.lastrowid
+                self.conn.executemany(
+                    f'INSERT INTO results ({", ".join(COLUMNS)}) VALUES ({", ".join("?" * len(COLUMNS))})',
+                    [(run_id, run.lab, q, c, v, u, r, e, unit, run.session, run.group, run.inputs,
+                      run.created_at) for q, c, v, u, r, e, unit in run.rows])
+        except sqlite3.Error as exc:
+            sys.stderr.write(f'WARNING: results not recorded in {self.path}: {exc}\n')
+
+    def insert_many(self, rows) -> None:
+        """Bulk insert of result tuples ordered as COLUMNS (imports, migrations)."""
+        with self.conn:
+            self.conn.executemany(
+                f'INSERT INTO results ({", ".join(COLUMNS)}) VALUES ({", ".join("?" * len(COLUMNS))})',
+                rows)
+
+    def query(self, lab: str = None, quantity: str = None, config: str = None, session: str = None,
+              since: float = None, until: float = None,
+              columns=('config', 'value', 'uncertainty', 'rel_error', 'created_at')) -> dict:
+        """Matching results as {column: numpy array}, oldest first."""
+        where, params = [], []
+        for column, value in (('lab', lab), ('quantity', quantity), ('config', config),
+                              ('session', session)):
+            if value is not None:
+                where.append(f'{column} = ?')
+                params.append(value)
+        if since is not None:
+            where.append('created_at >= ?')
+            params.append(since)
+        if until is not None:
+            where.append('created_at < ?')
+            params.append(until)
+        for column in columns:
+            if column not in COLUMNS:
+                raise ValueError(f'unknown column {column!r}')
+        sql = f'SELECT {", ".join(columns)} FROM results'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY created_at'
+        rows = self.conn.execute(sql, params).fetchall()
+        values = list(zip(*rows)) or [()] * len(columns)
+        out = {}
+        for column, col in zip(columns, values):
+            if column in TEXT_COLUMNS:
+                out[column] = np.array(col, dtype=object)
+            else:
+                out[column] = np.array([np.nan if v is None else v for v in col], dtype=float)
+        return out
+
+    def error_by_config(self, lab: str, quantity: str) -> dict:
+        """{config: {'n', 'mean', 'std', 'min', 'max'}} of the relative error (fraction).
+
+        Read from error_summary, which a trigger keeps up to date on every
+        insert, so the cost does not grow with the number of results. For
+        the full distribution use query(..., columns=('config', 'rel_error')).
+        """
+        rows = self.conn.execute(
+            'SELECT config, n, total, total_sq, lowest, highest FROM error_summary '
+            'WHERE lab = ? AND quantity = ?', (lab, quantity)).fetchall()
+        summary = {}
+        for config, n, s, s2, lo, hi in rows:
+            mean = s / n
+            var = max(s2 / n - mean * mean, 0.0) * n / (n - 1) if n > 1 else float('nan')
+            summary[config] = {'n': n, 'mean': mean, 'std': var ** 0.5, 'min': lo, 'max': hi}
+        return summary
+
+    def quantities(self) -> list:
+        """(lab, quantity, count) for every recorded quantity."""
+        return self.conn.execute(
+            'SELECT lab, quantity, COUNT(*) FROM results GROUP BY lab, quantity').fetchall()
+
+
+def record(lab: str, script: str, rows, inputs=(), **run_options) -> None:
+    """One-call form used by the lab scripts.
+
+    `rows` are (quantity, config, value, uncertainty, unit, reference) tuples;
+    `inputs` are the datasets hashed into input_hash.
+    """
+    db = ResultsDB()
+    if not db.enabled:
+        return
+    try:
+        with db.run(lab, script, input_hash(*inputs), **run_options) as run:
+            for quantity, config, value, uncertainty, unit, reference in rows:
+                run.add(quantity, config, value, uncertainty, unit, reference)
+    finally:
+        db.close()
+
+
+def _bench(n_rows: int) -> None:
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ResultsDB(Path(tmp) / 'bench.sqlite')
+        configs = {('i9', 'mu0'): ['conductor', 'espira', 'solenoide_500', 'solenoide_1000'],
+                   ('i3', 'rho'): ['constantan_04_fase1', 'constantan_035_fase1',
+                                   'cromoniquel_04_fase1', 'cromoniquel_035_fase1'],
+                   ('i7', 'k'): ['elevador', 'reductor'],
+                   ('i7', 'eficiencia'): ['caso_1', 'caso_2', 'caso_3', 'caso_4', 'caso_5']}
+        keys = list(configs)
+        start = time.perf_counter()
+        t0 = time.time() - 4 * 365 * 86400
+        batch = 100_000
+        for first in range(0, n_rows, batch):
+            n = min(batch, n_rows - first)
+            which = rng.integers(0, len(keys), n)
+            pick = rng.random(n)
+            stamps = t0 + np.sort(rng.random(n)) * 4 * 365 * 86400
+            values = 1.0 + 0.05 * rng.standard_normal(n)
+            rows = []
+            for k, u, stamp, value in zip(which.tolist(), pick.tolist(), stamps.tolist(), values.tolist()):
+                lab, quantity = keys[k]
+                options = configs[keys[k]]
+                rows.append((first // 10, lab, quantity, options[int(u * len(options))], value, 0.01,
+                             1.0, abs(value - 1.0), None, str(int(stamp // (182 * 86400))), None, None,
+                             stamp))
+            db.insert_many(rows)
+        print(f'inserted {n_rows} rows in {time.perf_counter() - start:.1f} s')
+        db.conn.execute('ANALYZE')
+
+        def timed(query):
+            # Best of three: the first call also pays for reading the pages from disk
+            best = float('inf')
+            for _ in range(3):
+                start = time.perf_counter()
+                result = query()
+                best = min(best, time.perf_counter() - start)
+            return result, best * 1e3
+
+        summary, ms = timed(lambda: db.error_by_config('i9', 'mu0'))
+        print(f'mu0 error by configuration: {ms:.1f} ms ({sum(s["n"] for s in summary.values())} rows)')
+        last, ms = timed(lambda: db.query('i7', 'eficiencia', since=time.time() - 182 * 86400))
+        print(f'i7 efficiency, last semester: {ms:.1f} ms ({last["value"].size} rows)')
+        one, ms = timed(lambda: db.query('i3', 'rho', config='cromoniquel_035_fase1',
+                                         since=time.time() - 30 * 86400))
+        print(f'i3 one configuration, last month: {ms:.1f} ms ({one["value"].size} rows)')
+        db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Summaries of the lab results warehouse.')
+    parser.add_argument('--db', default=None, help='database path (default: LAB_RESULTS_DB or resultados.sqlite)')
+    parser.add_argument('--lab')
+    parser.add_argument('--quantity')
+    parser.add_argument('--bench', type=int, metavar='ROWS', help='time queries on a scratch database')
+    args = parser.parse_args()
+    if args.bench:
+        _bench(args.bench)
+        return 0
+    db = ResultsDB(args.db)
+    if not db.enabled or not db.path.exists():
+        sys.stderr.write('ERROR: no results database\n')
+        return 2
+    for lab, quantity, count in db.quantities():
+        if args.lab not in (None, lab) or args.quantity not in (None, quantity):
+            continue
+        print(f'{lab} {quantity}: {count} results')
+        for config, s in sorted(db.error_by_config(lab, quantity).items()):
+            print(f'    {config:<24} n={s["n"]:<6} error {s["mean"] * 100:6.2f}% '
+                  f'(sd {s["std"] * 100:.2f}%, {s["min"] * 100:.2f}-{s["max"] * 100:.2f}%)')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,448 @@
+"""Chunked, compressed, append-only store for raw acquisition traces.
+
+Raw DAQ streams (coil EMF, transformer waveforms, probe scans) are written as
+a sequence of independently compressed chunks:
+
+    <name>.trz       header + chunks
+    <name>.trz.idx   one fixed-size index record per chunk
+
+File layout of <name>.trz:
+
+    b'TRZ1' | uint32 header length | JSON header (channels, units, dtype, fs)
+    repeated:  b'TCHK' | index record | compressed payload
+
+The index record (offset, compressed size, first sample, sample count,
+CRC32 and per-channel min/max/mean) is written both in front of its chunk and
+to the .idx sidecar. Readers memory-map the sidecar, so finding the chunks of
+a time range or drawing a zoomed-out overview never touches the payloads and
+takes milliseconds even for multi-GB files. `TraceStore.channel()` gives a
+sliceable 1-D view, so block-wise processing written for np.memmap (e.g.
+proyecto final/trazas_bobina.py) runs on a .trz file unchanged. If the sidecar is missing or
+shorter than the data file (e.g. after a crash between the two writes) it is
+rebuilt by walking the chunk headers.
+
+Samples get their position in one of two ways. A writer fed by a single
+producer appends without a position: under an exclusive file lock (fcntl on
+POSIX, so it also holds between processes) each chunk is placed at the
+current end of the store as read from the sidecar. Implicit appends from a
+second thread raise, since their order would depend on scheduling. Several
+producers pass `start`, the global index of the first sample of each
+block; those blocks are compressed in the calling threads, in parallel, and
+can arrive in any order. Ranges that were never written read back as NaN
+(float stores) or raise (integer stores). Payloads are byte-shuffled before
+zlib, the same filter HDF5 uses, which helps a lot with slowly varying float
+data.
+
+    python tools/trace_store.py demo.trz           # write a demo file and time queries
+"""
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import struct
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process locking
+    fcntl = None
+
+MAGIC = b'TRZ1'
+CHUNK_MAGIC = b'TCHK'
+
+
+def _index_dtype(n_channels: int) -> np.dtype:
+    return np.dtype([('offset', '<u8'), ('nbytes', '<u8'), ('start', '<u8'), ('count', '<u4'),
+                     ('crc', '<u4'), ('min', '<f8', (n_channels,)), ('max', '<f8', (n_channels,)),
+                     ('mean', '<f8', (n_channels,))])
+
+
+def _shuffle(raw: np.ndarray) -> bytes:
+    return raw.view(np.uint8).reshape(-1, raw.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype: np.dtype, n_channels: int) -> np.ndarray:
+    planes = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(planes.T).view(dtype).reshape(-1, n_channels)
+
+
+def _read_header(fh) -> tuple:
+    if fh.read(4) != MAGIC:
+        raise ValueError('not a trace store file')
+    (length,) = struct.unpack('<I', fh.read(4))
+    return json.loads(fh.read(length).decode('utf-8')), 8 + length
+
+
+@contextmanager
+def _exclusive(path):
+    """Lock the data file like a chunk write does (index repairs take it too)."""
+    with open(path, 'rb') as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+class TraceWriter:
+    """Append samples of shape (n, channels) to a trace store."""
+
+    def __init__(self, path, channels=None, fs: float = 1.0, dtype='float32', units=None,
+                 chunk_samples: int = 1 << 16, level: int = 1, shuffle: bool = True):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + '.idx')
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        if self.path.exists():
+            self.header = TraceStore(self.path).header  # also repairs a stale sidecar
+        else:
+            if channels is None:
+                raise ValueError('channels are required to create a new store')
+            self.header = {'channels': list(channels), 'units': dict(units or {}), 'fs': fs,
+                           'dtype': np.dtype(dtype).str, 'compression': 'zlib', 'level': level,
+                           'shuffle': shuffle, 'chunk_samples': chunk_samples}
+            body = json.dumps(self.header).encode('utf-8')
+            with open(self.path, 'wb') as fh:
+                fh.write(MAGIC + struct.pack('<I', len(body)) + body)
+            self.index_path.write_bytes(b'')
+        self.n_channels = len(self.header['channels'])
+        self.dtype = np.dtype(self.header['dtype'])
+        self.index_dtype = _index_dtype(self.n_channels)
+        self.chunk_samples = self.header['chunk_samples']
+        self._buffer = []
+        self._buffered = 0
+        self._producer = None
+        # End of the stored samples as of the last sidecar bytes read (_index_seen)
+        self._end = 0
+        self._index_seen = 0
+
+    def append(self, samples, start: int = None) -> None:
+        """Store samples (n, channels).
+
+        Without `start` the samples follow the ones already stored (a single
+        producer thread per writer). With `start`, the global index of the
+        first sample, they are written at that position right away; blocks
+        from different producers may then arrive in any order but must not
+        overlap.
+        """
+        samples = np.asarray(samples, dtype=self.dtype).reshape(-1, self.n_channels)
+        if start is not None:
+            if start < 0:
+                raise ValueError(f'start must be >= 0, got {start}')
+            for i in range(0, samples.shape[0], self.chunk_samples):
+                self._write_chunk(samples[i:i + self.chunk_samples], start + i)
+            return
+        with self._lock:
+            producer = threading.get_ident()
+            if self._producer is None:
+                self._producer = producer
+            elif self._producer != producer:
+                raise RuntimeError('appends without start must come from a single thread; '
+                                   'pass start= when several producers share a writer')
+            self._buffer.append(samples)
+            self._buffered += samples.shape[0]
+            if self._buffered < self.chunk_samples:
+                return
+            data = np.concatenate(self._buffer)
+            n_full = data.shape[0] // self.chunk_samples * self.chunk_samples
+            for i in range(0, n_full, self.chunk_samples):
+                self._write_chunk(data[i:i + self.chunk_samples])
+            self._buffer = [data[n_full:]] if n_full < data.shape[0] else []
+            self._buffered = data.shape[0] - n_full
+
+    def flush(self) -> None:
+        """Write whatever is buffered as a (possibly short) chunk."""
+        with self._lock:
+            if not self._buffered:
+                return
+            self._write_chunk(np.concatenate(self._buffer))
+            self._buffer, self._buffered = [], 0
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _stored_end(self) -> int:
+        """Current end of the store; call with the file lock held."""
+        with open(self.index_path, 'rb') as ih:
+            ih.seek(self._index_seen)
+            new = ih.read()
+        n = len(new) // self.index_dtype.itemsize
+        if n:
+            records = np.frombuffer(new, dtype=self.index_dtype, count=n)
+            self._end = max(self._end, int((records['start'] + records['count']).max()))
+            self._index_seen += n * self.index_dtype.itemsize
+        return self._end
+
+    def _write_chunk(self, chunk: np.ndarray, start: int = None) -> None:
+        """Compress `chunk` and append it; start=None places it at the current end."""
+        raw = np.ascontiguousarray(chunk)
+        payload = zlib.compress(_shuffle(raw) if self.header['shuffle'] else raw.tobytes(),
+                                self.header['level'])
+        record = np.zeros(1, dtype=self.index_dtype)
+        record['nbytes'] = len(payload)
+        record['count'] = raw.shape[0]
+        record['crc'] = zlib.crc32(payload)
+        as_float = raw.astype(np.float64, copy=False)
+        record['min'] = as_float.min(axis=0)
+        record['max'] = as_float.max(axis=0)
+        record['mean'] = as_float.mean(axis=0)
+        with self._file_lock, open(self.path, 'ab') as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                record['start'] = self._stored_end() if start is None else start
+                fh.seek(0, 2)
+                record['offset'] = fh.tell() + len(CHUNK_MAGIC) + self.index_dtype.itemsize
+                fh.write(CHUNK_MAGIC + record.tobytes() + payload)
+                fh.flush()
+                with open(self.index_path, 'ab') as ih:
+                    ih.write(record.tobytes())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+class TraceStore:
+    """Read side: time-range reads and chunk-summary overviews."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + '.idx')
+        with open(self.path, 'rb') as fh:
+            self.header, self._data_offset = _read_header(fh)
+        self.channels = self.header['channels']
+        self.n_channels = len(self.channels)
+        self.fs = float(self.header['fs'])
+        self.dtype = np.dtype(self.header['dtype'])
+        self.index_dtype = _index_dtype(self.n_channels)
+        self.index = self._load_index()
+
+    def _load_index(self) -> np.ndarray:
+        index = self._read_sidecar()
+        if index is None:
+            # Stale or missing sidecar, or a writer between its two writes:
+            # decide again under the writers' lock before rebuilding
+            with _exclusive(self.path):
+                index = self._read_sidecar()
+                if index is None:
+                    index = self.rebuild_index()
+        # Blocks written with an explicit start may arrive in any order
+        if index.size and np.any(np.diff(index['start'].astype(np.int64)) < 0):
+            index = index[np.argsort(index['start'], kind='stable')]
+        return index
+
+    def _read_sidecar(self):
+        """The memory-mapped sidecar if it matches the data file, else None."""
+        size = self.path.stat().st_size
+        if not self.index_path.exists() or self.index_path.stat().st_size % self.index_dtype.itemsize:
+            return None
+        if not self.index_path.stat().st_size:
+            return np.zeros(0, dtype=self.index_dtype) if size == self._data_offset else None
+        index = np.memmap(self.index_path, dtype=self.index_dtype, mode='r')
+        return index if int((index['offset'] + index['nbytes']).max()) == size else None
+
+    def rebuild_index(self) -> np.ndarray:
+        """Walk the chunk headers of the data file and rewrite the sidecar.
+
+        Call it with no writer active (TraceStore does so under the file lock).
+        """
+        records = []
+        step = len(CHUNK_MAGIC) + self.index_dtype.itemsize
+        with open(self.path, 'rb') as fh:
+            fh.seek(self._data_offset)
+            while True:
+                head = fh.read(step)
+                if len(head) < step or head[:4] != CHUNK_MAGIC:
+                    break
+                record = np.frombuffer(head[4:], dtype=self.index_dtype)
+                if fh.seek(int(record['nbytes'][0]), 1) > self.path.stat().st_size:
+                    break  # truncated last chunk
+                records.append(record)
+        index = np.concatenate(records) if records else np.zeros(0, dtype=self.index_dtype)
+        self.index_path.write_bytes(index.tobytes())
+        return index
+
+    @property
+    def n_samples(self) -> int:
+        if not self.index.size:
+            return 0
+        return int((self.index['start'] + self.index['count']).max())
+
+    @property
+    def duration(self) -> float:
+        return self.n_samples / self.fs
+
+    def _chunk(self, fh, k: int) -> np.ndarray:
+        record = self.index[k]
+        fh.seek(int(record['offset']))
+        payload = fh.read(int(record['nbytes']))
+        if zlib.crc32(payload) != int(record['crc']):
+            raise ValueError(f'{self.path}: CRC mismatch in chunk {k}')
+        raw = zlib.decompress(payload)
+        if self.header['shuffle']:
+            return _unshuffle(raw, self.dtype, self.n_channels)
+        return np.frombuffer(raw, dtype=self.dtype).reshape(-1, self.n_channels)
+
+    def read(self, t_start: float = 0.0, t_end: float = None, channels=None) -> np.ndarray:
+        """Samples (n, channels) in [t_start, t_end) seconds; only overlapping chunks are decoded."""
+        i0 = int(np.floor(t_start * self.fs))
+        i1 = self.n_samples if t_end is None else int(np.ceil(t_end * self.fs))
+        return self.read_samples(i0, i1, channels)
+
+    def read_samples(self, i0: int, i1: int, channels=None) -> np.ndarray:
+        """Samples with global indices [i0, i1).
+
+        Samples no chunk covers (blocks that were never written) are NaN in
+        float stores; integer stores raise ValueError instead.
+        """
+        i0, i1 = max(i0, 0), min(i1, self.n_samples)
+        cols = self._columns(channels)
+        if i1 <= i0:
+            return np.zeros((0, len(cols)), dtype=self.dtype)
+        starts = self.index['start'].astype(np.int64)
+        k0 = max(int(np.searchsorted(starts, i0, side='right')) - 1, 0)
+        k1 = int(np.searchsorted(starts, i1, side='left'))
+        floating = self.dtype.kind in 'fc'
+        out = np.full((i1 - i0, len(cols)), np.nan if floating else 0, dtype=self.dtype)
+        covered = i0
+        with open(self.path, 'rb') as fh:
+            for k in range(k0, k1):
+                s = int(starts[k])
+                a, b = max(i0, s), min(i1, s + int(self.index['count'][k]))
+                if b <= a:
+                    continue
+                if a > covered and not floating:
+                    raise ValueError(f'{self.path}: samples [{covered}, {a}) were never written')
+                data = self._chunk(fh, k)
+                out[a - i0:b - i0] = data[a - s:b - s][:, cols]
+                covered = max(covered, b)
+        if covered < i1 and not floating:
+            raise ValueError(f'{self.path}: samples [{covered}, {i1}) were never written')
+        return out
+
+    def channel(self, name) -> 'ChannelView':
+        """1-D sliceable view of one channel, decoded on demand (like a memmap)."""
+        return ChannelView(self, self._columns(name)[0])
+
+    def overview(self, t_start: float = 0.0, t_end: float = None, max_points: int = 2000,
+                 channels=None) -> dict:
+        """Min/max/mean envelope from the chunk summaries (no payload is read).
+
+        Chunks overlapping the range are grouped so that at most `max_points`
+        bins are returned; each bin gets the min of mins, max of maxes and the
+        sample-weighted mean.
+        """
+        cols = self._columns(channels)
+        starts = self.index['start'].astype(np.int64)
+        counts = self.index['count'].astype(np.int64)
+        i0 = int(t_start * self.fs)
+        i1 = self.n_samples if t_end is None else int(np.ceil(t_end * self.fs))
+        sel = np.flatnonzero((starts + counts > i0) & (starts < i1))
+        if not sel.size:
+            empty = np.zeros((0, len(cols)))
+            return {'t': np.zeros(0), 'min': empty, 'max': empty, 'mean': empty}
+        per_bin = int(np.ceil(sel.size / max_points))
+        edges = np.arange(0, sel.size, per_bin)
+        idx = self.index[sel]
+        w = counts[sel][:, None]
+        total = np.add.reduceat(w, edges, axis=0)
+        return {
+            't': starts[sel][edges] / self.fs,
+            'min': np.minimum.reduceat(idx['min'][:, cols], edges, axis=0),
+            'max': np.maximum.reduceat(idx['max'][:, cols], edges, axis=0),
+            'mean': np.add.reduceat(idx['mean'][:, cols] * w, edges, axis=0) / total,
+        }
+
+    def _columns(self, channels) -> list:
+        if channels is None:
+            return list(range(self.n_channels))
+        if isinstance(channels, (str, int)):
+            channels = [channels]
+        return [self.channels.index(c) if isinstance(c, str) else int(c) for c in channels]
+
+
+class ChannelView:
+    """Lazy 1-D access to one channel: `view[a:b]` decodes only the chunks involved."""
+
+    def __init__(self, store: TraceStore, column: int):
+        self.store = store
+        self.column = column
+        self.size = store.n_samples
+        self.dtype = store.dtype
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError('only contiguous slices are supported')
+        i0, i1, _ = key.indices(self.size)
+        return self.store.read_samples(i0, i1, [self.column])[:, 0]
+
+
+def main() -> int:
+    if len(sys.argv) != 2:
+        sys.stderr.write('usage: trace_store.py <file.trz>\n')
+        return 1
+    path = Path(sys.argv[1])
+    if path.exists():
+        sys.stderr.write(f'ERROR: {path} already exists\n')
+        return 2
+    fs = 100_000.0
+    block = 50_000
+    n_blocks = 400
+    t = np.arange(block) / fs
+    start = time.perf_counter()
+
+    def block_data(k):
+        rng = np.random.default_rng(k)
+        emf = 0.02 * np.sin(2 * np.pi * 3 * (t + k * block / fs)) + 1e-4 * rng.standard_normal(block)
+        return np.column_stack([emf, 0.5 * emf])
+
+    def acquire(thread_id):
+        for k in range(thread_id, n_blocks, 4):
+            writer.append(block_data(k), start=k * block)
+
+    with TraceWriter(path, ['emf', 'ref'], fs, units={'emf': 'V', 'ref': 'V'}) as writer:
+        threads = [threading.Thread(target=acquire, args=(i,)) for i in range(4)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+    elapsed = time.perf_counter() - start
+    raw_mb = n_blocks * block * 2 * 4 / 1e6
+    print(f'wrote {raw_mb:.0f} MB raw as {path.stat().st_size / 1e6:.0f} MB in {elapsed:.2f} s')
+
+    start = time.perf_counter()
+    store = TraceStore(path)
+    ov = store.overview(max_points=1000)
+    t_overview = time.perf_counter() - start
+    start = time.perf_counter()
+    window = store.read(100.0, 100.01)
+    t_read = time.perf_counter() - start
+    print(f'{store.index.size} chunks, {store.duration:.0f} s of data')
+    print(f'open + overview ({ov["t"].size} bins): {t_overview * 1e3:.1f} ms; '
+          f'10 ms window ({window.shape[0]} samples): {t_read * 1e3:.1f} ms')
+    for k in range(n_blocks):
+        expected = block_data(k).astype(store.dtype)
+        if not np.array_equal(store.read_samples(k * block, (k + 1) * block), expected):
+            sys.stderr.write(f'ERROR: block {k} does not round-trip\n')
+            return 3
+    print(f'round trip: all {n_blocks} blocks read back unchanged')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())